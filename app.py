@@ -1,15 +1,30 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Request, Response, g, request, jsonify, render_template, stream_with_context
 from flask_cors import CORS
 from config import Config
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
-import os
+import json
+import math
+import time
 import uuid
-from services.document_parser import DocumentParser
-from services.chunker import ResumeChunker
-from services.embedding_service import EmbeddingService
-from services.vector_store import MongoVectorStore
-from services.analyzer import ResumeAnalyzer
+from tempfile import SpooledTemporaryFile
+from services.document_parser import FileTooLarge, read_limited
+from services.ingestion import COMPLETED, FAILED
+from services.dedup import file_fingerprint
+from services import metrics, single_flight
+from services.metrics import timed
+from services.rate_limit import RateLimited
+from services.registry import ServiceRegistry
+class UploadRequest(Request):
+    """Keep multipart file parts in memory (up to the upload limit) instead of spooling to disk."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=Config.MAX_FILE_SIZE, mode="rb+")
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+# Werkzeug stops reading the body once it passes this, so oversized uploads fail early
+app.config["MAX_CONTENT_LENGTH"] = Config.MAX_FILE_SIZE + 64 * 1024  # multipart overhead
 CORS(app)
 
 try:
@@ -27,117 +42,567 @@ def index():
 def health():
     return jsonify({"status": "healthy"}), 200
 
-doc_parser = DocumentParser()
-chunker = ResumeChunker()
-embedding_service = EmbeddingService()
-vector_store = MongoVectorStore()
-analyzer = ResumeAnalyzer()
+# Each service is imported and built on first use, once per process
+components = ServiceRegistry()
+components.register("doc_parser", "services.document_parser:DocumentParser", modules=["pdfplumber", "docx"])
+components.register("chunker", "services.chunker:ResumeChunker")
 
-UPLOAD_FOLDER = './uploads'
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+def build_embedding_backend():
+    from services.embedding_backends import create_embedding_backend
+    return create_embedding_backend(Config)
 
-@app.route('/api/upload-resume', methods=['POST'])
-def upload_resume():
-    if 'file' not in request.files:
-        return jsonify({"error": "No file provided"}), 400
+def build_vector_store():
+    from services.vector_store import create_vector_store
+    return create_vector_store(components.embedding_backend)
+
+def build_rate_limiter():
+    from services.rate_limit import create_rate_limiter
+    return create_rate_limiter(Config)
+
+def build_embedding_service():
+    from services.embedding_service import EmbeddingService
+    return EmbeddingService(rate_limiter=components.rate_limiter, backend=components.embedding_backend)
+
+def build_analyzer():
+    from services.analyzer import ResumeAnalyzer
+    return ResumeAnalyzer(rate_limiter=components.rate_limiter)
+
+def build_ranker():
+    from services.ranker import ResumeRanker
+    return ResumeRanker(components.embedding_service, components.vector_store, components.analyzer,
+                        skills=components.resume_skills)
+
+def build_resume_registry():
+    from services.dedup import create_resume_registry
+    return create_resume_registry(Config, components.embedding_backend)
+
+def build_resume_skills():
+    from services.skills import create_resume_skills
+    return create_resume_skills(Config, vector_store=components.vector_store)
+
+def build_ingestion_queue():
+    from services.ingestion import IngestionQueue, ResumeIngestor
+    return IngestionQueue.from_config(ResumeIngestor(
+        components.doc_parser, components.chunker, components.embedding_service, components.vector_store,
+        registry=components.resume_registry, skills=components.resume_skills
+    ))
+
+components.register("embedding_backend", build_embedding_backend)
+components.register("vector_store", build_vector_store, modules=["services.vector_store"])
+components.register("rate_limiter", build_rate_limiter)
+components.register("embedding_service", build_embedding_service,
+                    modules=["services.embedding_service", "google.generativeai"])
+components.register("analyzer", build_analyzer, modules=["services.analyzer", "google.generativeai"])
+components.register("ranker", build_ranker, modules=["services.ranker"])
+components.register("resume_registry", build_resume_registry)
+components.register("resume_skills", build_resume_skills, modules=["services.skills"])
+components.register("ingestion_queue", build_ingestion_queue)
+
+if Config.SERVICE_PRELOAD:
+    components.import_modules()
+
+def __getattr__(name):
+    """`app.vector_store` and friends, for scripts; built on first access."""
+    if components.has(name):
+        return components.get(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def cache_metrics(field):
+    """Per-cache `field` (hits/misses) for the /metrics callbacks; services not built yet report nothing."""
+    def collect():
+        values = {}
+        if components.loaded("embedding_service"):
+            for name, cache_stats in components.embedding_service.get_cache_stats().items():
+                values[(("cache", f"embedding_{name}"),)] = cache_stats[field]
+        if components.loaded("analyzer") and components.analyzer.result_cache is not None:
+            values[(("cache", "analysis"),)] = components.analyzer.result_cache.stats()[field]
+        resume_registry = components.resume_registry if components.loaded("resume_registry") else None
+        if resume_registry is not None and field == "hits":
+            for kind, hits in resume_registry.stats().items():
+                values[(("cache", f"dedup_{kind.replace('_hits', '')}"),)] = hits
+        return values
+    return collect
 
-    file = request.files['file']
+metrics.REGISTRY.callback("cache_hits_total", "Cache lookups served from cache", cache_metrics("hits"), kind="counter")
+metrics.REGISTRY.callback("cache_misses_total", "Cache lookups that missed", cache_metrics("misses"), kind="counter")
+
+# Clients send this header (any non-empty value but "0") to get a timing breakdown
+DEBUG_TIMING_HEADER = "X-Debug-Timing"
+
+@app.before_request
+def start_request_timing():
+    g.request_started = time.perf_counter()
+    g.timings, g.timings_token = metrics.start_request()
+
+@app.after_request
+def record_request_timing(response):
+    if "request_started" not in g:
+        return response
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.REQUEST_SECONDS.observe(
+        time.perf_counter() - g.request_started,
+        endpoint=endpoint, method=request.method, status=response.status_code
+    )
+
+    if request.headers.get(DEBUG_TIMING_HEADER, "0") not in ("", "0"):
+        response.headers["Server-Timing"] = g.timings.server_timing()
+        if response.is_json and not response.is_streamed:
+            body = response.get_json(silent=True)
+            if isinstance(body, dict):
+                body["timings"] = g.timings.as_dict()
+                response.set_data(json.dumps(body))
+    return response
+
+@app.teardown_request
+def finish_request_timing(exc):
+    if "timings_token" in g:
+        metrics.finish_request(g.pop("timings_token"))
+
+@app.route('/metrics')
+def prometheus_metrics():
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+@app.errorhandler(RequestEntityTooLarge)
+def file_too_large(e):
+    return jsonify({"error": f"File exceeds the {Config.MAX_FILE_SIZE // (1024 * 1024)}MB limit"}), 413
+
+@app.route('/api/stats')
+def stats():
+    analyzer = components.analyzer
+    resume_registry = components.resume_registry
+    resume_skills = components.resume_skills
+    recent_writes = getattr(components.vector_store, "recent_writes", None)
+    return jsonify({
+        "embedding_cache": components.embedding_service.get_cache_stats(),
+        "analysis_cache": analyzer.result_cache.stats() if analyzer.result_cache else None,
+        "dedup": resume_registry.stats() if resume_registry else None,
+        "skills": resume_skills.stats() if resume_skills else None,
+        "recent_writes": recent_writes.stats() if recent_writes else None,
+        "single_flight": single_flight.stats(),
+        "rate_limit": components.rate_limiter.stats(),
+        "services": components.stats()
+    }), 200
+
+def check_upload(file):
+    """
+    Validate an uploaded file part.
+
+    Returns:
+        (file_extension, None), or (None, (error payload, status))
+    """
     if file.filename == '':
-        return jsonify({"error": "No file selected"}), 400
+        return None, ({"error": "No file selected"}, 400)
 
     # Check against Config.ALLOWED_EXTENSIONS
     file_extension = file.filename.lower().split('.')[-1]
     if file_extension not in Config.ALLOWED_EXTENSIONS:
-        return jsonify({
+        return None, ({
             "error": f"Invalid file format. Allowed formats: {', '.join(Config.ALLOWED_EXTENSIONS)}"
-        }), 400
+        }, 400)
+    return file_extension, None
+
+def duplicate_upload(owner, filename, file_extension):
+    """Response payload for a byte-identical re-upload of resume `owner`."""
+    print(f"Duplicate upload of {filename}, reusing resume {owner}")
+    existing_job = components.ingestion_queue.get_by_resume(owner)
+    return {
+        "resume_id": owner,
+        "job_id": existing_job["job_id"] if existing_job else None,
+        "filename": filename,
+        "file_type": file_extension,
+        "status": existing_job["status"] if existing_job else COMPLETED,
+        "deduplicated": True,
+        "dedup_match": "file"
+    }
+
+def enqueue_upload(resume_id, filename, file_extension, data):
+    """Queue an upload for ingestion, releasing its file claim if no job could be created."""
+    try:
+        return components.ingestion_queue.submit(resume_id, filename, file_extension, data)
+    except Exception:
+        # Otherwise every re-upload of the file would be answered as a duplicate of nothing
+        if components.resume_registry is not None:
+            components.resume_registry.forget(resume_id)
+        raise
+
+def upload_result(resume_id, job, filename, file_extension):
+    """(payload, status) for a queued upload, given its latest job record."""
+    if job["status"] == FAILED:
+        return {"error": job["error"], "job_id": job["job_id"]}, 400
+    if job["status"] == COMPLETED:
+        return {
+            "resume_id": resume_id,
+            "job_id": job["job_id"],
+            "filename": filename,
+            "file_type": file_extension,
+            "status": "embedded",
+            **job["result"]
+        }, 200
+    return {
+        "resume_id": resume_id,
+        "job_id": job["job_id"],
+        "filename": filename,
+        "file_type": file_extension,
+        "status": job["status"],
+        "status_url": f"/api/jobs/{job['job_id']}",
+        "deduplicated": False
+    }, 202
+
+def start_upload(file):
+    """
+    Validate, read, deduplicate and queue one uploaded file part. Blocking;
+    shared by the Flask route and asgi.py, which runs it on a worker thread.
+
+    Returns:
+        ((resume_id, job, filename, file_extension), None) once queued,
+        or (None, (payload, status)) to return as-is
+    """
+    file_extension, error = check_upload(file)
+    if error:
+        return None, error
 
     try:
         filename = secure_filename(file.filename)
         resume_id = str(uuid.uuid4())
-        filepath = os.path.join(UPLOAD_FOLDER, f'{resume_id}_{filename}')
-        file.save(filepath)
+        with timed("read_upload"):
+            data = read_limited(file.stream, Config.MAX_FILE_SIZE)
 
-        # Validate Document
-        if not doc_parser.validate_file(filepath):
-            os.remove(filepath)
-            return jsonify({"error": "Invalid file"}), 400
-        
-        text = doc_parser.extract_content(filepath)
+        # Byte-identical re-upload: hand back the existing resume, no parsing or writes
+        if components.resume_registry is not None:
+            with timed("dedup_lookup"):
+                owner = components.resume_registry.claim_file(file_fingerprint(data), resume_id)
+            if owner != resume_id:
+                return None, (duplicate_upload(owner, filename, file_extension), 200)
 
-        if not text or len(text) < 50:
-            return jsonify({"error": "Could not extract text from file"}), 400
+        with timed("enqueue"):
+            job = enqueue_upload(resume_id, filename, file_extension, data)
+        return (resume_id, job, filename, file_extension), None
 
-        chunks = chunker.chunk_by_sections(text)
+    except FileTooLarge as e:
+        return None, ({"error": str(e)}, 413)
 
-        print(f"Generating Embeddings for {len(chunks)} chunks")
-        chunk_texts = [chunk["text"] for chunk in chunks]
-        embeddings = embedding_service.embed_batch(chunk_texts)
+    except Exception as e:
+        return None, ({"error": str(e)}, 500)
 
-        print(f"Adding Chunks to Vector Store")
-        stored_count = vector_store.add_chunks(resume_id, chunks, embeddings)
+def wait_requested(req):
+    """?wait=true keeps the old blocking upload behaviour for scripts."""
+    return req.args.get("wait", "").lower() == "true"
 
-        return jsonify({
-            "resume_id": resume_id,
-            "filename": filename,
-            "file_type": file_extension,
-            "status": "embedded",
-            "char_count": len(text),
-            "word_count": len(text.split()),
-            "chunks_created": len(chunks),
-            "chunks_stored": stored_count,
-            "chunks": [
-                {
-                    "section": chunk["section"],
-                    "chunk_id": chunk["chunk_id"],
-                    "word_count": chunk["word_count"],
-                    "text": chunk["text"][:20]
-                }
-                for chunk in chunks
-            ],
-            "text_preview": text[:300] + "..."
-        }), 200
+@app.route('/api/upload-resume', methods=['POST'])
+def upload_resume():
+    if 'file' not in request.files:
+        return jsonify({"error": "No file provided"}), 400
+
+    upload, response = start_upload(request.files['file'])
+    if response:
+        return respond(*response)
+    resume_id, job, filename, file_extension = upload
+
+    try:
+        if wait_requested(request):
+            with timed("ingestion_wait"):
+                job = components.ingestion_queue.wait_for_resume(resume_id, timeout=Config.INGESTION_WAIT_TIMEOUT)
+        return respond(*upload_result(resume_id, job, filename, file_extension))
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-@app.route('/api/analyze', methods=['POST'])
-def analyze_resume():
-    data = request.json
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    job = components.ingestion_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
 
-    if not data:
-        return jsonify({"error": "No JSON data provided"}), 400
-    
-    resume_id = data.get("resume_id")
-    job_description = data.get("job_description")
+def ingestion_error(job):
+    """(error payload, status) if the job has not completed successfully, else None."""
+    if job is not None and job["status"] == FAILED:
+        return {"error": f"Resume ingestion failed: {job['error']}", "job_id": job["job_id"]}, 422
+    if job is not None and job["status"] != COMPLETED:
+        return {
+            "error": "Resume is still being processed",
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "stages": job["stages"]
+        }, 202
+    return None
 
-    if not resume_id or not job_description:
-        return jsonify({"error": "Missing resume_id or job_description"}), 400
+def ingestion_waits(resume_id):
+    """
+    Follow a resume's ingestion through dedup aliases to its canonical resume.
+
+    A generator shared by the Flask and async routes, which differ only in how
+    they wait: it yields each resume_id whose job to wait for and is sent the
+    job record back.
 
+    Returns:
+        (canonical_resume_id, None), or (None, (payload, status)) to return as-is
+    """
+    seen = set()
+    while resume_id not in seen:
+        seen.add(resume_id)
+        job = yield resume_id
+        error = ingestion_error(job)
+        if error:
+            return None, error
+        if components.resume_registry is not None:
+            resume_id = components.resume_registry.resolve(resume_id)
+    return resume_id, None
+
+def wait_for_ingestion(resume_id):
+    """Blocking driver for `ingestion_waits`."""
+    steps = ingestion_waits(resume_id)
     try:
-        print(f"\nAnalyzing resume: {resume_id}")
-        jd_embedding = embedding_service.embed_query(job_description)
+        pending = next(steps)
+        while True:
+            job = components.ingestion_queue.wait_for_resume(pending, timeout=Config.INGESTION_WAIT_TIMEOUT)
+            pending = steps.send(job)
+    except StopIteration as done:
+        return done.value
+
+def retrieve_relevant_chunks(resume_id, job_description):
+    """
+    Wait for any pending ingestion, then fetch the chunks most relevant to the JD.
+
+    Returns:
+        (canonical_resume_id, chunks, None) on success, or (None, None, (payload, status)) to return as-is
+    """
+    with timed("ingestion_wait"):
+        resume_id, error = wait_for_ingestion(resume_id)
+    if error:
+        return None, None, error
 
-        relevant_chunks = vector_store.search(
+    with timed("embed_query"):
+        jd_embedding = components.embedding_service.embed_query(job_description)
+
+    with timed("vector_search"):
+        relevant_chunks = components.vector_store.search(
             query_embedding=jd_embedding,
             resume_id=resume_id,
             top_k=6
         )
 
-        if not relevant_chunks:
-            return jsonify({"error": "Resume not found"}), 404
-        
-        analysis = analyzer.analyze(relevant_chunks, job_description)
+    return chunks_found(resume_id, relevant_chunks)
+
+def chunks_found(resume_id, chunks):
+    """`retrieve_relevant_chunks` result for a finished search."""
+    if not chunks:
+        return None, None, ({"error": "Resume not found"}, 404)
+    return resume_id, chunks, None
+
+def skill_overlap_for(resume_id, job_description):
+    """The resume's precomputed skill overlap with the JD, or None when skill matching is off."""
+    if components.resume_skills is None:
+        return None
+    with timed("skills"):
+        return components.resume_skills.overlap(resume_id, job_description)
+
+def parse_analyze_request(data):
+    """
+    Validate an /api/analyze body (already JSON-decoded, or None).
+
+    Returns:
+        (resume_id, job_description, None), or (None, None, (payload, status))
+    """
+    if not isinstance(data, dict) or not data:
+        return None, None, ({"error": "No JSON data provided"}, 400)
+
+    resume_id = data.get("resume_id")
+    job_description = data.get("job_description")
 
-        if "error" in analysis:
-            return jsonify(analysis), 500
+    if not resume_id or not job_description:
+        return None, None, ({"error": "Missing resume_id or job_description"}, 400)
+    return resume_id, job_description, None
+
+@app.route('/api/analyze', methods=['POST'])
+def analyze_resume():
+    resume_id, job_description, error = parse_analyze_request(request.get_json(silent=True))
+    if error:
+        return respond(*error)
+
+    try:
+        print(f"\nAnalyzing resume: {resume_id}")
+        canonical_id, relevant_chunks, error = retrieve_relevant_chunks(resume_id, job_description)
+        if error:
+            return respond(*error)
         
-        return jsonify({
+        skills = skill_overlap_for(canonical_id, job_description)
+        context = components.analyzer.pack(relevant_chunks)
+        analysis = components.analyzer.analyze(context, job_description, skills=skills)
+        return respond(*analysis_response(resume_id, context, analysis, skills))
+
+    except Exception as e:
+        return respond(*request_failure(e))
+
+def analysis_response(resume_id, context, analysis, skills=None):
+    """(payload, status) for a finished analysis: 429 if it hit the rate limit, 500 on other errors."""
+    if "error" in analysis:
+        return analysis, 429 if "retry_after" in analysis else 500
+    return analysis_result(resume_id, context, analysis, skills), 200
+
+def analysis_result(resume_id, context, analysis, skills=None):
+    result = {
+        "resume_id": resume_id,
+        "analysis": analysis,
+        "chunks_analyzed": len(context.chunks),
+        "evidence": evidence_spans(context.chunks),
+        "context": context.stats()
+    }
+    if skills is not None:
+        result["skills"] = skills
+    return result
+
+def request_failure(e):
+    """(payload, status) for an exception escaping a route: 429 for RateLimited, else 500."""
+    if isinstance(e, RateLimited):
+        return rate_limit_payload(e), 429
+    return {"error": str(e)}, 500
+
+def rate_limit_payload(e):
+    return {"error": str(e), "retry_after": round(e.retry_after, 1)}
+
+def retry_after_header(seconds):
+    return str(max(1, math.ceil(seconds)))
+
+def respond(payload, status):
+    """JSON response for a (payload, status) pair, with Retry-After when it was rate limited."""
+    response = jsonify(payload)
+    if status == 429 and isinstance(payload, dict) and "retry_after" in payload:
+        response.headers["Retry-After"] = retry_after_header(payload["retry_after"])
+    return response, status
+
+def evidence_spans(chunks):
+    """Where each analysed chunk sits in the parsed resume text, for highlighting."""
+    return [
+        {
+            "chunk_id": chunk["metadata"]["chunk_id"],
+            "section": chunk["metadata"]["section"],
+            "span": chunk["metadata"].get("span"),
+            "score": chunk["score"]
+        }
+        for chunk in chunks
+    ]
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/api/analyze/stream', methods=['POST'])
+def analyze_resume_stream():
+    """Same input as /api/analyze; streams each analysis field as a Server-Sent Event."""
+    resume_id, job_description, error = parse_analyze_request(request.get_json(silent=True))
+    if error:
+        return respond(*error)
+
+    try:
+        print(f"\nStreaming analysis for resume: {resume_id}")
+        canonical_id, relevant_chunks, error = retrieve_relevant_chunks(resume_id, job_description)
+        if error:
+            return respond(*error)
+        skills = skill_overlap_for(canonical_id, job_description)
+        context = components.analyzer.pack(relevant_chunks)
+    except Exception as e:
+        return respond(*request_failure(e))
+
+    def generate():
+        start = {
             "resume_id": resume_id,
-            "analysis": analysis,
-            "chunks_analyzed": len(relevant_chunks)
+            "chunks_analyzed": len(context.chunks),
+            "evidence": evidence_spans(context.chunks),
+            "context": context.stats()
+        }
+        if skills is not None:
+            start["skills"] = skills
+        yield sse_event("start", start)
+        for kind, payload in components.analyzer.analyze_stream(context, job_description, skills=skills):
+            if kind == "field":
+                key, value = payload
+                yield sse_event(key, value)
+            else:
+                yield sse_event(kind, payload)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.route('/api/rank', methods=['POST'])
+def rank_resumes():
+    data = request.json
+
+    if not data:
+        return jsonify({"error": "No JSON data provided"}), 400
+
+    job_description = data.get("job_description")
+    resume_ids = data.get("resume_ids")
+    top_n = data.get("top_n", 5)
+    analyze = data.get("analyze", True)
+
+    if not job_description or not resume_ids:
+        return jsonify({"error": "Missing job_description or resume_ids"}), 400
+
+    if not isinstance(resume_ids, list) or not all(isinstance(r, str) for r in resume_ids):
+        return jsonify({"error": "resume_ids must be a list of strings"}), 400
+
+    if len(resume_ids) > Config.RANK_MAX_RESUMES:
+        return jsonify({"error": f"At most {Config.RANK_MAX_RESUMES} resume_ids per request"}), 400
+
+    if not isinstance(top_n, int) or top_n < 0:
+        return jsonify({"error": "top_n must be a non-negative integer"}), 400
+
+    try:
+        print(f"\nRanking {len(resume_ids)} resumes")
+        resume_ids, aliases = canonical_resume_ids(resume_ids)
+
+        result = components.ranker.rank(job_description, resume_ids, top_n=top_n, analyze=bool(analyze))
+
+        return jsonify({
+            "ranking": result["ranking"],
+            "not_found": result["not_found"],
+            "aliases": aliases,
+            "resumes_ranked": len(result["ranking"]),
+            "resumes_analyzed": sum(1 for item in result["ranking"] if "analysis" in item)
         }), 200
 
+    except Exception as e:
+        return respond(*request_failure(e))
+
+def canonical_resume_ids(resume_ids):
+    """(resume_ids with dedup aliases resolved, {alias: canonical_id})."""
+    if components.resume_registry is None:
+        return resume_ids, {}
+    canonical_ids = [components.resume_registry.resolve(r) for r in resume_ids]
+    return canonical_ids, {r: c for r, c in zip(resume_ids, canonical_ids) if r != c}
+
+@app.route('/api/screen', methods=['POST'])
+def screen_resumes():
+    """Rank resumes by the JD skills they mention, from skills extracted at ingest; no Gemini calls."""
+    data = request.json
+
+    if not data:
+        return jsonify({"error": "No JSON data provided"}), 400
+
+    job_description = data.get("job_description")
+    resume_ids = data.get("resume_ids")
+
+    if not job_description or not resume_ids:
+        return jsonify({"error": "Missing job_description or resume_ids"}), 400
+
+    if not isinstance(resume_ids, list) or not all(isinstance(r, str) for r in resume_ids):
+        return jsonify({"error": "resume_ids must be a list of strings"}), 400
+
+    if len(resume_ids) > Config.RANK_MAX_RESUMES:
+        return jsonify({"error": f"At most {Config.RANK_MAX_RESUMES} resume_ids per request"}), 400
+
+    if components.resume_skills is None:
+        return jsonify({"error": "Skill matching is disabled (SKILLS_TAXONOMY_PATH is empty)"}), 404
+
+    try:
+        resume_ids, aliases = canonical_resume_ids(resume_ids)
+        with timed("skills_screen"):
+            result = components.resume_skills.screen(job_description, resume_ids)
+        return jsonify({**result, "aliases": aliases}), 200
+
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
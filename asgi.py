@@ -0,0 +1,194 @@
+"""
+Async entry point: `uvicorn asgi:app`.
+
+POST /api/analyze and POST /api/upload-resume run as coroutines that await
+the embedding, vector search and Gemini calls, so one process keeps hundreds
+of requests in flight instead of one per sync worker. Validation, dedup and
+response shaping are the same helpers the Flask routes use; the blocking
+parts (multipart parsing, reading the upload, SQLite lookups, first builds
+of services) run on the loop's executor, and document parsing already runs
+on the ingestion pool. Every other route is served by the Flask app in
+app.py on a small thread pool.
+"""
+import asyncio
+import json
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import app as flask_app
+from config import Config
+from services import metrics
+from services.metrics import timed
+from utils.asgi import BodyTooLarge, call_wsgi, read_body, send_json, wsgi_environ
+
+components = flask_app.components
+_wsgi_executor = None
+_configured_loops = weakref.WeakSet()
+
+
+def _prepare_loop():
+    """Size the default executor used by asyncio.to_thread for blocking calls."""
+    loop = asyncio.get_running_loop()
+    if loop not in _configured_loops:
+        loop.set_default_executor(ThreadPoolExecutor(
+            max_workers=Config.ASYNC_BLOCKING_THREADS, thread_name_prefix="async-blocking"
+        ))
+        _configured_loops.add(loop)
+
+
+def _get_wsgi_executor() -> ThreadPoolExecutor:
+    global _wsgi_executor
+    if _wsgi_executor is None:
+        _wsgi_executor = ThreadPoolExecutor(max_workers=Config.ASYNC_WSGI_THREADS, thread_name_prefix="wsgi")
+    return _wsgi_executor
+
+
+async def service(name):
+    """`components.<name>`, built on a worker thread the first time so the loop never blocks on it."""
+    if components.loaded(name):
+        return components.get(name)
+    return await asyncio.to_thread(components.get, name)
+
+
+async def wait_for_ingestion(resume_id):
+    """Async driver for `app.ingestion_waits`."""
+    queue = await service("ingestion_queue")
+    steps = flask_app.ingestion_waits(resume_id)
+    try:
+        pending = next(steps)
+        while True:
+            job = await queue.wait_for_resume_async(pending, timeout=Config.INGESTION_WAIT_TIMEOUT)
+            pending = steps.send(job)
+    except StopIteration as done:
+        return done.value
+
+
+async def analyze_resume(scope, body):
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        data = None
+
+    resume_id, job_description, error = flask_app.parse_analyze_request(data)
+    if error:
+        return error
+
+    try:
+        print(f"\nAnalyzing resume: {resume_id}")
+        with timed("ingestion_wait"):
+            canonical_id, error = await wait_for_ingestion(resume_id)
+        if error:
+            return error
+
+        embedding_service = await service("embedding_service")
+        with timed("embed_query"):
+            jd_embedding = await embedding_service.embed_query_async(job_description)
+
+        vector_store = await service("vector_store")
+        with timed("vector_search"):
+            relevant_chunks = await vector_store.search_async(
+                query_embedding=jd_embedding,
+                resume_id=canonical_id,
+                top_k=6
+            )
+
+        canonical_id, relevant_chunks, error = flask_app.chunks_found(canonical_id, relevant_chunks)
+        if error:
+            return error
+
+        skills = await asyncio.to_thread(flask_app.skill_overlap_for, canonical_id, job_description)
+        analyzer = await service("analyzer")
+        context = analyzer.pack(relevant_chunks)
+        analysis = await analyzer.analyze_async(context, job_description, skills=skills)
+        return flask_app.analysis_response(resume_id, context, analysis, skills)
+
+    except Exception as e:
+        return flask_app.request_failure(e)
+
+
+async def upload_resume(scope, body):
+    request = flask_app.UploadRequest(wsgi_environ(scope, body))
+    files = await asyncio.to_thread(lambda: request.files)
+    if 'file' not in files:
+        return {"error": "No file provided"}, 400
+
+    upload, response = await asyncio.to_thread(flask_app.start_upload, files['file'])
+    if response:
+        return response
+    resume_id, job, filename, file_extension = upload
+
+    try:
+        if flask_app.wait_requested(request):
+            queue = await service("ingestion_queue")
+            with timed("ingestion_wait"):
+                job = await queue.wait_for_resume_async(resume_id, timeout=Config.INGESTION_WAIT_TIMEOUT)
+        return flask_app.upload_result(resume_id, job, filename, file_extension)
+
+    except Exception as e:
+        return {"error": str(e)}, 500
+
+
+# (method, path) -> coroutine handler; everything else goes to Flask
+ROUTES = {
+    ("POST", "/api/analyze"): analyze_resume,
+    ("POST", "/api/upload-resume"): upload_resume,
+}
+
+
+async def _serve(handler, scope, body, send):
+    headers = dict((k.decode("latin-1").lower(), v.decode("latin-1")) for k, v in scope.get("headers", []))
+    started = time.perf_counter()
+    timings, token = metrics.start_request()
+    try:
+        payload, status = await handler(scope, body)
+    finally:
+        metrics.finish_request(token)
+    metrics.REQUEST_SECONDS.observe(
+        time.perf_counter() - started, endpoint=scope["path"], method=scope["method"], status=status
+    )
+
+    response_headers = []
+    if "origin" in headers:
+        response_headers.append(("Access-Control-Allow-Origin", "*"))
+    if status == 429 and isinstance(payload, dict) and "retry_after" in payload:
+        response_headers.append(("Retry-After", flask_app.retry_after_header(payload["retry_after"])))
+    if headers.get(flask_app.DEBUG_TIMING_HEADER.lower(), "0") not in ("", "0"):
+        response_headers.append(("Server-Timing", timings.server_timing()))
+        if isinstance(payload, dict):
+            payload = {**payload, "timings": timings.as_dict()}
+    await send_json(send, status, payload, response_headers)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            _prepare_loop()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            if components.loaded("vector_store"):
+                components.vector_store.close()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    _prepare_loop()
+    try:
+        body = await read_body(receive, flask_app.app.config["MAX_CONTENT_LENGTH"])
+    except BodyTooLarge:
+        await send_json(send, 413, {"error": f"File exceeds the {Config.MAX_FILE_SIZE // (1024 * 1024)}MB limit"})
+        return
+
+    handler = ROUTES.get((scope["method"], scope["path"]))
+    if handler is None:
+        await call_wsgi(flask_app.app, scope, body, send, _get_wsgi_executor())
+        return
+    await _serve(handler, scope, body, send)
@@ -0,0 +1,74 @@
+"""
+Benchmark EmbeddingService.embed_batch against the old one-request-per-chunk loop.
+
+Runs against a local fake embedding endpoint, so no API key is needed:
+
+    python -m benchmarks.bench_embed_batch --latency 0.08 --batch-size 25
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fakes import FakeEmbeddingServer
+from services.embedding_cache import EmbeddingCache, LRUCache
+from services.embedding_service import EmbeddingService
+from services.gemini import get_genai
+
+
+def make_texts(count: int, run: str):
+    return [f"{run} chunk {i}: Built REST APIs in Python and Flask for team {i % 7}" for i in range(count)]
+
+
+def fresh_service(batch_size: int, concurrency: int) -> EmbeddingService:
+    service = EmbeddingService(cache=EmbeddingCache(memory=LRUCache(), disk=None))
+    service.batch_size = batch_size
+    service.max_concurrency = concurrency
+    return service
+
+
+def run(sizes, latency: float, batch_size: int, concurrency: int):
+    with FakeEmbeddingServer(latency=latency) as server:
+        get_genai().embed_content = server.embed_content
+
+        print(f"Fake endpoint latency: {latency * 1000:.0f} ms/request, "
+              f"batch size {batch_size}, concurrency {concurrency}\n")
+        print(f"{'chunks':>7} {'sequential':>12} {'requests':>9} {'batched':>10} {'requests':>9} {'speedup':>8}")
+
+        for size in sizes:
+            service = fresh_service(batch_size, concurrency)
+            texts = make_texts(size, "seq")
+            before = server.request_count
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                for text in texts:
+                    service.embed_text(text)
+            sequential = time.perf_counter() - start
+            sequential_requests = server.request_count - before
+
+            service = fresh_service(batch_size, concurrency)
+            texts = make_texts(size, "batch")
+            before = server.request_count
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                service.embed_batch(texts)
+            batched = time.perf_counter() - start
+            batched_requests = server.request_count - before
+
+            print(f"{size:>7} {sequential * 1000:>10.1f}ms {sequential_requests:>9} "
+                  f"{batched * 1000:>8.1f}ms {batched_requests:>9} {sequential / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake request")
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    run(args.sizes, args.latency, args.batch_size, args.concurrency)
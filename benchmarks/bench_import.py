@@ -0,0 +1,160 @@
+"""
+Cold-start benchmark: how long a fresh process takes to import app.py and
+answer GET /health, and which heavy modules that pulled in.
+
+Each run is a new interpreter, so nothing is warm from an earlier import.
+Exits non-zero if the median import time passes --max-seconds, if /health
+loaded a heavy module, or (with --compare) if the median regressed past
+--threshold against an earlier results file:
+
+    python -m benchmarks.bench_import --runs 5 --output before.json
+    python -m benchmarks.bench_import --runs 5 --compare before.json
+    python -m benchmarks.bench_import --top 15    # slowest modules (-X importtime)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.bench_pipeline import RESULTS_DIR, git_commit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Only a request that needs them should import these
+HEAVY_MODULES = ["google.generativeai", "grpc", "pdfplumber", "docx", "pymongo", "numpy"]
+
+# Offline settings: /health must not need Atlas or on-disk stores
+CHILD_ENV = {
+    "GEMINI_API_KEY": "benchmark",
+    "VECTOR_STORE_BACKEND": "memory",
+    "INGESTION_JOB_STORE": "memory",
+    "EMBEDDING_CACHE_PATH": "",
+    "ANALYSIS_CACHE_BACKEND": "none",
+    "DEDUP_DB_PATH": "",
+    "SERVICE_PRELOAD": "false",
+}
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+status = app.app.test_client().get("/health").status_code
+served = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "health_seconds": served - imported,
+    "health_status": status,
+    "heavy_modules": [m for m in HEAVY if m in sys.modules],
+}))
+"""
+
+
+def child_env() -> dict:
+    env = dict(os.environ)
+    env.update(CHILD_ENV)
+    return env
+
+
+def measure_once() -> dict:
+    code = f"HEAVY = {HEAVY_MODULES!r}\n{CHILD}"
+    output = subprocess.check_output(
+        [sys.executable, "-c", code], cwd=ROOT, env=child_env(), stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def slowest_imports(top: int):
+    """(cumulative_ms, module) for the `top` slowest imports under `import app`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1000, name.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def run(args) -> dict:
+    runs = [measure_once() for _ in range(args.runs)]
+    imports = [r["import_seconds"] for r in runs]
+    return {
+        "meta": {"commit": git_commit(), "python": sys.version.split()[0], "runs": args.runs},
+        "import_seconds": {
+            "median": round(statistics.median(imports), 4),
+            "min": round(min(imports), 4),
+            "max": round(max(imports), 4),
+        },
+        "health_ms": round(statistics.median(r["health_seconds"] for r in runs) * 1000, 2),
+        "health_status": runs[-1]["health_status"],
+        "heavy_modules": sorted({m for r in runs for m in r["heavy_modules"]}),
+    }
+
+
+def check(results: dict, baseline: dict, args) -> list:
+    """Failure messages; empty when the cold start is within bounds."""
+    failures = []
+    median = results["import_seconds"]["median"]
+    if results["health_status"] != 200:
+        failures.append(f"/health returned {results['health_status']}")
+    if results["heavy_modules"]:
+        failures.append(f"import + /health loaded {', '.join(results['heavy_modules'])}")
+    if args.max_seconds and median > args.max_seconds:
+        failures.append(f"median import {median:.3f}s is over --max-seconds {args.max_seconds}")
+    if baseline:
+        base = baseline["import_seconds"]["median"]
+        if base and median / base - 1 > args.threshold:
+            failures.append(f"median import {median:.3f}s regressed {(median / base - 1) * 100:+.0f}% vs {base:.3f}s")
+    return failures
+
+
+def print_report(results: dict, baseline: dict = None):
+    seconds = results["import_seconds"]
+    print(f"Commit {results['meta']['commit']}, Python {results['meta']['python']}, {results['meta']['runs']} runs\n")
+    line = f"import app: median {seconds['median'] * 1000:.0f}ms (min {seconds['min'] * 1000:.0f}, max {seconds['max'] * 1000:.0f})"
+    if baseline:
+        line += f", baseline {baseline['import_seconds']['median'] * 1000:.0f}ms"
+    print(line)
+    print(f"GET /health: {results['health_ms']:.1f}ms, status {results['health_status']}")
+    print(f"Heavy modules loaded: {', '.join(results['heavy_modules']) or 'none'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time")
+    parser.add_argument("--max-seconds", type=float, default=0.5, help="Fail when the median import is slower (0 disables)")
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest imports")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/import-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Median slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"import-{results['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.top:
+        print("\nSlowest imports (cumulative):")
+        for ms, name in slowest_imports(args.top):
+            print(f"{ms:>9.1f}ms {name}")
+
+    print(f"\nSaved {output}")
+    failures = check(results, baseline, args)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,61 @@
+"""
+Benchmark sequential vs page-parallel PDF extraction on synthetic multi-page CVs.
+
+Also reports time-to-first-page for the DocumentParser.iter_pages generator:
+
+    python -m benchmarks.bench_pdf_extract --pages 2 10 40 --workers 4
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import make_pdf
+from services.document_parser import DocumentParser
+
+
+def timed(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(page_counts, workers: int, repeat: int):
+    sequential = DocumentParser(max_pages=0, workers=1)
+    parallel = DocumentParser(max_pages=0, workers=workers, parallel_min_pages=2)
+
+    # Warm the process pool so worker start-up is not billed to the first document
+    parallel.parse(io.BytesIO(make_pdf(workers)), "pdf")
+
+    print(f"Workers: {workers}, best of {repeat}\n")
+    print(f"{'pages':>6} {'sequential':>12} {'parallel':>10} {'speedup':>8} {'first page':>11}")
+
+    for pages in page_counts:
+        data = make_pdf(pages, seed=pages)
+
+        seq_time, seq_text = timed(lambda: sequential.parse(io.BytesIO(data), "pdf"), repeat)
+        par_time, par_text = timed(lambda: parallel.parse(io.BytesIO(data), "pdf"), repeat)
+        assert seq_text == par_text, "parallel extraction changed the output"
+
+        first_time, _ = timed(lambda: next(sequential.iter_pages(io.BytesIO(data), "pdf")), repeat)
+
+        print(f"{pages:>6} {seq_time * 1000:>10.1f}ms {par_time * 1000:>8.1f}ms "
+              f"{seq_time / par_time:>7.1f}x {first_time * 1000:>9.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[2, 10, 40])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.pages, args.workers, args.repeat)
@@ -0,0 +1,244 @@
+"""
+Offline benchmark of the full ingest and analyze pipeline.
+
+Generates a synthetic PDF/DOCX/TXT corpus, runs every document through
+DocumentParser, ResumeChunker, EmbeddingService, MongoVectorStore and
+ResumeAnalyzer against local fakes (embedding endpoint, Mongo collection,
+Gemini model), and writes per-stage timings and end-to-end throughput as
+JSON so runs can be compared across commits:
+
+    python -m benchmarks.bench_pipeline --per-size 3 --output before.json
+    python -m benchmarks.bench_pipeline --per-size 3 --compare before.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import FORMATS, SIZES, generate_corpus, make_job_description
+from benchmarks.fakes import FakeCollection, FakeEmbeddingServer, FakeGenerativeModel
+from services.analyzer import ResumeAnalyzer
+from services.chunker import ResumeChunker
+from services.document_parser import DocumentParser
+from services.embedding_cache import EmbeddingCache, LRUCache
+from services.embedding_service import EmbeddingService
+from services.gemini import get_genai
+from services.result_cache import InMemoryResultCache
+from services.ingestion import IngestionQueue, InMemoryJobStore, ResumeIngestor, COMPLETED
+from services.vector_store import MongoVectorStore
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+STAGES = ["parse", "chunk", "embed", "store", "retrieve", "analyze"]
+
+
+class StageTimer:
+    """Collects wall-clock samples (seconds) per stage name."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def time(self, *names):
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        for name in names:
+            self.samples[name].append(elapsed)
+
+    def summary(self) -> dict:
+        return {name: summarize(values) for name, values in sorted(self.samples.items())}
+
+
+def summarize(values) -> dict:
+    ordered = sorted(values)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": round(percentile(0.50) * 1000, 3),
+        "p95_ms": round(percentile(0.95) * 1000, 3),
+        "total_ms": round(sum(ordered) * 1000, 3),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(__file__), stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build_services(args, server: FakeEmbeddingServer, collection: FakeCollection):
+    get_genai().embed_content = server.embed_content
+    embedding_service = EmbeddingService(cache=EmbeddingCache(memory=LRUCache(), disk=None))
+    vector_store = MongoVectorStore(collection=collection)
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache())
+    analyzer.model = FakeGenerativeModel(latency=args.llm_latency)
+    # Measure generation, not cache hits
+    analyzer.result_cache = None
+    return DocumentParser(), ResumeChunker(), embedding_service, vector_store, analyzer
+
+
+def run_stages(corpus, job_descriptions, services, timer: StageTimer):
+    """Each document through every stage in turn, timing each call."""
+    doc_parser, chunker, embedding_service, vector_store, analyzer = services
+
+    for i, doc in enumerate(corpus):
+        resume_id = f"stage-{i}"
+        by_type = f"{doc['file_type']}.{doc['size']}"
+
+        with timer.time("parse", f"parse.{by_type}"):
+            text = doc_parser.parse(io.BytesIO(doc["data"]), doc["file_type"])
+        with timer.time("chunk", f"chunk.{by_type}"):
+            chunks = chunker.chunk_by_sections(text)
+        with timer.time("embed"):
+            embeddings = embedding_service.embed_batch([chunk["text"] for chunk in chunks])
+        with timer.time("store"):
+            vector_store.add_chunks(resume_id, chunks, embeddings)
+
+        job_description = job_descriptions[i % len(job_descriptions)]
+        with timer.time("retrieve"):
+            relevant = vector_store.search(embedding_service.embed_query(job_description), resume_id, top_k=6)
+        with timer.time("analyze"):
+            analyzer.analyze(relevant, job_description)
+
+
+def run_end_to_end(corpus, job_descriptions, services, workers: int) -> dict:
+    """Ingest the corpus through IngestionQueue, then analyze every resume concurrently."""
+    doc_parser, chunker, embedding_service, vector_store, analyzer = services
+    ingestor = ResumeIngestor(doc_parser, chunker, embedding_service, vector_store)
+    queue = IngestionQueue(ingestor, store=InMemoryJobStore(), max_workers=workers)
+
+    start = time.perf_counter()
+    resume_ids = [f"e2e-{i}" for i in range(len(corpus))]
+    for resume_id, doc in zip(resume_ids, corpus):
+        queue.submit(resume_id, doc["name"], doc["file_type"], doc["data"])
+    failed = sum(queue.wait_for_resume(resume_id, timeout=600)["status"] != COMPLETED for resume_id in resume_ids)
+    ingested = time.perf_counter()
+
+    def analyze(i):
+        job_description = job_descriptions[i % len(job_descriptions)]
+        query = embedding_service.embed_query(job_description)
+        return analyzer.analyze(vector_store.search(query, resume_ids[i], top_k=6), job_description)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(analyze, range(len(resume_ids))))
+    finished = time.perf_counter()
+
+    return {
+        "documents": len(corpus),
+        "failed": failed,
+        "workers": workers,
+        "ingest_seconds": round(ingested - start, 3),
+        "analyze_seconds": round(finished - ingested, 3),
+        "total_seconds": round(finished - start, 3),
+        "documents_per_second": round(len(corpus) / (finished - start), 3),
+    }
+
+
+def run(args) -> dict:
+    corpus = generate_corpus(per_size=args.per_size, formats=args.formats, sizes=args.sizes)
+    job_descriptions = [make_job_description(seed) for seed in range(args.job_descriptions)]
+    timer = StageTimer()
+
+    with FakeEmbeddingServer(latency=args.embed_latency) as server:
+        collection = FakeCollection(latency=args.mongo_latency)
+        services = build_services(args, server, collection)
+        with redirect_stdout(io.StringIO()):
+            run_stages(corpus, job_descriptions, services, timer)
+            end_to_end = run_end_to_end(corpus, job_descriptions, services, args.workers)
+
+        fakes = {
+            "embedding_requests": server.request_count,
+            "mongo_round_trips": collection.round_trips,
+            "llm_calls": services[4].model.calls,
+        }
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "corpus": {
+            "documents": len(corpus),
+            "bytes": sum(len(doc["data"]) for doc in corpus),
+            "job_descriptions": len(job_descriptions),
+        },
+        "stages": timer.summary(),
+        "end_to_end": end_to_end,
+        "fakes": fakes,
+    }
+
+
+def print_report(results: dict, baseline: dict = None, threshold: float = 0.10):
+    print(f"Commit {results['meta']['commit']}: {results['corpus']['documents']} documents, "
+          f"{results['corpus']['bytes'] / 1024:.0f} KB\n")
+    header = f"{'stage':>20} {'count':>6} {'mean':>10} {'p95':>10}"
+    if baseline:
+        header += f" {'baseline':>10} {'change':>8}"
+    print(header)
+
+    for name, stats in results["stages"].items():
+        line = f"{name:>20} {stats['count']:>6} {stats['mean_ms']:>8.1f}ms {stats['p95_ms']:>8.1f}ms"
+        base = (baseline or {}).get("stages", {}).get(name)
+        if base:
+            change = stats["mean_ms"] / base["mean_ms"] - 1 if base["mean_ms"] else 0.0
+            flag = "  REGRESSION" if change > threshold else ""
+            line += f" {base['mean_ms']:>8.1f}ms {change * 100:>+7.1f}%{flag}"
+        print(line)
+
+    e2e = results["end_to_end"]
+    print(f"\nEnd to end ({e2e['workers']} workers): {e2e['total_seconds']:.2f}s, "
+          f"{e2e['documents_per_second']:.2f} documents/s", end="")
+    if baseline:
+        print(f" (baseline {baseline['end_to_end']['documents_per_second']:.2f})", end="")
+    print()
+    print(f"Fakes: {results['fakes']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-size", type=int, default=2, help="Documents per format and size")
+    parser.add_argument("--formats", nargs="+", default=FORMATS, choices=FORMATS)
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--job-descriptions", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--embed-latency", type=float, default=0.05, help="Seconds per fake embedding request")
+    parser.add_argument("--mongo-latency", type=float, default=0.002, help="Seconds per fake Mongo round trip")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per fake Gemini call")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/pipeline-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Mean slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    results = run(args)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{results['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline, args.threshold)
+    print(f"\nSaved {output}")
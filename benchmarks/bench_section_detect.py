@@ -0,0 +1,88 @@
+"""
+Stress benchmark for ResumeChunker section detection on 100 KB+ inputs.
+
+Compares the single-pass header scan with the previous seven-regex detector,
+kept below verbatim as the baseline:
+
+    python -m benchmarks.bench_section_detect --sizes 100000 400000
+
+Run two sizes to check scaling: single-pass time should grow linearly.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import resume_lines
+from services.chunker import ResumeChunker
+
+LEGACY_PATTERNS = {
+    "Summary": r"(professional summary|summary|profile|objective|about me)\s*(.*?)(?=(work experience|experience|employment history|education|skills|projects|certifications)|$)",
+    "Experience": r"(work experience|experience|employment history|professional experience)\s*(.*?)(?=(education|skills|projects|certifications|awards)|$)",
+    "Education": r"(education|academic background|qualifications)\s*(.*?)(?=(skills|projects|certifications|awards|references)|$)",
+    "Skills": r"(skills|technical skills|competencies|core competencies)\s*(.*?)(?=(projects|certifications|awards|references|languages)|$)",
+    "Projects": r"(projects|key projects|notable projects)\s*(.*?)(?=(certifications|awards|references|languages|education)|$)",
+    "Certifications": r"(certifications|certificates|licenses|professional certifications)\s*(.*?)(?=(awards|references|languages|projects)|$)",
+    "Awards": r"(awards|achievements|honors|recognitions)\s*(.*?)(?=(references|languages|certifications)|$)",
+}
+
+
+def legacy_detect_sections(text: str) -> dict:
+    sections = {}
+    for section_name, pattern in LEGACY_PATTERNS.items():
+        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+        if match:
+            content = match.group(2).strip()
+            if content and len(content) > 20:
+                sections[section_name] = content
+    return sections
+
+
+def make_inputs(size: int) -> dict:
+    realistic = " ".join(resume_lines(seed=1, lines=size // 40))
+    return {
+        # A long flattened CV with many section headers
+        "realistic": realistic[:size],
+        # Header keyword first, no following header: every lazy scan runs to the end
+        "no-terminator": "summary " + "x" * size,
+        # Headers at the very end, long whitespace runs for \s* to chew through
+        "whitespace": (" " * size) + "SKILLS Python Flask",
+        # Keywords that are not headers, repeated throughout
+        "keyword-soup": ("years of experience in education and skills for projects " * (size // 58 + 1))[:size],
+        # Near-miss prefixes that almost spell a header
+        "near-miss": ("experienc educatio skill certificatio " * (size // 38 + 1))[:size],
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes, repeat: int):
+    chunker = ResumeChunker()
+    print(f"Best of {repeat}\n")
+    print(f"{'input':>14} {'size':>8} {'legacy':>10} {'single-pass':>12} {'speedup':>8}")
+
+    for size in sizes:
+        for name, text in make_inputs(size).items():
+            legacy = timed(lambda: legacy_detect_sections(text), repeat)
+            single = timed(lambda: chunker._detect_sections(text), repeat)
+            print(f"{name:>14} {size / 1024:>6.0f}KB {legacy * 1000:>8.1f}ms "
+                  f"{single * 1000:>10.1f}ms {legacy / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 400_000], help="Characters per input")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.sizes, args.repeat)
@@ -0,0 +1,182 @@
+"""
+Load test: sync Flask workers against the async ASGI app, on local stand-ins.
+
+Sync mode models `gunicorn -w N` with sync workers: N threads, each serving
+one request at a time through the Flask app. Async mode drives asgi.app on
+one event loop with up to C requests in flight. Both call the app in
+process (no HTTP server in between). Gemini, the embedding API and Mongo
+are the fakes from benchmarks/fakes.py, with the same latencies in both
+modes. Every request uses a distinct job description, so no cache hides
+the external calls.
+
+    python -m benchmarks.bench_serving --requests 200 --sync-workers 4 --concurrency 200
+    python -m benchmarks.bench_serving --endpoint upload --requests 50
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Fully offline app: no Atlas, no on-disk caches or job store, no free-tier rate limits
+for key, value in {
+    "GEMINI_API_KEY": "benchmark",
+    "VECTOR_STORE_BACKEND": "memory",
+    "INGESTION_JOB_STORE": "memory",
+    "EMBEDDING_CACHE_PATH": "",
+    "ANALYSIS_CACHE_BACKEND": "none",
+    "DEDUP_DB_PATH": "",
+    "RATE_LIMIT_BACKEND": "none",
+}.items():
+    os.environ[key] = value
+
+import google.generativeai as genai
+
+import app as flask_app
+import asgi
+from benchmarks.corpus import SIZES, make_document, make_job_description
+from benchmarks.fakes import FakeCollection, FakeEmbeddingServer, FakeGenerativeModel
+from services.ingestion import COMPLETED
+from services.vector_store import MongoVectorStore
+from utils.asgi import asgi_request
+
+
+def install_fakes(args, server: FakeEmbeddingServer) -> FakeGenerativeModel:
+    genai.embed_content = server.embed_content
+    genai.embed_content_async = server.embed_content_async
+
+    # Before anything is built, so the ingestion queue picks up the fake store
+    flask_app.components.set("vector_store", MongoVectorStore(collection=FakeCollection(latency=args.mongo_latency)))
+
+    model = FakeGenerativeModel(latency=args.llm_latency)
+    flask_app.components.analyzer.model = model
+    return model
+
+
+def ingest(count: int) -> list:
+    resume_ids = []
+    for seed in range(count):
+        resume_id = f"bench-{seed}"
+        data = make_document("txt", SIZES["medium"], seed)
+        flask_app.components.ingestion_queue.submit(resume_id, f"{resume_id}.txt", "txt", data)
+        resume_ids.append(resume_id)
+    for resume_id in resume_ids:
+        assert flask_app.components.ingestion_queue.wait_for_resume(resume_id, timeout=600)["status"] == COMPLETED
+    return resume_ids
+
+
+def multipart(filename: str, data: bytes):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: text/plain\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def make_requests(args, resume_ids, first: int):
+    """
+    (path, query, body, content_type) per request. Numbering starts at `first`
+    so each mode gets job descriptions and files the other has not cached.
+    """
+    requests = []
+    for i in range(first, first + args.requests):
+        if args.endpoint == "analyze":
+            payload = {
+                "resume_id": resume_ids[i % len(resume_ids)],
+                "job_description": f"{make_job_description(i % 5)}\nRequisition {i}",
+            }
+            requests.append(("/api/analyze", "", json.dumps(payload).encode(), "application/json"))
+        else:
+            body, content_type = multipart(f"upload-{i}.txt", make_document("txt", SIZES["small"], 1000 + i))
+            requests.append(("/api/upload-resume", "wait=true", body, content_type))
+    return requests
+
+
+def run_sync(requests, workers: int) -> dict:
+    def call(request):
+        path, query, body, content_type = request
+        client = flask_app.app.test_client()
+        start = time.perf_counter()
+        response = client.post(f"{path}?{query}" if query else path, data=body, content_type=content_type)
+        return response.status_code, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(call, requests))
+    return summarize("sync", workers, results, time.perf_counter() - start)
+
+
+def run_async(requests, concurrency: int) -> dict:
+    async def main():
+        limit = asyncio.Semaphore(concurrency)
+
+        async def call(request):
+            path, query, body, content_type = request
+            async with limit:
+                start = time.perf_counter()
+                status, _, _ = await asgi_request(
+                    asgi.app, "POST", path, body, headers=[("Content-Type", content_type)], query_string=query
+                )
+                return status, time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(call(request) for request in requests))
+        return summarize("async", concurrency, results, time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+def summarize(mode: str, concurrency: int, results, seconds: float) -> dict:
+    latencies = sorted(latency for _, latency in results)
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "requests": len(results),
+        "errors": sum(status >= 400 for status, _ in results),
+        "seconds": round(seconds, 3),
+        "requests_per_second": round(len(results) / seconds, 2),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1),
+        "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+    }
+
+
+def main(args):
+    with FakeEmbeddingServer(latency=args.embed_latency) as server:
+        model = install_fakes(args, server)
+        with redirect_stdout(io.StringIO()):
+            resume_ids = ingest(args.resumes)
+            results = [
+                run_sync(make_requests(args, resume_ids, 0), args.sync_workers),
+                run_async(make_requests(args, resume_ids, args.requests), args.concurrency),
+            ]
+
+    print(f"{args.requests} x POST /api/{args.endpoint}; fake latencies: embed {args.embed_latency}s, "
+          f"mongo {args.mongo_latency}s, llm {args.llm_latency}s ({model.calls} LLM calls)\n")
+    print(f"{'mode':>6} {'in flight':>10} {'errors':>7} {'seconds':>8} {'req/s':>8} {'p50':>9} {'p95':>9}")
+    for r in results:
+        print(f"{r['mode']:>6} {r['concurrency']:>10} {r['errors']:>7} {r['seconds']:>8.2f} "
+              f"{r['requests_per_second']:>8.2f} {r['p50_ms']:>7.0f}ms {r['p95_ms']:>7.0f}ms")
+    sync, async_ = results
+    print(f"\nAsync throughput: {async_['requests_per_second'] / sync['requests_per_second']:.1f}x sync")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoint", choices=["analyze", "upload"], default="analyze")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--resumes", type=int, default=10, help="Resumes ingested up front for analyze requests")
+    parser.add_argument("--sync-workers", type=int, default=4, help="Sync workers (gunicorn -w) to model")
+    parser.add_argument("--concurrency", type=int, default=200, help="Requests in flight in async mode")
+    parser.add_argument("--embed-latency", type=float, default=0.05, help="Seconds per fake embedding request")
+    parser.add_argument("--mongo-latency", type=float, default=0.005, help="Seconds per fake Mongo round trip")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per fake Gemini call")
+    main(parser.parse_args())
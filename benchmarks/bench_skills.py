@@ -0,0 +1,93 @@
+"""
+Benchmark local skill extraction and bulk screening.
+
+Times the Aho-Corasick SkillMatcher against one regex search per taxonomy
+term, indexing of synthetic resumes at ingest, and screening a job
+description against all of them from the stored skills:
+
+    python -m benchmarks.bench_skills --resumes 500 --pages 2
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.corpus import LINES_PER_PAGE, make_job_description, resume_lines
+from config import Config
+from services.chunker import ResumeChunker
+from services.skills import (
+    InMemorySkillStore, ResumeSkills, SkillMatcher, SQLiteSkillStore, load_taxonomy, taxonomy_terms
+)
+
+
+def regex_baseline(taxonomy):
+    """The per-term approach the automaton replaces: one compiled regex search per term."""
+    patterns = [
+        (skill, re.compile(r"(?<![\w.+#-])" + re.escape(term) + r"(?![\w+#])",
+                           0 if case_sensitive else re.IGNORECASE))
+        for skill, term, case_sensitive in taxonomy_terms(taxonomy)
+    ]
+
+    def find(text):
+        text = " ".join(text.split())
+        return list(dict.fromkeys(skill for skill, pattern in patterns if pattern.search(text)))
+    return find
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(resumes: int, pages: int, repeat: int):
+    taxonomy = load_taxonomy(Config.SKILLS_TAXONOMY_PATH)
+    start = time.perf_counter()
+    matcher = SkillMatcher(taxonomy)
+    compile_time = time.perf_counter() - start
+    print(f"Taxonomy: {len(matcher.skills)} skills, {matcher.terms} terms, compiled in {compile_time * 1000:.1f}ms\n")
+
+    chunker = ResumeChunker()
+    documents = [chunker.chunk_by_sections("\n".join(resume_lines(seed, pages * LINES_PER_PAGE)))
+                 for seed in range(resumes)]
+    text = " ".join(chunk["text"] for chunk in documents[0])
+    baseline = regex_baseline(taxonomy)
+    assert set(baseline(text)) == set(matcher.find(text))
+
+    automaton = best_of(lambda: matcher.find(text), repeat)
+    regex = best_of(lambda: baseline(text), repeat)
+    print(f"Extract one resume ({len(text) / 1024:.1f}KB): automaton {automaton * 1000:.2f}ms, "
+          f"regex per term {regex * 1000:.2f}ms ({regex / automaton:.1f}x)")
+
+    job_description = make_job_description(0)
+    print(f"Extract one JD: {best_of(lambda: matcher.find(job_description), repeat) * 1000:.3f}ms\n")
+
+    resume_ids = [f"resume-{i}" for i in range(resumes)]
+    path = os.path.join(tempfile.mkdtemp(), "skills.sqlite3")
+    print(f"{'store':>8} {'index/resume':>13} {'screen':>10} {'per resume':>11}")
+    for name, store in (("memory", InMemorySkillStore()), ("sqlite", SQLiteSkillStore(path))):
+        skills = ResumeSkills(matcher, store)
+        start = time.perf_counter()
+        for resume_id, chunks in zip(resume_ids, documents):
+            skills.index(resume_id, chunks)
+        index_time = (time.perf_counter() - start) / resumes
+
+        screen = best_of(lambda: skills.screen(job_description, resume_ids), repeat)
+        print(f"{name:>8} {index_time * 1000:>11.2f}ms {screen * 1000:>8.2f}ms {screen / resumes * 1e6:>9.1f}us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=2, help="Pages of text per synthetic resume")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.resumes, args.pages, args.repeat)
@@ -0,0 +1,118 @@
+"""
+Compare chunk-embedding storage formats: BSON array, packed float32, int8 + rescoring.
+
+Reports document size, encode/decode cost, search latency through
+MongoVectorStore on the in-memory FakeCollection, and recall@k against exact
+float search (int8 with and without the float32 rescoring step):
+
+    python -m benchmarks.bench_vector_storage --resumes 20 --chunks 200 --dims 768
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+import bson
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.fakes import FakeCollection
+from services.vector_codec import STORAGE_FORMATS, decode_vector, encode_int8, encode_vector, quantize_int8
+from services.vector_store import MongoVectorStore
+
+
+def make_vectors(count: int, dims: int, seed: int = 0) -> np.ndarray:
+    """Unit vectors around a few topic centroids, like embeddings of one candidate pool."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(8, dims))
+    vectors = centroids[rng.integers(0, 8, count)] + 0.8 * rng.normal(size=(count, dims))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def document_size(vector: np.ndarray, storage: str) -> int:
+    document = {
+        "_id": "00000000-0000-0000-0000-000000000000:Experience_0",
+        "resume_id": "00000000-0000-0000-0000-000000000000",
+        "content": "x" * 1500,
+        "embedding": encode_vector(vector, storage),
+        "metadata": {"section": "Experience", "chunk_id": "Experience_0", "word_count": 250},
+    }
+    if storage == "int8":
+        document["embedding_int8"] = encode_int8(vector)
+    return len(bson.encode(document))
+
+
+def timed(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def recall(found, expected) -> float:
+    return len(set(found) & set(expected)) / len(expected)
+
+
+def run(resumes: int, chunks: int, dims: int, queries: int, top_k: int):
+    vectors = make_vectors(resumes * chunks, dims)
+    query_vectors = make_vectors(queries, dims, seed=1)
+    print(f"{resumes} resumes x {chunks} chunks, {dims} dims, {queries} queries, top_k={top_k}\n")
+
+    print(f"{'storage':>8} {'doc bytes':>10} {'vector bytes':>13} {'encode/vec':>11} {'decode/vec':>11}")
+    sample = vectors[:500]
+    for storage in STORAGE_FORMATS:
+        full = document_size(vectors[0], storage)
+        bare = document_size(vectors[0][:0], "array")
+        encode = timed(lambda: [encode_vector(v, storage) for v in sample]) / len(sample)
+        encoded = [encode_vector(v, storage) for v in sample]
+        decode = timed(lambda: [decode_vector(v) for v in encoded]) / len(sample)
+        print(f"{storage:>8} {full:>10} {full - bare:>13} {encode * 1e6:>9.1f}us {decode * 1e6:>9.1f}us")
+
+    print(f"\n{'storage':>8} {'search':>10} {'recall@k':>9}")
+    chunk_docs = [{"text": f"chunk {i}", "section": "Experience", "chunk_id": f"Experience_{i}", "word_count": 2}
+                  for i in range(chunks)]
+    for storage in STORAGE_FORMATS:
+        store = MongoVectorStore(collection=FakeCollection(latency=0), storage=storage)
+        store.add_many({
+            f"r{r}": (chunk_docs, vectors[r * chunks:(r + 1) * chunks]) for r in range(resumes)
+        })
+
+        total, recalls = 0.0, []
+        for q, query in enumerate(query_vectors):
+            r = q % resumes
+            exact = np.argsort(-(vectors[r * chunks:(r + 1) * chunks] @ query))[:top_k]
+            start = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                results = store.search(query, f"r{r}", top_k=top_k)
+            total += time.perf_counter() - start
+            recalls.append(recall([int(res["text"].split()[1]) for res in results], exact))
+        print(f"{storage:>8} {total / queries * 1000:>8.2f}ms {np.mean(recalls):>9.3f}")
+
+    # What the coarse int8 pass alone would return, without float32 rescoring
+    quantized = np.stack([quantize_int8(v) for v in vectors]).astype(np.float32)
+    quantized /= np.linalg.norm(quantized, axis=1, keepdims=True)
+    recalls = []
+    for q, query in enumerate(query_vectors):
+        r = q % resumes
+        rows = slice(r * chunks, (r + 1) * chunks)
+        exact = np.argsort(-(vectors[rows] @ query))[:top_k]
+        coarse = np.argsort(-(quantized[rows] @ quantize_int8(query).astype(np.float32)))[:top_k]
+        recalls.append(recall(coarse, exact))
+    print(f"{'int8 raw':>8} {'':>10} {np.mean(recalls):>9.3f}  (coarse pass only, no rescoring)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=200, help="Chunks per resume")
+    parser.add_argument("--dims", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=6)
+    args = parser.parse_args()
+
+    run(args.resumes, args.chunks, args.dims, args.queries, args.top_k)
@@ -0,0 +1,137 @@
+"""Synthetic resume documents and job descriptions for the offline benchmarks."""
+import io
+import random
+from typing import Dict, List
+
+from docx import Document
+
+SECTIONS = ["SUMMARY", "EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS", "CERTIFICATIONS"]
+SKILLS = ["Python", "Flask", "MongoDB", "Docker", "Kubernetes", "AWS", "PostgreSQL", "React",
+          "TypeScript", "Redis", "Kafka", "Terraform", "Pandas", "PyTorch", "GraphQL", "Go"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimised", "Maintained", "Shipped", "Automated"]
+OBJECTS = ["REST APIs", "data pipelines", "a billing service", "CI/CD workflows", "search ranking",
+           "an internal dashboard", "ETL jobs", "a recommendation engine"]
+
+
+def resume_lines(seed: int, lines: int) -> List[str]:
+    """Deterministic resume-like text: section headers followed by bullet sentences."""
+    rng = random.Random(seed)
+    out = [f"Candidate {seed}", f"candidate{seed}@example.com"]
+    while len(out) < lines:
+        out.append(rng.choice(SECTIONS))
+        for _ in range(rng.randint(3, 8)):
+            out.append(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using "
+                       f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)} for {rng.randint(2, 40)} teams")
+    return out[:lines]
+
+
+JOB_TITLES = ["Backend Engineer", "Data Engineer", "Platform Engineer", "Full Stack Developer",
+              "Machine Learning Engineer", "Site Reliability Engineer"]
+
+# Pages per document size; DOCX and TXT get the same number of lines
+SIZES = {"small": 1, "medium": 3, "large": 8}
+LINES_PER_PAGE = 45
+FORMATS = ["pdf", "docx", "txt"]
+
+
+def make_txt(lines: List[str]) -> bytes:
+    return "\n".join(lines).encode("utf-8")
+
+
+def make_docx(lines: List[str]) -> bytes:
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def make_document(file_type: str, pages: int, seed: int) -> bytes:
+    if file_type == "pdf":
+        return make_pdf(pages, seed=seed, lines_per_page=LINES_PER_PAGE)
+    lines = resume_lines(seed, pages * LINES_PER_PAGE)
+    if file_type == "docx":
+        return make_docx(lines)
+    if file_type == "txt":
+        return make_txt(lines)
+    raise ValueError(f"Unknown file type: {file_type}")
+
+
+def make_job_description(seed: int) -> str:
+    rng = random.Random(seed)
+    required = rng.sample(SKILLS, 5)
+    nice = rng.sample([s for s in SKILLS if s not in required], 3)
+    return (
+        f"{rng.choice(JOB_TITLES)}\n"
+        f"We are hiring an engineer with {rng.randint(2, 8)}+ years of experience.\n"
+        f"Required: {', '.join(required)}.\n"
+        f"Nice to have: {', '.join(nice)}.\n"
+        f"You will {rng.choice(VERBS).lower()} {rng.choice(OBJECTS)} and {rng.choice(OBJECTS)}."
+    )
+
+
+def generate_corpus(per_size: int = 2, formats: List[str] = None, sizes: List[str] = None) -> List[Dict]:
+    """
+    `per_size` documents for every (format, size) pair, each with distinct text:
+    [{"name", "file_type", "size", "data"}].
+    """
+    corpus = []
+    seed = 0
+    for file_type in formats or FORMATS:
+        for size in sizes or list(SIZES):
+            for i in range(per_size):
+                seed += 1
+                corpus.append({
+                    "name": f"{size}-{i}.{file_type}",
+                    "file_type": file_type,
+                    "size": size,
+                    "data": make_document(file_type, SIZES[size], seed),
+                })
+    return corpus
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages: int, seed: int = 0, lines_per_page: int = 45) -> bytes:
+    """
+    Minimal multi-page PDF with real text operators (Helvetica), so pdfplumber
+    extracts it the same way it would a generated CV.
+    """
+    lines = resume_lines(seed, pages * lines_per_page)
+    page_ids = [3 + 2 * i for i in range(pages)]
+    font_id = 3 + 2 * pages
+
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        2: ("<< /Type /Pages /Kids [%s] /Count %d >>"
+            % (" ".join(f"{pid} 0 R" for pid in page_ids), pages)).encode(),
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    for i, page_id in enumerate(page_ids):
+        page_lines = lines[i * lines_per_page:(i + 1) * lines_per_page]
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in page_lines:
+            ops.append(f"({_pdf_escape(line)}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+                            f"/Contents {page_id + 1} 0 R >>").encode()
+        objects[page_id + 1] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n%s\nendobj\n" % (obj_id, objects[obj_id])
+
+    xref_at = len(out)
+    count = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % count
+    for obj_id in range(1, count):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (count, xref_at)
+    return bytes(out)
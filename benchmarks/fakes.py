@@ -0,0 +1,315 @@
+"""Local stand-ins for external services, used by the offline benchmarks."""
+import asyncio
+import copy
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List
+
+import numpy as np
+import requests
+
+from services.vector_codec import decode_vector
+
+
+def fake_embedding(text: str, dimensions: int = 768) -> List[float]:
+    """Deterministic pseudo-embedding derived from the text hash."""
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big")
+    rng = random.Random(seed)
+    return [rng.uniform(-1.0, 1.0) for _ in range(dimensions)]
+
+
+class FakeEmbeddingServer:
+    """
+    HTTP embedding endpoint on localhost with configurable latency.
+
+    Each request costs `latency` seconds plus `per_item_latency` per text,
+    which roughly models a batchEmbedContents round trip.
+    """
+
+    def __init__(self, latency: float = 0.05, per_item_latency: float = 0.0005, dimensions: int = 768):
+        self.latency = latency
+        self.per_item_latency = per_item_latency
+        self.dimensions = dimensions
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/embed"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                texts = payload["texts"]
+
+                with server._lock:
+                    server.request_count += 1
+                time.sleep(server.latency + server.per_item_latency * len(texts))
+
+                body = json.dumps({
+                    "embeddings": [fake_embedding(t, server.dimensions) for t in texts]
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeEmbeddingServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def embed_content(self, model: str, content, task_type: str = None, **kwargs) -> dict:
+        """Drop-in replacement for `genai.embed_content` that calls this server."""
+        texts = [content] if isinstance(content, str) else list(content)
+        response = requests.post(self.url, json={"model": model, "texts": texts})
+        response.raise_for_status()
+        embeddings = response.json()["embeddings"]
+        return {"embedding": embeddings[0] if isinstance(content, str) else embeddings}
+
+    async def embed_content_async(self, model: str, content, task_type: str = None, **kwargs) -> dict:
+        """Drop-in replacement for `genai.embed_content_async`, over a non-blocking connection."""
+        texts = [content] if isinstance(content, str) else list(content)
+        body = json.dumps({"model": model, "texts": texts}).encode()
+        host, port = self._server.server_address
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(
+                f"POST /embed HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+        status_line, _, rest = response.partition(b"\r\n")
+        if b" 200 " not in status_line:
+            raise RuntimeError(f"Fake embedding server returned {status_line.decode()}")
+        embeddings = json.loads(rest.split(b"\r\n\r\n", 1)[1])["embeddings"]
+        return {"embedding": embeddings[0] if isinstance(content, str) else embeddings}
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def fake_analysis(prompt: str) -> Dict:
+    """Deterministic analysis JSON shaped like the real model's output."""
+    rng = random.Random(hashlib.sha256(prompt.encode()).digest())
+    return {
+        "match_score": rng.randint(40, 95),
+        "ats_score": rng.randint(40, 95),
+        "matched_skills": ["Python", "Flask", "MongoDB"],
+        "missing_skills": ["Kubernetes"],
+        "strengths": ["Backend experience with Python services"],
+        "weaknesses": ["Limited infrastructure exposure"],
+        "improvements": ["Quantify the impact of past projects"],
+        "reasoning": "Synthetic analysis produced by the benchmark fake model.",
+    }
+
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """
+    Stand-in for `genai.GenerativeModel`: waits `latency` seconds, then
+    returns fake_analysis() JSON, optionally streamed in `stream_chunks` pieces.
+    """
+
+    def __init__(self, latency: float = 1.0, stream_chunks: int = 8):
+        self.latency = latency
+        self.stream_chunks = stream_chunks
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, generation_config=None, stream: bool = False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        text = json.dumps(fake_analysis(prompt), indent=2)
+        if stream:
+            return self._stream(text)
+        time.sleep(self.latency)
+        return _FakeResponse(text)
+
+    async def generate_content_async(self, prompt: str, generation_config=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        await asyncio.sleep(self.latency)
+        return _FakeResponse(json.dumps(fake_analysis(prompt), indent=2))
+
+    def _stream(self, text: str) -> Iterator[_FakeResponse]:
+        step = -(-len(text) // self.stream_chunks)
+        for start in range(0, len(text), step):
+            time.sleep(self.latency / self.stream_chunks)
+            yield _FakeResponse(text[start:start + step])
+
+
+class _DeleteResult:
+    def __init__(self, deleted_count: int):
+        self.deleted_count = deleted_count
+
+
+class _InsertManyResult:
+    def __init__(self, inserted_ids: List):
+        self.inserted_ids = inserted_ids
+
+
+class _BulkWriteResult:
+    def __init__(self, upserted_count: int, modified_count: int, deleted_count: int):
+        self.upserted_count = upserted_count
+        self.modified_count = modified_count
+        self.deleted_count = deleted_count
+
+
+class FakeCollection:
+    """
+    In-memory stand-in for the `resume_chunks` collection, covering the calls
+    MongoVectorStore makes. Every call sleeps `latency` seconds to model a
+    network round trip; $vectorSearch scores like Atlas cosine: (1 + cos) / 2.
+    Setting `indexed` to False makes $vectorSearch return nothing, as Atlas
+    does before its index has synced.
+    """
+
+    def __init__(self, latency: float = 0.002):
+        self.latency = latency
+        self.round_trips = 0
+        self.indexed = True
+        self.documents: List[Dict] = []
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def _round_trip(self):
+        with self._lock:
+            self.round_trips += 1
+        time.sleep(self.latency)
+
+    def insert_many(self, documents: List[Dict]) -> _InsertManyResult:
+        self._round_trip()
+        ids = []
+        with self._lock:
+            for document in documents:
+                self._next_id += 1
+                document.setdefault("_id", self._next_id)
+                self.documents.append(copy.deepcopy(document))
+                ids.append(document["_id"])
+        return _InsertManyResult(ids)
+
+    def bulk_write(self, operations: List, ordered: bool = True) -> _BulkWriteResult:
+        """ReplaceOne and DeleteMany requests, applied in one round trip."""
+        self._round_trip()
+        upserted = modified = deleted = 0
+        with self._lock:
+            for operation in operations:
+                name = type(operation).__name__
+                if name == "ReplaceOne":
+                    document = copy.deepcopy(operation._doc)
+                    for i, existing in enumerate(self.documents):
+                        if _matches(existing, operation._filter):
+                            document.setdefault("_id", existing.get("_id"))
+                            self.documents[i] = document
+                            modified += 1
+                            break
+                    else:
+                        if not operation._upsert:
+                            continue
+                        self._next_id += 1
+                        document.setdefault("_id", self._next_id)
+                        self.documents.append(document)
+                        upserted += 1
+                elif name == "DeleteMany":
+                    kept = [d for d in self.documents if not _matches(d, operation._filter)]
+                    deleted += len(self.documents) - len(kept)
+                    self.documents = kept
+                else:
+                    raise NotImplementedError(f"FakeCollection.bulk_write does not support {name}")
+        return _BulkWriteResult(upserted, modified, deleted)
+
+    def create_index(self, keys, **kwargs) -> str:
+        return f"{keys}_1"
+
+    def delete_many(self, query: Dict) -> _DeleteResult:
+        self._round_trip()
+        with self._lock:
+            kept = [d for d in self.documents if not _matches(d, query)]
+            deleted = len(self.documents) - len(kept)
+            self.documents = kept
+        return _DeleteResult(deleted)
+
+    def find(self, query: Dict, projection: Dict = None) -> Iterator[Dict]:
+        self._round_trip()
+        with self._lock:
+            found = [d for d in self.documents if _matches(d, query)]
+        return iter([_project(d, projection) for d in found])
+
+    def aggregate(self, pipeline: List[Dict]) -> Iterator[Dict]:
+        self._round_trip()
+        search = pipeline[0]["$vectorSearch"]
+        with self._lock:
+            candidates = [d for d in self.documents if _matches(d, search.get("filter", {}))]
+        if not candidates or not self.indexed:
+            return iter([])
+
+        matrix = np.asarray([decode_vector(d[search["path"]]) for d in candidates], dtype=np.float32)
+        query = decode_vector(search["queryVector"]).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = (1.0 + (matrix @ query) / np.where(norms == 0, 1.0, norms)) / 2.0
+        order = np.argsort(-scores)[:search["limit"]]
+
+        projection = pipeline[1]["$project"] if len(pipeline) > 1 else None
+        results = []
+        for i in order:
+            document = _project(candidates[i], {k: 1 for k in projection if k != "score"} if projection else None)
+            document["score"] = float(scores[i])
+            results.append(document)
+        return iter(results)
+
+
+def _matches(document: Dict, query: Dict) -> bool:
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict) and "$in" in condition:
+            if value not in condition["$in"]:
+                return False
+        elif isinstance(condition, dict) and "$nin" in condition:
+            if value in condition["$nin"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(document: Dict, projection: Dict = None) -> Dict:
+    if not projection:
+        return copy.deepcopy(document)
+    included = {k for k, v in projection.items() if v}
+    result = {k: copy.deepcopy(v) for k, v in document.items() if k in included}
+    if projection.get("_id", 1) and "_id" in document:
+        result["_id"] = document["_id"]
+    return result
@@ -1,11 +1,6 @@
-from pymongo import MongoClient
-from dotenv import load_dotenv
-import os
+from services.mongo import get_database
 
-load_dotenv()
-
-client = MongoClient(os.getenv('MONGODB_URI'))
-db = client.resume_analyzer
+db = get_database()
 
 # Check for the specific resume
 resume_id = "b14a7edf-f394-407e-aa6f-3d69b66ef869"
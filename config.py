@@ -10,20 +10,124 @@ class Config:
     
     # MongoDB Configuration
     MONGODB_URI = os.getenv('MONGODB_URI')
+    MONGODB_DATABASE = os.getenv('MONGODB_DATABASE', 'resume_analyzer')
+    MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', 50))
+    MONGO_MIN_POOL_SIZE = int(os.getenv('MONGO_MIN_POOL_SIZE', 0))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv('MONGO_CONNECT_TIMEOUT_MS', 5000))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', 5000))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv('MONGO_SOCKET_TIMEOUT_MS', 30000))
+    # Write concern: "majority" or a node count such as "1"
+    MONGO_WRITE_CONCERN = os.getenv('MONGO_WRITE_CONCERN', 'majority')
+    MONGO_WRITE_TIMEOUT_MS = int(os.getenv('MONGO_WRITE_TIMEOUT_MS', 10000))
     
-    # Rate Limits
-    GEMINI_RPM = 15
-    GEMINI_TPM = 1_000_000
-    EMBEDDING_RPO = 1500 # Requests per day
+    # Analysis Result Cache: "sqlite" (shared, persistent), "memory" or "none"
+    ANALYSIS_CACHE_BACKEND = os.getenv('ANALYSIS_CACHE_BACKEND', 'sqlite').lower()
+    ANALYSIS_CACHE_PATH = os.getenv('ANALYSIS_CACHE_PATH', './cache/analysis.sqlite3')
+    ANALYSIS_CACHE_TTL = float(os.getenv('ANALYSIS_CACHE_TTL', 24 * 60 * 60))
+    ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', 5000))
+
+    # Vector Store: "atlas" ($vectorSearch), "numpy" (exact search over Atlas-stored
+    # embeddings) or "memory" (fully offline, nothing persisted)
+    VECTOR_STORE_BACKEND = os.getenv('VECTOR_STORE_BACKEND', 'atlas').lower()
+    NUMPY_STORE_MAX_RESUMES = int(os.getenv('NUMPY_STORE_MAX_RESUMES', 1024))
+
+    # Embedding storage in Atlas: "float32" (packed BinData), "int8" (adds an int8 copy
+    # searched by VECTOR_INDEX_INT8, top candidates rescored exactly) or "array" (legacy)
+    EMBEDDING_STORAGE = os.getenv('EMBEDDING_STORAGE', 'float32').lower()
+    VECTOR_INDEX = os.getenv('VECTOR_INDEX', 'vector_index')
+    VECTOR_INDEX_INT8 = os.getenv('VECTOR_INDEX_INT8', 'vector_index_int8')
+    INT8_RESCORE_FACTOR = int(os.getenv('INT8_RESCORE_FACTOR', 4))
+
+    # Read-your-writes: answer searches for just-written resumes in process until the
+    # Atlas index has them (probed at most every PROBE_INTERVAL seconds); 0 TTL disables
+    RECENT_WRITES_TTL = float(os.getenv('RECENT_WRITES_TTL', 120))
+    RECENT_WRITES_PROBE_INTERVAL = float(os.getenv('RECENT_WRITES_PROBE_INTERVAL', 1.0))
+    RECENT_WRITES_MAX_RESUMES = int(os.getenv('RECENT_WRITES_MAX_RESUMES', 256))
+
+    # Ingestion Jobs: "sqlite" shares job status across workers, "memory" is per process
+    INGESTION_JOB_STORE = os.getenv('INGESTION_JOB_STORE', 'sqlite').lower()
+    INGESTION_DB_PATH = os.getenv('INGESTION_DB_PATH', './cache/jobs.sqlite3')
+    INGESTION_WORKERS = int(os.getenv('INGESTION_WORKERS', 2))
+    INGESTION_WAIT_TIMEOUT = float(os.getenv('INGESTION_WAIT_TIMEOUT', 60))
+    # Seconds without progress after which a queued/processing job counts as abandoned
+    INGESTION_STALE_AFTER = float(os.getenv('INGESTION_STALE_AFTER', 600))
+
+    # Upload Deduplication (empty path disables it)
+    DEDUP_DB_PATH = os.getenv('DEDUP_DB_PATH', './cache/resumes.sqlite3')
+
+    # Skills: taxonomy of {skill: [synonyms]} (empty disables matching) and the per-resume
+    # skills extracted at ingest (empty path keeps them in memory)
+    SKILLS_TAXONOMY_PATH = os.getenv('SKILLS_TAXONOMY_PATH', './data/skills.json')
+    SKILLS_DB_PATH = os.getenv('SKILLS_DB_PATH', './cache/skills.sqlite3')
+
+    # Batch Ranking (/api/rank)
+    RANK_MAX_RESUMES = int(os.getenv('RANK_MAX_RESUMES', 500))
+    RANK_TOP_CHUNKS = int(os.getenv('RANK_TOP_CHUNKS', 3))
+    RANK_ANALYZE_CONCURRENCY = int(os.getenv('RANK_ANALYZE_CONCURRENCY', 4))
+
+    # Prompt Context: retrieved chunks are deduplicated and cut to CONTEXT_TOKEN_BUDGET
+    # estimated tokens (0 disables the cap); trimmed pieces under MIN_CHUNK_WORDS are dropped
+    CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', 2000))
+    CONTEXT_MIN_CHUNK_WORDS = int(os.getenv('CONTEXT_MIN_CHUNK_WORDS', 8))
+
+    # Async Serving (asgi.py): threads for blocking calls awaited via the executor
+    # (vector search, SQLite) and for routes still served by the Flask app
+    ASYNC_BLOCKING_THREADS = int(os.getenv('ASYNC_BLOCKING_THREADS', 64))
+    ASYNC_WSGI_THREADS = int(os.getenv('ASYNC_WSGI_THREADS', 16))
+
+    # Service Startup: services are built on first use in each process. With
+    # SERVICE_PRELOAD=true their modules (SDKs, parsers) are imported when app.py
+    # loads, so `gunicorn --preload` workers inherit them instead of paying per worker
+    SERVICE_PRELOAD = os.getenv('SERVICE_PRELOAD', 'false').lower() == 'true'
+
+    # Rate Limits: per-minute budgets (0 = unlimited), kept as token buckets that all
+    # workers share through RATE_LIMIT_DB_PATH (RATE_LIMIT_BACKEND sqlite | memory | none).
+    # Bulk work (document embedding) leaves RATE_LIMIT_BULK_RESERVE of every bucket to
+    # interactive requests, which give up with a 429 after RATE_LIMIT_MAX_WAIT seconds
+    GEMINI_RPM = int(os.getenv('GEMINI_RPM', 15))
+    GEMINI_TPM = int(os.getenv('GEMINI_TPM', 1_000_000))
+    EMBEDDING_RPM = int(os.getenv('EMBEDDING_RPM', 1500))
+    EMBEDDING_TPM = int(os.getenv('EMBEDDING_TPM', 0))
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'sqlite').lower()
+    RATE_LIMIT_DB_PATH = os.getenv('RATE_LIMIT_DB_PATH', './cache/ratelimit.sqlite3')
+    RATE_LIMIT_BULK_RESERVE = float(os.getenv('RATE_LIMIT_BULK_RESERVE', 0.2))
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', 30))
+    RATE_LIMIT_MAX_RETRIES = int(os.getenv('RATE_LIMIT_MAX_RETRIES', 4))
+    RATE_LIMIT_BACKOFF_BASE = float(os.getenv('RATE_LIMIT_BACKOFF_BASE', 1.0))
 
     # Application Settings
     MAX_FILE_SIZE = 1024 * 1024 * 10 # 10MB
     ALLOWED_EXTENSIONS = {'pdf', 'txt', 'doc', 'docx'}
 
+    # PDF Extraction (documents with at least PDF_PARALLEL_MIN_PAGES pages are split
+    # across PDF_WORKERS processes; pages past PDF_MAX_PAGES are ignored)
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', 50))
+    PDF_WORKERS = int(os.getenv('PDF_WORKERS', min(4, os.cpu_count() or 1)))
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', 8))
+
+    # Embedding Cache (disk store is shared by all workers; empty path disables it)
+    EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', './cache/embeddings.sqlite3')
+    EMBEDDING_CACHE_MAX_ITEMS = int(os.getenv('EMBEDDING_CACHE_MAX_ITEMS', 10_000))
+    EMBEDDING_CACHE_MAX_BYTES = int(os.getenv('EMBEDDING_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    # Row cap of the shared disk tier (a 768-dim vector is ~3KB), least recently read evicted first
+    EMBEDDING_CACHE_MAX_ROWS = int(os.getenv('EMBEDDING_CACHE_MAX_ROWS', 100_000))
+    QUERY_CACHE_MAX_ITEMS = int(os.getenv('QUERY_CACHE_MAX_ITEMS', 2_000))
+    QUERY_CACHE_MAX_BYTES = int(os.getenv('QUERY_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+
+    # Embedding backend: "gemini" (text-embedding-004, 768 dims) or "hashing" (local CPU,
+    # hashed n-grams). Stored chunks and dedup fingerprints record their backend; switching
+    # means re-uploading, which embeds each resume again under a new resume_id
+    EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'gemini').lower()
+    EMBEDDING_HASH_DIMENSIONS = int(os.getenv('EMBEDDING_HASH_DIMENSIONS', 512))
+
+    # Batch Embedding (Gemini accepts at most 100 texts per batch request)
+    EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', 100))
+    EMBEDDING_MAX_CONCURRENCY = int(os.getenv('EMBEDDING_MAX_CONCURRENCY', 4))
+
     @staticmethod
     def validate():
         """Validate the required configs are set."""
         if not Config.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY is not set")
-        if not Config.MONGODB_URI:
+        if not Config.MONGODB_URI and Config.VECTOR_STORE_BACKEND != "memory":
             raise ValueError("MONGODB_URI is not set")
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Convert stored chunk embeddings to another EMBEDDING_STORAGE format in place.
+
+    python migrate_embeddings.py --storage float32 --dry-run
+    python migrate_embeddings.py --storage int8
+
+Documents are rewritten in batches of unordered bulk updates and can be
+migrated while the app is running: readers decode both layouts. Run it
+again to resume after an interruption; converted documents are skipped.
+For int8, create the second Atlas index printed at the end before
+switching EMBEDDING_STORAGE, so searches have an index to hit.
+"""
+import argparse
+import json
+
+from pymongo import UpdateOne
+
+from config import Config
+from services.mongo import get_database
+from services.vector_codec import STORAGE_FORMATS, decode_vector, encode_int8, encode_vector
+
+
+def pending_filter(storage: str) -> dict:
+    """Documents not yet in the target layout."""
+    if storage == "array":
+        return {"$or": [{"embedding": {"$not": {"$type": "array"}}}, {"embedding_int8": {"$exists": True}}]}
+    if storage == "float32":
+        return {"$or": [{"embedding": {"$type": "array"}}, {"embedding_int8": {"$exists": True}}]}
+    return {"$or": [{"embedding": {"$type": "array"}}, {"embedding_int8": {"$exists": False}}]}
+
+
+def convert(document: dict, storage: str) -> dict:
+    vector = decode_vector(document["embedding"])
+    update = {"$set": {"embedding": encode_vector(vector, storage)}}
+    if storage == "int8":
+        update["$set"]["embedding_int8"] = encode_int8(vector)
+    else:
+        update["$unset"] = {"embedding_int8": ""}
+    return update
+
+
+def index_definitions(dimensions: int) -> list:
+    return [
+        {
+            "name": name,
+            "type": "vectorSearch",
+            "definition": {"fields": [
+                {"type": "vector", "path": path, "numDimensions": dimensions, "similarity": "cosine"},
+                {"type": "filter", "path": "resume_id"},
+            ]},
+        }
+        for name, path in ((Config.VECTOR_INDEX, "embedding"), (Config.VECTOR_INDEX_INT8, "embedding_int8"))
+    ]
+
+
+def migrate(storage: str, batch_size: int, dry_run: bool):
+    collection = get_database().resume_chunks
+    query = pending_filter(storage)
+    total = collection.count_documents(query)
+    print(f"{total} chunk documents to convert to {storage}")
+    if dry_run or not total:
+        return
+
+    converted = 0
+    dimensions = None
+    batch = []
+    for document in collection.find(query, {"_id": 1, "embedding": 1}, batch_size=batch_size):
+        if dimensions is None:
+            dimensions = len(decode_vector(document["embedding"]))
+        batch.append(UpdateOne({"_id": document["_id"]}, convert(document, storage)))
+        if len(batch) >= batch_size:
+            converted += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+            print(f"  {converted}/{total}")
+    if batch:
+        converted += collection.bulk_write(batch, ordered=False).modified_count
+
+    print(f"Converted {converted} documents")
+    if storage == "int8" and dimensions:
+        print("\nAtlas Vector Search index definitions (create the int8 one before switching):")
+        print(json.dumps(index_definitions(dimensions), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--storage", choices=STORAGE_FORMATS, default=Config.EMBEDDING_STORAGE)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="Only count documents that need converting")
+    args = parser.parse_args()
+
+    migrate(args.storage, args.batch_size, args.dry_run)
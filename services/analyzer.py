@@ -1,61 +1,296 @@
-import google.generativeai as genai
 import json
-from typing import List, Dict
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 from config import Config
-
-genai.configure(api_key=Config.GEMINI_API_KEY)
+from services.gemini import get_genai
+from services.context_packer import PackedContext, create_context_packer, estimate_tokens, render_chunks
+from services.json_stream import IncrementalJSONParser
+from services.metrics import CHUNKS_ANALYZED, CONTEXT_TOKENS, PROMPT_CHARS, RESPONSE_CHARS, timed
+from services.rate_limit import RateLimited
+from services.result_cache import create_result_cache, make_analysis_key
+from services.single_flight import SingleFlight
+from services.skills import render_skill_overlap
 
 class ResumeAnalyzer:
-    def __init__(self):
-        self.model = genai.GenerativeModel('models/gemini-2.5-flash')
+    GENERATION_CONFIG = {
+        "temperature": 0.2,
+        "top_p": 0.8,
+        "top_k": 40,
+        "max_output_tokens": 4096  # Increased from 2048
+    }
+
+    def __init__(self, result_cache=None, rate_limiter=None):
+        self.model_name = 'models/gemini-2.5-flash'
+        self.model = get_genai().GenerativeModel(self.model_name)
         self.prompt_template = self._load_prompt()
-    
-    def analyze(self, resume_chunks: List[Dict], job_description: str) -> Dict:
-        chunks_text = "\n\n".join([
-            f"[Section: {chunk['metadata']['section']}]\n{chunk['text']}"
-            for chunk in resume_chunks
-        ])
-
-        prompt = self.prompt_template.format(
-            resume_chunks=chunks_text,
-            job_description=job_description
-        )
+        self.result_cache = result_cache if result_cache is not None else create_result_cache(Config)
+        self.context_packer = create_context_packer(Config)
+        # Identical analyses requested at the same time share one Gemini call
+        self.in_flight = SingleFlight("analysis")
+        self.rate_limiter = rate_limiter
 
-        try:
-            response = self.model.generate_content(
-                prompt,
-                generation_config = {
-                    "temperature": 0.2,
-                    "top_p": 0.8,
-                    "top_k": 40,
-                    "max_output_tokens": 4096  # Increased from 2048
-                }
-            )
-            response_text = response.text.strip()
-            
-            # Remove markdown code blocks if present
-            if "```json" in response_text:
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                response_text = response_text[json_start:json_end]
-            elif response_text.startswith("```"):
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                response_text = response_text[json_start:json_end]
-            
-            result = json.loads(response_text)
+    def pack(self, resume_chunks: List[Dict]) -> PackedContext:
+        """Deduplicate and budget retrieved chunks for the prompt (see ContextPacker)."""
+        context = self.context_packer.pack(resume_chunks)
+        CONTEXT_TOKENS.observe(context.tokens_in, stage="retrieved")
+        CONTEXT_TOKENS.observe(context.tokens_out, stage="packed")
+        return context
+
+    def _packed_chunks(self, resume_chunks) -> List[Dict]:
+        if not isinstance(resume_chunks, PackedContext):
+            resume_chunks = self.pack(resume_chunks)
+        CHUNKS_ANALYZED.observe(len(resume_chunks.chunks))
+        return resume_chunks.chunks
+
+    def analyze(self, resume_chunks: List[Dict], job_description: str, skills: Optional[Dict] = None) -> Dict:
+        """
+        Analyze retrieved chunks (or a PackedContext from `pack`) against a job description.
+
+        `skills` is the resume's precomputed skill_overlap with the JD, given to the LLM as a starting point.
+        """
+        resume_chunks = self._packed_chunks(resume_chunks)
+        cache_key = self._get_cache_key(resume_chunks, job_description, skills)
+        with timed("analysis_cache"):
+            cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        def generate():
+            result = self._generate(resume_chunks, job_description, skills)
+            self._put_cached(cache_key, result)
             return result
 
+        return self.in_flight.do(cache_key, generate)
+
+    async def analyze_async(self, resume_chunks: List[Dict], job_description: str,
+                            skills: Optional[Dict] = None) -> Dict:
+        """`analyze` for the async server: awaits Gemini instead of blocking a thread."""
+        resume_chunks = self._packed_chunks(resume_chunks)
+        cache_key = self._get_cache_key(resume_chunks, job_description, skills)
+        with timed("analysis_cache"):
+            cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        async def generate():
+            result = await self._generate_async(resume_chunks, job_description, skills)
+            self._put_cached(cache_key, result)
+            return result
+
+        return await self.in_flight.do_async(cache_key, generate)
+
+    async def _generate_async(self, resume_chunks: List[Dict], job_description: str,
+                              skills: Optional[Dict] = None) -> Dict:
+        prompt = self._build_prompt(resume_chunks, job_description, skills)
+        PROMPT_CHARS.observe(len(prompt))
+        tokens = estimate_tokens(prompt)
+        try:
+            with timed("llm_generate"):
+                response = await self._call_async(lambda: self.model.generate_content_async(
+                    prompt,
+                    generation_config=self.GENERATION_CONFIG
+                ), tokens)
+            self._settle(tokens, response)
+            return self._parse_response(response.text)
+        except RateLimited as e:
+            return self._rate_limited(e)
+        except Exception as e:
+            print(f"LLM analysis failed: {e}")
+            return {"error": str(e)}
+
+    def _generate(self, resume_chunks: List[Dict], job_description: str, skills: Optional[Dict] = None) -> Dict:
+        prompt = self._build_prompt(resume_chunks, job_description, skills)
+        PROMPT_CHARS.observe(len(prompt))
+
+        tokens = estimate_tokens(prompt)
+        try:
+            with timed("llm_generate"):
+                response = self._call(lambda: self.model.generate_content(
+                    prompt,
+                    generation_config=self.GENERATION_CONFIG
+                ), tokens)
+            self._settle(tokens, response)
+            return self._parse_response(response.text)
+
+        except RateLimited as e:
+            return self._rate_limited(e)
+        except Exception as e:
+            print(f"LLM analysis failed: {e}")
+            return {"error": str(e)}
+
+    def _call(self, request, tokens: int):
+        """Send a Gemini request through the rate limiter, if there is one."""
+        if self.rate_limiter is None:
+            return request()
+        return self.rate_limiter.call("generation", request, tokens=tokens)
+
+    async def _call_async(self, request, tokens: int):
+        if self.rate_limiter is None:
+            return await request()
+        return await self.rate_limiter.call_async("generation", request, tokens=tokens)
+
+    def _settle(self, tokens: int, response):
+        """Charge the token budget for what the call really used, when Gemini reports it."""
+        usage = getattr(response, "usage_metadata", None)
+        used = getattr(usage, "total_token_count", None)
+        if self.rate_limiter is not None and isinstance(used, int):
+            self.rate_limiter.settle("generation", tokens, used)
+
+    @staticmethod
+    def _rate_limited(error: RateLimited) -> Dict:
+        # Never cached; the API maps retry_after to a 429
+        print(f"LLM analysis rate limited: {error}")
+        return {"error": str(error), "retry_after": round(error.retry_after, 1)}
+
+    def _parse_response(self, text: str) -> Dict:
+        RESPONSE_CHARS.observe(len(text))
+        response_text = text.strip()
+
+        # Remove markdown code blocks if present
+        if "```json" in response_text:
+            json_start = response_text.find("{")
+            json_end = response_text.rfind("}") + 1
+            response_text = response_text[json_start:json_end]
+        elif response_text.startswith("```"):
+            json_start = response_text.find("{")
+            json_end = response_text.rfind("}") + 1
+            response_text = response_text[json_start:json_end]
+
+        try:
+            return json.loads(response_text)
         except json.JSONDecodeError as e:
             print(f"Failed to parse LLM response: {e}")
             return {
                 "error": "Failed to parse LLM response",
-                "raw_response": response.text[:500]
+                "raw_response": text[:500]
             }
 
+    def analyze_stream(self, resume_chunks: List[Dict], job_description: str,
+                       skills: Optional[Dict] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Stream the analysis, yielding each top-level field as soon as it is complete.
+
+        Yields:
+            ("field", (key, value)) per field, then ("done", result) with the full
+            analysis, or ("error", {...}) if generation or parsing fails
+        """
+        resume_chunks = self._packed_chunks(resume_chunks)
+        cache_key = self._get_cache_key(resume_chunks, job_description, skills)
+        with timed("analysis_cache"):
+            cached = self._get_cached(cache_key)
+        if cached is not None:
+            yield from self._replay(cached)
+            return
+
+        future, leader = self.in_flight.acquire(cache_key)
+        if not leader:
+            # The same analysis is already being generated: wait and replay it
+            with timed("analysis_in_flight"):
+                result = future.result()
+            yield from self._replay(result)
+            return
+
+        result = {"error": "Analysis stream was interrupted"}
+        try:
+            result = yield from self._generate_stream(resume_chunks, job_description, skills)
+            self._put_cached(cache_key, result)
+        finally:
+            self.in_flight.finish(cache_key, future, result)
+        if "error" not in result:
+            yield "done", result
+
+    @staticmethod
+    def _replay(result: Dict) -> Iterator[Tuple[str, Any]]:
+        """`analyze_stream` events for an already complete result."""
+        if "error" in result:
+            yield "error", result
+            return
+        for key, value in result.items():
+            yield "field", (key, value)
+        yield "done", result
+
+    def _generate_stream(self, resume_chunks: List[Dict], job_description: str, skills: Optional[Dict] = None):
+        """Yield ("field", ...) and ("error", ...) events; returns the result (or error) dict."""
+        prompt = self._build_prompt(resume_chunks, job_description, skills)
+        PROMPT_CHARS.observe(len(prompt))
+        parser = IncrementalJSONParser()
+        tokens = estimate_tokens(prompt)
+
+        try:
+            with timed("llm_stream"):
+                response = self._call(lambda: self.model.generate_content(
+                    prompt,
+                    generation_config=self.GENERATION_CONFIG,
+                    stream=True
+                ), tokens)
+                for chunk in response:
+                    try:
+                        text = chunk.text
+                    except ValueError:
+                        # Chunks without text parts (e.g. the final finish_reason chunk)
+                        continue
+                    for key, value in parser.feed(text):
+                        yield "field", (key, value)
+            RESPONSE_CHARS.observe(len(parser.buffer))
+            self._settle(tokens, response)
+
+        except RateLimited as e:
+            error = self._rate_limited(e)
+            yield "error", error
+            return error
         except Exception as e:
-            print(f"LLM analysis failed: {e}")
-            return {"error": str(e)}
+            print(f"LLM streaming analysis failed: {e}")
+            error = {"error": str(e)}
+            yield "error", error
+            return error
+
+        if not parser.done:
+            print("Failed to parse streamed LLM response")
+            error = {
+                "error": "Failed to parse LLM response",
+                "raw_response": parser.buffer[:500]
+            }
+            yield "error", error
+            return error
+
+        return parser.fields
+
+    def _get_cache_key(self, resume_chunks: List[Dict], job_description: str, skills: Optional[Dict] = None) -> str:
+        return make_analysis_key(
+            [chunk["text"] for chunk in resume_chunks],
+            job_description,
+            self.prompt_template,
+            self.model_name,
+            self.GENERATION_CONFIG,
+            skills
+        )
+
+    def _get_cached(self, cache_key: str):
+        if self.result_cache is None:
+            return None
+        try:
+            cached = self.result_cache.get(cache_key)
+        except Exception as e:
+            print(f"[Analyzer] Result cache read failed: {e}")
+            return None
+        if cached is not None:
+            print("Using cached analysis result")
+        return cached
+
+    def _put_cached(self, cache_key: str, result: Dict):
+        # Error results are never cached so the next request retries
+        if self.result_cache is None or "error" in result:
+            return
+        try:
+            self.result_cache.put(cache_key, result)
+        except Exception as e:
+            print(f"[Analyzer] Result cache write failed: {e}")
+
+    def _build_prompt(self, resume_chunks: List[Dict], job_description: str, skills: Optional[Dict] = None) -> str:
+        return self.prompt_template.format(
+            resume_chunks=render_chunks(resume_chunks),
+            job_description=job_description,
+            skill_overlap=render_skill_overlap(skills)
+        )
 
     def _load_prompt(self) -> str:
         try:
@@ -1,6 +1,155 @@
-from typing import List, Dict
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import List, Dict, Tuple
 import re
 
+# Header spellings per section, as they appear on real resumes
+SECTION_HEADERS = {
+    "Summary": ["professional summary", "summary", "profile", "objective", "about me"],
+    "Experience": ["work experience", "experience", "employment history", "professional experience"],
+    "Education": ["education", "academic background", "qualifications"],
+    "Skills": ["skills", "technical skills", "competencies", "core competencies"],
+    "Projects": ["projects", "key projects", "notable projects"],
+    "Certifications": ["certifications", "certificates", "licenses", "professional certifications"],
+    "Awards": ["awards", "achievements", "honors", "recognitions"],
+}
+
+_ALIAS_TO_SECTION = {
+    alias: section for section, aliases in SECTION_HEADERS.items() for alias in aliases
+}
+
+
+def _trie_pattern(words) -> str:
+    """
+    Regex for a set of words shaped as a prefix trie, so each position is
+    decided by walking shared prefixes once instead of retrying every word.
+    Optional tails are greedy, so the longest alias at a position wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        branches = [
+            (r"\s+" if ch == " " else re.escape(ch)) + build(child)
+            for ch, child in sorted(node.items()) if ch
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+# Every alias in one compiled pattern; word boundaries keep "Experienced" from matching
+_HEADER_PATTERN = re.compile(r"\b" + _trie_pattern(_ALIAS_TO_SECTION) + r"\b", re.IGNORECASE)
+
+
+# What may follow a header on the same line: a bullet or a date ("Experience 2019 - 2024")
+_BULLETS = "-*"
+_DATE = re.compile(
+    r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+)?(?:19|20)\d\d\b", re.IGNORECASE
+)
+
+
+def _is_header(text: str, start: int, end: int) -> bool:
+    """
+    Whether one alias match is a section header, decided for that match alone.
+
+    All caps or a trailing colon mark a header. Capitalisation alone does
+    not ("led delivery of Skills Training Program"): a Title Case match also
+    needs its own line, or to be followed by a bullet, a date or another
+    header.
+    """
+    # Only the whitespace around the match is inspected, so the scan stays linear
+    after = end
+    while after < len(text) and text[after] in " \t\r":
+        after += 1
+    line_end = after == len(text) or text[after] == "\n"
+    while after < len(text) and text[after].isspace():
+        after += 1
+
+    alias = text[start:end]
+    if alias.isupper() or (after < len(text) and text[after] == ":"):
+        return True
+    if not alias.istitle():
+        return False
+    if after == len(text) or text[after] in _BULLETS or _DATE.match(text, after):
+        return True
+
+    following = _HEADER_PATTERN.match(text, after)
+    if following and (following.group().isupper() or following.group().istitle()):
+        return True
+
+    before = start - 1
+    while before >= 0 and text[before] in " \t\r":
+        before -= 1
+    return line_end and (before < 0 or text[before] == "\n")
+
+
+def find_section_headers(text: str) -> List[Tuple[int, int, str]]:
+    """
+    Locate section headers as (start, end, section) tuples in document order.
+
+    Mid-sentence mentions ("5 years of experience") are not headers. Each
+    match is judged on its own, so one resume may mix styles ("SKILLS",
+    "Technical Skills:", "Education").
+    """
+    headers = []
+    for match in _HEADER_PATTERN.finditer(text):
+        start, end = match.span()
+        if _is_header(text, start, end):
+            headers.append((start, end, _ALIAS_TO_SECTION[" ".join(match.group().lower().split())]))
+    return headers
+
+
+class ChunkSpan:
+    """
+    A chunk as offsets into the source text: characters [start, end) and
+    words [word_start, word_end) of the text's single whitespace tokenization.
+    """
+
+    __slots__ = ("section", "chunk_id", "start", "end", "word_start", "word_end")
+
+    def __init__(self, section: str, chunk_id: str, start: int, end: int, word_start: int, word_end: int):
+        self.section = section
+        self.chunk_id = chunk_id
+        self.start = start
+        self.end = end
+        self.word_start = word_start
+        self.word_end = word_end
+
+    @property
+    def word_count(self) -> int:
+        return self.word_end - self.word_start
+
+    def text(self, source: str) -> str:
+        return source[self.start:self.end]
+
+    def to_dict(self, source: str) -> Dict:
+        return {
+            "text": self.text(source),
+            "section": self.section,
+            "chunk_id": self.chunk_id,
+            "word_count": self.word_count,
+            "span": {
+                "start": self.start,
+                "end": self.end,
+                "word_start": self.word_start,
+                "word_end": self.word_end,
+            }
+        }
+
+
+_WORD = re.compile(r"\S+")
+_CONTENT_TRIM = " \t\r\n:-"
+
+
 class ResumeChunker:
     """Split resume into chunks"""
 
@@ -8,98 +157,113 @@ class ResumeChunker:
         self.chunk_size = chunk_size
         self.overlap = overlap
 
-    def chunk_by_sections(self, text: str) -> List[Dict[str, str]]:
+    def chunk_by_sections(self, text: str) -> List[Dict]:
         """
         Chunk by detecting resume sections.
         
         Returns:
-            List of chunks with metadata
+            List of chunks with metadata, including their span in `text`
         """
-        sections = self._detect_sections(text)
-        chunks = []
-        
-        for section_name, section_text in sections.items():
-            # Further split large sections
-            if len(section_text.split()) > self.chunk_size:
-                sub_chunks = self._split_text(section_text)
-                for i, chunk_text in enumerate(sub_chunks):
-                    chunks.append({
-                        "text": chunk_text,
-                        "section": section_name,
-                        "chunk_id": f"{section_name}_{i}",
-                        "word_count": len(chunk_text.split())
-                    })
+        return [span.to_dict(text) for span in self.chunk_spans(text)]
+
+    def chunk_spans(self, text: str) -> List[ChunkSpan]:
+        """
+        Chunk by sections without building any strings.
+
+        The text is tokenized once; large sections are windowed by word
+        index with overlap. A section split into several pieces (or appearing
+        under repeated headers) gets chunk ids `<section>_<i>`.
+        """
+        word_starts, word_ends = array("l"), array("l")
+        for match in _WORD.finditer(text):
+            word_starts.append(match.start())
+            word_ends.append(match.end())
+
+        pieces = []
+        for section_name, start, end in self._section_ranges(text):
+            first = bisect_right(word_ends, start)
+            last = bisect_left(word_starts, end)
+            for word_start, word_end in self._split_range(first, last):
+                pieces.append((
+                    section_name,
+                    max(word_starts[word_start], start),
+                    min(word_ends[word_end - 1], end),
+                    word_start,
+                    word_end
+                ))
+
+        counts = Counter(piece[0] for piece in pieces)
+        seen = Counter()
+        spans = []
+        for section_name, start, end, word_start, word_end in pieces:
+            if counts[section_name] > 1:
+                chunk_id = f"{section_name}_{seen[section_name]}"
+                seen[section_name] += 1
             else:
-                chunks.append({
-                    "text": section_text,
-                    "section": section_name,
-                    "chunk_id": section_name,
-                    "word_count": len(section_text.split())
-                })
-        
-        return chunks
-    
+                chunk_id = section_name
+            spans.append(ChunkSpan(section_name, chunk_id, start, end, word_start, word_end))
+        return spans
+
     def _detect_sections(self, text: str) -> Dict[str, str]:
-        """Detect common resume sections."""
-        # More specific patterns that look for section headers followed by content
-        section_patterns = {
-            "Summary": r"(professional summary|summary|profile|objective|about me)\s*(.*?)(?=(work experience|experience|employment history|education|skills|projects|certifications)|$)",
-            "Experience": r"(work experience|experience|employment history|professional experience)\s*(.*?)(?=(education|skills|projects|certifications|awards)|$)",
-            "Education": r"(education|academic background|qualifications)\s*(.*?)(?=(skills|projects|certifications|awards|references)|$)",
-            "Skills": r"(skills|technical skills|competencies|core competencies)\s*(.*?)(?=(projects|certifications|awards|references|languages)|$)",
-            "Projects": r"(projects|key projects|notable projects)\s*(.*?)(?=(certifications|awards|references|languages|education)|$)",
-            "Certifications": r"(certifications|certificates|licenses|professional certifications)\s*(.*?)(?=(awards|references|languages|projects)|$)",
-            "Awards": r"(awards|achievements|honors|recognitions)\s*(.*?)(?=(references|languages|certifications)|$)",
-        }
-        
+        """Detect common resume sections; repeated headers are joined into one entry."""
         sections = {}
-        matched_positions = []
-        
-        for section_name, pattern in section_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                start = match.start()
-                content = match.group(2).strip()
-                if content and len(content) > 20:  # Minimum content length
-                    sections[section_name] = content
-                    matched_positions.append((start, match.end(), section_name))
-        
-        # Sort by position to get sections in order
-        matched_positions.sort()
-        
-        # Extract any remaining text as "Other"
-        if matched_positions:
-            # Get text before first section
-            if matched_positions[0][0] > 0:
-                header_text = text[:matched_positions[0][0]].strip()
-                if len(header_text) > 20:
-                    sections["Header"] = header_text
-            
-            # Get text after last section
-            last_end = matched_positions[-1][1]
-            if last_end < len(text):
-                remaining = text[last_end:].strip()
-                if len(remaining) > 20:
-                    sections["Other"] = remaining
-        else:
-            # No sections detected, treat entire text as one section
-            sections["Content"] = text
-        
+        for section_name, start, end in self._section_ranges(text):
+            if section_name in sections:
+                sections[section_name] += " " + text[start:end]
+            else:
+                sections[section_name] = text[start:end]
         return sections
 
-    def _split_text(self, text: str) -> List[str]:
-        """Split long text into chunks with overlap."""
-        words = text.split()
-        chunks = []
-        
-        i = 0
-        while i < len(words):
-            # Get chunk
-            chunk_words = words[i:i + self.chunk_size]
-            chunk = ' '.join(chunk_words)
-            chunks.append(chunk)
-            
+    def _section_ranges(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Section content as (section, start, end) character ranges, in a single pass.
+
+        Every header alias is matched by one compiled pattern, so the text is
+        scanned once; each header's content runs up to the next header. No
+        text is dropped: content too short for a chunk of its own is folded
+        into the previous one.
+        """
+        headers = find_section_headers(text)
+        if not headers:
+            # No sections detected, treat entire text as one section
+            start, end = _trim(text, 0, len(text), " \t\r\n")
+            return [("Content", start, end)] if end > start else []
+
+        ranges = []
+        # Text before the first header (name, contact details)
+        start, end = _trim(text, 0, headers[0][0], " \t\r\n")
+        if end > start:
+            ranges.append(("Header", start, end))
+
+        for i, (_, content_start, section_name) in enumerate(headers):
+            content_end = headers[i + 1][0] if i + 1 < len(headers) else len(text)
+            start, end = _trim(text, content_start, content_end, _CONTENT_TRIM)
+            if end - start > 20:
+                ranges.append((section_name, start, end))
+            elif ranges:
+                # Too short to stand alone: keep it, header included, in the previous chunk
+                ranges[-1] = (ranges[-1][0], ranges[-1][1], max(end, content_start))
+            elif end > start:
+                ranges.append((section_name, start, end))
+        return ranges
+
+    def _split_range(self, first: int, last: int) -> List[Tuple[int, int]]:
+        """Word windows [i, j) covering words first..last with overlap."""
+        if last - first <= self.chunk_size:
+            return [(first, last)]
+
+        windows = []
+        i = first
+        while i < last:
+            windows.append((i, min(i + self.chunk_size, last)))
             # Move forward with overlap
             i += self.chunk_size - self.overlap
-        
-        return chunks
+        return windows
+
+
+def _trim(text: str, start: int, end: int, chars: str) -> Tuple[int, int]:
+    """Shrink [start, end) past leading and trailing `chars`."""
+    segment = text[start:end]
+    stripped = segment.lstrip(chars)
+    start += len(segment) - len(stripped)
+    return start, start + len(stripped.rstrip(chars))
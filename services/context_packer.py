@@ -0,0 +1,202 @@
+import re
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+_WORD = re.compile(r"\S+")
+CHUNK_SEPARATOR = "\n\n"
+
+
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Rough Gemini token count; English prose averages about 4 characters per token."""
+    return int((len(text) + chars_per_token - 1) // chars_per_token)
+
+
+def chunk_header(chunk: Dict) -> str:
+    return f"[Section: {chunk['metadata']['section']}]\n"
+
+
+def render_chunks(chunks: List[Dict]) -> str:
+    """The resume evidence block of the analysis prompt."""
+    return CHUNK_SEPARATOR.join(chunk_header(chunk) + chunk["text"] for chunk in chunks)
+
+
+class PackedContext:
+    """Chunks chosen for one prompt, with the token accounting behind the choice."""
+
+    __slots__ = ("chunks", "chunks_in", "tokens_in", "tokens_out", "trimmed", "dropped")
+
+    def __init__(self, chunks: List[Dict], chunks_in: int, tokens_in: int, tokens_out: int,
+                 trimmed: int, dropped: int):
+        self.chunks = chunks
+        self.chunks_in = chunks_in
+        self.tokens_in = tokens_in
+        self.tokens_out = tokens_out
+        self.trimmed = trimmed
+        self.dropped = dropped
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_in - self.tokens_out
+
+    def stats(self) -> Dict:
+        return {
+            "chunks_in": self.chunks_in,
+            "chunks_packed": len(self.chunks),
+            "chunks_trimmed": self.trimmed,
+            "chunks_dropped": self.dropped,
+            "tokens_in": self.tokens_in,
+            "tokens_packed": self.tokens_out,
+            "tokens_saved": self.tokens_saved,
+        }
+
+
+class ContextPacker:
+    """
+    Fit retrieved chunks of one resume into a prompt token budget.
+
+    Chunks are taken best score first. Words another selected chunk already
+    covers (the chunker's window overlap) are cut using the chunk's word
+    span, and whatever is left under `min_words` is dropped. The chunk that
+    crosses the budget is cut at a word boundary. The result is grouped by
+    section, best-scoring section first, with chunks in document order so
+    adjacent windows read as continuous text. Chunks stored without a span
+    are only deduplicated on exact text.
+
+    A `token_budget` of 0 disables the cap.
+    """
+
+    def __init__(self, token_budget: int = 2000, min_words: int = 8, chars_per_token: float = 4.0):
+        self.token_budget = token_budget
+        self.min_words = min_words
+        self.chars_per_token = chars_per_token
+
+    def pack(self, chunks: List[Dict]) -> PackedContext:
+        tokens_in = self._tokens(render_chunks(chunks))
+        order = sorted(range(len(chunks)), key=lambda i: -chunks[i].get("score", 0.0))
+
+        covered: List[Tuple[int, int]] = []
+        seen_texts = set()
+        selected = []
+        used = 0
+        trimmed = 0
+        for i in order:
+            chunk = chunks[i]
+            if chunk["text"] in seen_texts:
+                continue
+            seen_texts.add(chunk["text"])
+
+            words, span = _word_offsets(chunk)
+            first, last = 0, len(words)
+            if span is not None:
+                first, last = _uncovered(span["word_start"], span["word_end"], covered)
+                first -= span["word_start"]
+                last -= span["word_start"]
+            if last - first <= 0 or last - first < min(self.min_words, len(words)):
+                continue
+
+            truncated = False
+            if self.token_budget:
+                separator = len(CHUNK_SEPARATOR) if selected else 0
+                room = self.token_budget * self.chars_per_token - used - separator - len(chunk_header(chunk))
+                offset = words[first][0]
+                if words[last - 1][1] - offset > room:
+                    last = first + bisect_right([end - offset for _, end in words[first:last]], room)
+                    truncated = True
+                    if last - first < self.min_words:
+                        continue
+
+            piece = _slice_chunk(chunk, words, span, first, last)
+            if piece is not chunk:
+                trimmed += 1
+            if span is not None:
+                covered.append((span["word_start"] + first, span["word_start"] + last))
+            if selected:
+                used += len(CHUNK_SEPARATOR)
+            used += len(chunk_header(piece)) + len(piece["text"])
+            selected.append(piece)
+            if truncated:
+                break
+
+        packed = _order_by_section(selected)
+        return PackedContext(
+            chunks=packed,
+            chunks_in=len(chunks),
+            tokens_in=tokens_in,
+            tokens_out=self._tokens(render_chunks(packed)),
+            trimmed=trimmed,
+            dropped=len(chunks) - len(packed)
+        )
+
+    def _tokens(self, text: str) -> int:
+        return estimate_tokens(text, self.chars_per_token)
+
+
+def _word_offsets(chunk: Dict) -> Tuple[List[Tuple[int, int]], Optional[Dict]]:
+    """(start, end) of each word in the chunk text, and its span if the words line up with it."""
+    words = [match.span() for match in _WORD.finditer(chunk["text"])]
+    span = chunk.get("metadata", {}).get("span")
+    if span is not None and span["word_end"] - span["word_start"] != len(words):
+        span = None
+    return words, span
+
+
+def _uncovered(start: int, end: int, covered: List[Tuple[int, int]]) -> Tuple[int, int]:
+    """Longest run of words in [start, end) outside every covered range."""
+    pieces = [(start, end)]
+    for covered_start, covered_end in covered:
+        next_pieces = []
+        for piece_start, piece_end in pieces:
+            if covered_end <= piece_start or covered_start >= piece_end:
+                next_pieces.append((piece_start, piece_end))
+                continue
+            if piece_start < covered_start:
+                next_pieces.append((piece_start, covered_start))
+            if covered_end < piece_end:
+                next_pieces.append((covered_end, piece_end))
+        pieces = next_pieces
+    if not pieces:
+        return start, start
+    return max(pieces, key=lambda piece: piece[1] - piece[0])
+
+
+def _slice_chunk(chunk: Dict, words: List[Tuple[int, int]], span: Optional[Dict], first: int, last: int) -> Dict:
+    """Copy of `chunk` holding only words [first, last); the chunk itself when nothing is cut."""
+    if first == 0 and last == len(words):
+        return chunk
+    char_start, char_end = words[first][0], words[last - 1][1]
+    metadata = dict(chunk["metadata"])
+    metadata["word_count"] = last - first
+    if span is not None:
+        metadata["span"] = {
+            "start": span["start"] + char_start,
+            "end": span["start"] + char_end,
+            "word_start": span["word_start"] + first,
+            "word_end": span["word_start"] + last,
+        }
+    piece = dict(chunk)
+    piece["text"] = chunk["text"][char_start:char_end]
+    piece["metadata"] = metadata
+    return piece
+
+
+def _order_by_section(chunks: List[Dict]) -> List[Dict]:
+    """Group by section, best section first; document order within a section."""
+    best: Dict[str, float] = {}
+    for chunk in chunks:
+        section = chunk["metadata"]["section"]
+        best[section] = max(best.get(section, float("-inf")), chunk.get("score", 0.0))
+
+    def position(item):
+        index, chunk = item
+        span = chunk["metadata"].get("span")
+        return (span["start"], index) if span is not None else (float("inf"), index)
+
+    ordered = []
+    for section in sorted(best, key=lambda s: -best[s]):
+        members = [(i, c) for i, c in enumerate(chunks) if c["metadata"]["section"] == section]
+        ordered.extend(chunk for _, chunk in sorted(members, key=position))
+    return ordered
+
+
+def create_context_packer(config) -> ContextPacker:
+    return ContextPacker(token_budget=config.CONTEXT_TOKEN_BUDGET, min_words=config.CONTEXT_MIN_CHUNK_WORDS)
@@ -0,0 +1,134 @@
+import hashlib
+import time
+from typing import Optional
+
+from utils.sqlite import ThreadLocalSQLite
+from utils.text import normalize_text
+
+
+def file_fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def text_fingerprint(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode()).hexdigest()
+
+
+class ResumeRegistry:
+    """
+    Content-addressed index of ingested resumes.
+
+    Maps SHA-256 fingerprints of the uploaded bytes and of the normalised
+    extracted text to the resume_id that owns them, plus aliases from
+    duplicate uploads to that canonical resume_id. Claims are atomic in
+    SQLite, so two workers racing on the same file agree on one owner.
+
+    Fingerprints are scoped to `embedding_model`: after switching
+    EMBEDDING_BACKEND, a re-upload no longer matches the resume embedded by
+    the old backend (whose chunks the store now skips) and is ingested anew.
+    """
+
+    def __init__(self, path: str, embedding_model: Optional[str] = None):
+        self.embedding_model = embedding_model
+        self._db = ThreadLocalSQLite(path)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_fingerprints (
+                kind TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                resume_id TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (kind, digest)
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_resume_fingerprints_resume ON resume_fingerprints (resume_id)"
+        )
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_aliases (
+                alias_id TEXT PRIMARY KEY,
+                resume_id TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self.hits = {"file": 0, "text": 0}
+
+    def claim_file(self, digest: str, resume_id: str) -> str:
+        """Register `resume_id` as owner of these bytes unless someone already is; return the owner."""
+        return self._claim("file", digest, resume_id)
+
+    def claim_text(self, digest: str, resume_id: str) -> str:
+        """
+        Register `resume_id` as owner of this normalised text unless someone already is; return the owner.
+
+        Only claimed once the resume's chunks are stored, so duplicates are
+        never aliased to a resume whose ingestion can still fail.
+        """
+        return self._claim("text", digest, resume_id)
+
+    def find_text(self, digest: str) -> Optional[str]:
+        """Owner of this normalised text, if one has been claimed."""
+        row = self._db.execute(
+            "SELECT resume_id FROM resume_fingerprints WHERE kind = 'text' AND digest = ?", (self._key(digest),)
+        ).fetchone()
+        if row is not None:
+            self.hits["text"] += 1
+        return row[0] if row else None
+
+    def _key(self, digest: str) -> str:
+        return f"{self.embedding_model}:{digest}" if self.embedding_model else digest
+
+    def _claim(self, kind: str, digest: str, resume_id: str) -> str:
+        digest = self._key(digest)
+        self._db.execute(
+            "INSERT OR IGNORE INTO resume_fingerprints (kind, digest, resume_id, created_at) VALUES (?, ?, ?, ?)",
+            (kind, digest, resume_id, time.time())
+        )
+        owner = self._db.execute(
+            "SELECT resume_id FROM resume_fingerprints WHERE kind = ? AND digest = ?", (kind, digest)
+        ).fetchone()[0]
+        if owner != resume_id:
+            self.hits[kind] += 1
+        return owner
+
+    def add_alias(self, alias_id: str, resume_id: str):
+        self._db.execute(
+            "INSERT OR REPLACE INTO resume_aliases (alias_id, resume_id, created_at) VALUES (?, ?, ?)",
+            (alias_id, resume_id, time.time())
+        )
+
+    def resolve(self, resume_id: str) -> str:
+        """Canonical resume_id for an alias, or the id itself."""
+        row = self._db.execute(
+            "SELECT resume_id FROM resume_aliases WHERE alias_id = ?", (resume_id,)
+        ).fetchone()
+        return row[0] if row else resume_id
+
+    def forget(self, resume_id: str):
+        """Drop every fingerprint a resume owns, e.g. after its ingestion failed."""
+        self._db.execute("DELETE FROM resume_fingerprints WHERE resume_id = ?", (resume_id,))
+
+    def stats(self) -> dict:
+        return {"file_hits": self.hits["file"], "text_hits": self.hits["text"]}
+
+
+def create_resume_registry(config, embedding_backend=None) -> Optional[ResumeRegistry]:
+    """
+    Registry at Config.DEDUP_DB_PATH, scoped to `embedding_backend` (an
+    EmbeddingBackend; None leaves fingerprints unscoped), or None when
+    deduplication is disabled.
+    """
+    if not config.DEDUP_DB_PATH:
+        return None
+    # Imported here: app imports this module for file_fingerprint before any backend is built
+    from services.embedding_backends import LEGACY_EMBEDDING_MODEL
+
+    embedding_model = embedding_backend.name if embedding_backend is not None else None
+    if embedding_model == LEGACY_EMBEDDING_MODEL:
+        # Fingerprints written before they were scoped belong to the Gemini model,
+        # as chunks stored without an embedding_model do, so keep them unprefixed
+        embedding_model = None
+    return ResumeRegistry(config.DEDUP_DB_PATH, embedding_model=embedding_model)
@@ -1,12 +1,100 @@
-import pdfplumber
+import io
+import multiprocessing
+import os
 import re
-from typing import Optional
-from docx import Document
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterator, List, Optional, Union
 from config import Config
 
+# pdfplumber and python-docx are imported inside the functions that parse, so
+# importing this module (for read_limited) stays cheap
+
+# A filesystem path or a binary file-like object (BytesIO, SpooledTemporaryFile, ...)
+Source = Union[str, BinaryIO]
+
+
+class FileTooLarge(ValueError):
+    """Raised when an upload exceeds Config.MAX_FILE_SIZE."""
+
+
+def read_limited(stream: BinaryIO, max_bytes: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Read a stream into memory, aborting as soon as it grows past max_bytes."""
+    chunks = []
+    total = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        total += len(chunk)
+        if total > max_bytes:
+            raise FileTooLarge(f"File exceeds the {max_bytes // (1024 * 1024)}MB limit")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _extract_pdf_page_range(data: bytes, start: int, end: int) -> List[str]:
+    """Process-pool worker: raw text of pages [start, end) of an in-memory PDF."""
+    import pdfplumber
+    texts = []
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        for page in pdf.pages[start:end]:
+            text = page.extract_text()
+            if text:
+                texts.append(text)
+    return texts
+
+
+_pdf_pool = None
+_pdf_pool_pid = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared page-extraction pool, recreated after a fork. Uses spawn because
+    ingestion runs in threads and forking a threaded process is unsafe."""
+    global _pdf_pool, _pdf_pool_pid
+    with _pdf_pool_lock:
+        if _pdf_pool is None or _pdf_pool_pid != os.getpid():
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _pdf_pool_pid = os.getpid()
+        return _pdf_pool
+
+
 class DocumentParser:
     """Extract and clean text from resumes"""
 
+    def __init__(self, max_pages: Optional[int] = None, workers: Optional[int] = None,
+                 parallel_min_pages: Optional[int] = None):
+        self.max_pages = max_pages if max_pages is not None else Config.PDF_MAX_PAGES
+        self.workers = workers if workers is not None else Config.PDF_WORKERS
+        self.parallel_min_pages = parallel_min_pages if parallel_min_pages is not None else Config.PDF_PARALLEL_MIN_PAGES
+
+    def parse(self, source: Source, file_extension: str) -> str:
+        """
+        Validate and extract a document in a single open.
+
+        Args:
+            source: Path or binary file-like object.
+            file_extension: One of Config.ALLOWED_EXTENSIONS.
+
+        Returns:
+            str: Cleaned text; raises ValueError if the file is unreadable.
+        """
+        file_extension = file_extension.lower()
+
+        if file_extension == 'pdf':
+            return self._extract_pdf_content(source, require_pages=True)
+        elif file_extension == 'txt':
+            return self._extract_txt_content(source)
+        elif file_extension in ['doc', 'docx']:
+            return self._extract_docx_content(source)
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+
     def extract_content(self, file_path: str) -> str:
         """
         Extract text from a file.
@@ -19,44 +107,105 @@ class DocumentParser:
         """
         # Determine file type
         file_extension = file_path.lower().split('.')[-1]
+        return self.parse(file_path, file_extension)
 
-        if file_extension == 'pdf':
-            return self._extract_pdf_content(file_path)
-        elif file_extension == 'txt':
-            return self._extract_txt_content(file_path)
-        elif file_extension in ['doc', 'docx']:
-            return self._extract_docx_content(file_path)
+    def iter_pages(self, source: Source, file_extension: str) -> Iterator[str]:
+        """
+        Yield cleaned text page by page, so chunking can start before parsing ends.
+
+        Only PDFs have pages; other formats yield their whole text once.
+        """
+        if file_extension.lower() == 'pdf':
+            yield from self.iter_pdf_pages(source)
         else:
-            raise ValueError(f"Unsupported file format: {file_extension}")
+            text = self.parse(source, file_extension)
+            if text:
+                yield text
 
-    def _extract_pdf_content(self, file_path: str) -> str:
-        """Extract text from PDF"""
-        text_content = []
+    def iter_pdf_pages(self, source: Source) -> Iterator[str]:
+        """Yield each non-empty PDF page's cleaned text, up to max_pages."""
+        import pdfplumber
         try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
+            with pdfplumber.open(source) as pdf:
+                for page in pdf.pages[:self._page_limit(len(pdf.pages))]:
                     text = page.extract_text()
                     if text:
-                        text_content.append(text)
+                        cleaned = self._clean_text(text)
+                        if cleaned:
+                            yield cleaned
+        except Exception as e:
+            raise ValueError(f"Error extracting text from PDF: {str(e)}")
+
+    def _extract_pdf_content(self, source: Source, require_pages: bool = False) -> str:
+        """Extract text from PDF, fanning long documents out across a process pool."""
+        import pdfplumber
+        text_content = []
+        try:
+            with pdfplumber.open(source) as pdf:
+                page_count = len(pdf.pages)
+                if require_pages and page_count == 0:
+                    raise ValueError("PDF has no pages")
+
+                pages_to_read = self._page_limit(page_count)
+                if self.workers > 1 and pages_to_read >= self.parallel_min_pages:
+                    text_content = self._extract_pages_parallel(source, pages_to_read)
+                else:
+                    for page in pdf.pages[:pages_to_read]:
+                        text = page.extract_text()
+                        if text:
+                            text_content.append(text)
             full_text = "\n".join(text_content)
             return self._clean_text(full_text)
 
         except Exception as e:
             raise ValueError(f"Error extracting text from PDF: {str(e)}")
 
-    def _extract_txt_content(self, file_path: str) -> str:
+    def _extract_pages_parallel(self, source: Source, page_count: int) -> List[str]:
+        """Split pages into one contiguous range per worker and extract them concurrently."""
+        data = self._read_bytes(source)
+        workers = min(self.workers, page_count)
+        step = -(-page_count // workers)  # ceil division
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+        pool = _get_pdf_pool(self.workers)
+        futures = [pool.submit(_extract_pdf_page_range, data, start, end) for start, end in ranges]
+
+        text_content = []
+        for future in futures:
+            text_content.extend(future.result())
+        return text_content
+
+    def _page_limit(self, page_count: int) -> int:
+        if self.max_pages and page_count > self.max_pages:
+            print(f"[DocumentParser] Reading first {self.max_pages} of {page_count} pages")
+            return self.max_pages
+        return page_count
+
+    @staticmethod
+    def _read_bytes(source: Source) -> bytes:
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                return f.read()
+        source.seek(0)
+        return source.read()
+
+    def _extract_txt_content(self, source: Source) -> str:
         """Extract text from TXT file."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-                return self._clean_text(text)
+            if isinstance(source, str):
+                with open(source, 'r', encoding='utf-8') as file:
+                    text = file.read()
+            else:
+                text = source.read().decode('utf-8')
+            return self._clean_text(text)
         except Exception as e:
             raise ValueError(f"Error extracting text from TXT: {str(e)}")
         
-    def _extract_docx_content(self, file_path: str) -> str:
+    def _extract_docx_content(self, source: Source) -> str:
         """Extract text from DOCX file."""
+        from docx import Document
         try:
-            doc = Document(file_path)
+            doc = Document(source)
             text_content = [paragraph.text for paragraph in doc.paragraphs]
             full_text = "\n".join(text_content)
             return self._clean_text(full_text)
@@ -66,14 +215,14 @@ class DocumentParser:
     def _clean_text(self, text: str) -> str:
         """Remove noise and normalize whitespace."""
 
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove extra whitespace, keeping line breaks: they mark section headers
+        text = re.sub(r'[^\S\n]+', ' ', text)
         
         # Remove special characters but keep essential punctuation
         text = re.sub(r'[^\w\s.,;:()\-@/#&+]', '', text)
 
-        # Normalize line breaks
-        text = re.sub(r'\n+', '\n', text)
+        # Normalize line breaks (and drop blank lines)
+        text = re.sub(r' *\n\s*', '\n', text)
 
         return text.strip()
 
@@ -83,12 +232,14 @@ class DocumentParser:
 
         try:
             if file_extension == 'pdf':
+                import pdfplumber
                 with pdfplumber.open(file_path) as pdf:
                     return len(pdf.pages) > 0
             elif file_extension == 'txt':
                 with open(file_path, 'r', encoding='utf-8') as f:
                     return len(f.read()) > 0
             elif file_extension in ['doc', 'docx']:
+                from docx import Document
                 doc = Document(file_path)
                 return len(doc.paragraphs) > 0
             return False
@@ -0,0 +1,155 @@
+import asyncio
+import math
+import re
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from services.gemini import get_genai
+
+GEMINI_EMBEDDING_MODEL = "models/text-embedding-004"
+# Chunks written before stores recorded their model were all embedded by Gemini
+LEGACY_EMBEDDING_MODEL = GEMINI_EMBEDDING_MODEL
+
+# Feature weights relative to a whole word
+NGRAM_WEIGHT = 0.25
+PAIR_WEIGHT = 0.5
+# Resume vocabularies are small; clearing at the bound keeps memory flat
+WORD_CACHE_SIZE = 50_000
+_word_cache: Dict[Tuple, Tuple[np.ndarray, np.ndarray]] = {}
+
+# Words keep the characters skills are spelled with: c++, c#, node.js, ci/cd
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+
+
+class EmbeddingBackend(ABC):
+    """
+    Turns texts into vectors for EmbeddingService.
+
+    `name` identifies the vector space: it is part of every cache key and is
+    stored with every chunk, so vectors from two backends are never compared.
+    `remote` backends call an API and go through the rate limiter.
+    """
+
+    name: str
+    dimensions: int
+    remote: bool = False
+
+    @abstractmethod
+    def embed(self, texts: List[str], task_type: str) -> List[List[float]]:
+        """One vector per text, in order."""
+
+    def embed_one(self, text: str, task_type: str) -> List[float]:
+        return self.embed([text], task_type)[0]
+
+    async def embed_one_async(self, text: str, task_type: str) -> List[float]:
+        return await asyncio.to_thread(self.embed_one, text, task_type)
+
+
+class GeminiBackend(EmbeddingBackend):
+    """text-embedding-004 through the Gemini API."""
+
+    remote = True
+
+    def __init__(self, model_name: str = GEMINI_EMBEDDING_MODEL, dimensions: int = 768):
+        self.name = model_name
+        self.dimensions = dimensions
+
+    def embed(self, texts: List[str], task_type: str) -> List[List[float]]:
+        """Up to 100 texts in a single batchEmbedContents call."""
+        return get_genai().embed_content(model=self.name, content=texts, task_type=task_type)['embedding']
+
+    def embed_one(self, text: str, task_type: str) -> List[float]:
+        return get_genai().embed_content(model=self.name, content=text, task_type=task_type)['embedding']
+
+    async def embed_one_async(self, text: str, task_type: str) -> List[float]:
+        result = await get_genai().embed_content_async(model=self.name, content=text, task_type=task_type)
+        return result['embedding']
+
+
+class HashingBackend(EmbeddingBackend):
+    """
+    Local CPU embeddings: hashed word, word-pair and character n-gram counts.
+
+    Each feature is hashed (crc32, so vectors are stable across processes)
+    into one of `dimensions` buckets with a sign bit, weighted by sublinear
+    term frequency, and the rows are L2-normalised. A whole batch is filled
+    into one matrix. Similarity is lexical rather than semantic, but
+    character n-grams still match "developer"/"development" and "postgres"/
+    "postgresql". No model, no network: a chunk takes well under a millisecond.
+    """
+
+    def __init__(self, dimensions: int = 512, char_ngrams: Tuple[int, int] = (3, 5)):
+        if dimensions <= 0:
+            raise ValueError("dimensions must be positive")
+        self.dimensions = dimensions
+        self.char_ngrams = char_ngrams
+        self.name = f"hashing-v1-{dimensions}"
+
+    def embed(self, texts: List[str], task_type: str) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dimensions) float32 matrix of unit rows (all-zero for empty texts)."""
+        rows, columns, values = [], [], []
+        for row, text in enumerate(texts):
+            words = [word.rstrip("./-") for word in _TOKEN_RE.findall(text.lower())]
+            words = [word for word in words if word]
+            for word, count in Counter(words).items():
+                buckets, weights = self._word_features(word)
+                rows.append(np.full(len(buckets), row))
+                columns.append(buckets)
+                values.append(weights * (1.0 + math.log(count)))
+            for pair, count in Counter(zip(words, words[1:])).items():
+                bucket, sign = _bucket("b:" + " ".join(pair), self.dimensions)
+                rows.append(np.array([row]))
+                columns.append(np.array([bucket]))
+                values.append(np.array([PAIR_WEIGHT * sign * (1.0 + math.log(count))], dtype=np.float32))
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if rows:
+            np.add.at(matrix, (np.concatenate(rows), np.concatenate(columns)), np.concatenate(values))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _word_features(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Buckets and signed weights of a word and its character n-grams, memoised per word."""
+        key = (word, self.dimensions, self.char_ngrams)
+        cached = _word_cache.get(key)
+        if cached is not None:
+            return cached
+
+        features = [("w:" + word, 1.0)]
+        padded = f" {word} "
+        low, high = self.char_ngrams
+        for n in range(low, min(high, len(padded)) + 1):
+            features.extend(("c:" + padded[i:i + n], NGRAM_WEIGHT) for i in range(len(padded) - n + 1))
+
+        buckets = np.empty(len(features), dtype=np.int64)
+        weights = np.empty(len(features), dtype=np.float32)
+        for i, (feature, weight) in enumerate(features):
+            buckets[i], sign = _bucket(feature, self.dimensions)
+            weights[i] = sign * weight
+        if len(_word_cache) >= WORD_CACHE_SIZE:
+            _word_cache.clear()
+        _word_cache[key] = (buckets, weights)
+        return buckets, weights
+
+
+def _bucket(feature: str, dimensions: int) -> Tuple[int, float]:
+    digest = zlib.crc32(feature.encode())
+    return digest % dimensions, 1.0 if (digest // dimensions) & 1 else -1.0
+
+
+def create_embedding_backend(config) -> EmbeddingBackend:
+    """Build the backend selected by config.EMBEDDING_BACKEND."""
+    backend = config.EMBEDDING_BACKEND
+    if backend == "gemini":
+        return GeminiBackend()
+    if backend == "hashing":
+        return HashingBackend(dimensions=config.EMBEDDING_HASH_DIMENSIONS)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {backend}")
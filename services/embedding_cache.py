@@ -0,0 +1,226 @@
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional
+from utils.sqlite import ThreadLocalSQLite
+
+
+class LRUCache:
+    """In-memory LRU for embedding vectors, bounded by entry count and bytes.
+
+    Vectors are held as packed float32 arrays (4 bytes per dimension) rather
+    than Python lists, which cost ~32 bytes per dimension.
+    """
+
+    def __init__(self, max_items: int = 10_000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, array]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._data.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return vector.tolist()
+
+    def put(self, key: str, value: List[float]):
+        vector = array('f', value)
+        size = len(vector) * vector.itemsize
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old) * old.itemsize
+            self._data[key] = vector
+            self._bytes += size
+
+            while len(self._data) > self.max_items or self._bytes > self.max_bytes:
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted) * evicted.itemsize
+                self.evictions += 1
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "items": len(self._data),
+            "bytes": self._bytes,
+            "max_items": self.max_items,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class SQLiteEmbeddingStore:
+    """On-disk embedding store shared by every process on the host.
+
+    Holds at most `max_rows` vectors, evicting the least recently read.
+    Safe to create before gunicorn forks; see ThreadLocalSQLite.
+    """
+
+    # Eviction scans the accessed_at index, so it runs once per this many writes
+    EVICT_EVERY = 100
+
+    def __init__(self, path: str, max_rows: int = 100_000):
+        self.path = path
+        self.max_rows = max_rows
+        self._db = ThreadLocalSQLite(path)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._puts = 0
+        self._init_schema()
+
+    def _init_schema(self):
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                dims INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(embeddings)")}
+        if "accessed_at" not in columns:
+            # Stores created before eviction existed
+            self._db.execute("ALTER TABLE embeddings ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+            self._db.execute("UPDATE embeddings SET accessed_at = created_at")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[List[float]]:
+        row = self._db.execute(
+            "SELECT vector FROM embeddings WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self._db.execute("UPDATE embeddings SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        self.hits += 1
+        vector = array('f')
+        vector.frombytes(row[0])
+        return vector.tolist()
+
+    def put(self, key: str, value: List[float]):
+        vector = array('f', value)
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO embeddings (key, dims, vector, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, len(vector), vector.tobytes(), now, now)
+        )
+        self._puts += 1
+        if self._puts % self.EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        """Drop the least recently read vectors beyond max_rows."""
+        overflow = self._db.execute(
+            """
+            DELETE FROM embeddings WHERE key IN (
+                SELECT key FROM embeddings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_rows,)
+        ).rowcount
+        self.evictions += max(overflow, 0)
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "path": self.path,
+            "items": len(self),
+            "max_rows": self.max_rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: a per-process LRU in front of a shared disk store."""
+
+    def __init__(self, memory: Optional[LRUCache] = None, disk: Optional[SQLiteEmbeddingStore] = None):
+        self.memory = memory if memory is not None else LRUCache()
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls, config) -> "EmbeddingCache":
+        memory = LRUCache(
+            max_items=config.EMBEDDING_CACHE_MAX_ITEMS,
+            max_bytes=config.EMBEDDING_CACHE_MAX_BYTES
+        )
+        disk = None
+        if config.EMBEDDING_CACHE_PATH:
+            try:
+                disk = SQLiteEmbeddingStore(config.EMBEDDING_CACHE_PATH, max_rows=config.EMBEDDING_CACHE_MAX_ROWS)
+            except (OSError, sqlite3.Error) as e:
+                print(f"[EmbeddingCache] Disk cache disabled: {e}")
+        return cls(memory=memory, disk=disk)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        embedding = self.memory.get(key)
+        if embedding is None and self.disk is not None:
+            try:
+                embedding = self.disk.get(key)
+            except sqlite3.Error as e:
+                print(f"[EmbeddingCache] Disk read failed: {e}")
+            if embedding is not None:
+                self.memory.put(key, embedding)
+
+        if embedding is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return embedding
+
+    def put(self, key: str, embedding: List[float]):
+        self.memory.put(key, embedding)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, embedding)
+            except sqlite3.Error as e:
+                print(f"[EmbeddingCache] Disk write failed: {e}")
+
+    def stats(self) -> Dict[str, Dict]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None,
+        }
@@ -1,63 +1,200 @@
-import google.generativeai as genai
 import hashlib
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from config import Config
-
-genai.configure(api_key=Config.GEMINI_API_KEY)
+from services.context_packer import estimate_tokens
+from services.embedding_backends import EmbeddingBackend, create_embedding_backend
+from services.embedding_cache import EmbeddingCache, LRUCache
+from services.rate_limit import BULK, INTERACTIVE, RateLimited, RateLimiter
+from services.single_flight import SingleFlight
+from utils.text import normalize_text
 
 class EmbeddingService:
-    def __init__(self):
-        self.model_name = "models/text-embedding-004"
-        self.dimensions = 768
-        self.cache = {}
+    def __init__(self, cache: Optional[EmbeddingCache] = None, query_cache: Optional[EmbeddingCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None, backend: Optional[EmbeddingBackend] = None):
+        self.backend = backend if backend is not None else create_embedding_backend(Config)
+        self.model_name = self.backend.name
+        self.dimensions = self.backend.dimensions
+        self.cache = cache if cache is not None else EmbeddingCache.from_config(Config)
+        # Job descriptions get their own LRU so they never evict document vectors
+        self.query_cache = query_cache if query_cache is not None else EmbeddingCache(
+            memory=LRUCache(max_items=Config.QUERY_CACHE_MAX_ITEMS, max_bytes=Config.QUERY_CACHE_MAX_BYTES),
+            disk=self.cache.disk
+        )
+        self.batch_size = Config.EMBEDDING_BATCH_SIZE
+        self.max_concurrency = Config.EMBEDDING_MAX_CONCURRENCY
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        # Concurrent requests for the same job description share one embedding call
+        self.in_flight = SingleFlight("query_embedding")
+        self.rate_limiter = rate_limiter
 
     def embed_text(self, text: str) -> List[float]:
-        cache_key = self._get_cache_key(text)
-        if cache_key in self.cache:
+        cache_key = self._get_cache_key(text, "retrieval_document")
+        cached = self.cache.get(cache_key)
+        if cached is not None:
             print(f"Using cached embedding for {text[:50]}")
-            return self.cache[cache_key]
+            return cached
 
         try:
-            result = genai.embed_content(
-                model=self.model_name,
-                content=text,
-                task_type="retrieval_document"
-            )
-            embedding = result['embedding']
-
-            self.cache[cache_key] = embedding
+            embedding = self._call(lambda: self.backend.embed_one(text, "retrieval_document"), [text], BULK)
+
+            self.cache.put(cache_key, embedding)
             print(f"Generated embedding for {text[:50]} with length {len(embedding)}")
             return embedding
 
+        except RateLimited:
+            raise
         except Exception as e:
             print(f"Failed to generate embedding for {text[:50]}: {e}")
             raise ValueError(f"Failed to generate embedding: {str(e)}")
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
-        embeddings = []
+        """
+        Embed many texts, sending only cache misses to the API.
+
+        Misses are de-duplicated, grouped into multi-text batch requests and the
+        batches run concurrently on a bounded pool. Output order matches input.
+        """
+        task_type = "retrieval_document"
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+
+        for i, text in enumerate(texts):
+            cached = self.cache.get(self._get_cache_key(text, task_type))
+            if cached is not None:
+                embeddings[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+
+        if not pending:
+            print(f"Using cached embeddings for all {len(texts)} texts")
+            return embeddings
+
+        unique_texts = list(pending)
+        batches = [
+            unique_texts[i:i + self.batch_size]
+            for i in range(0, len(unique_texts), self.batch_size)
+        ]
+
+        # Local backends are CPU-bound: a thread pool would only contend for the GIL
+        if len(batches) == 1 or not self.backend.remote:
+            results = [self._request_embeddings(batch, task_type) for batch in batches]
+        else:
+            results = list(self._get_executor().map(
+                lambda batch: self._request_embeddings(batch, task_type),
+                batches
+            ))
 
-        for text in texts:
-            embeddings.append(self.embed_text(text))
+        for batch, vectors in zip(batches, results):
+            for text, embedding in zip(batch, vectors):
+                self.cache.put(self._get_cache_key(text, task_type), embedding)
+                for i in pending[text]:
+                    embeddings[i] = embedding
 
+        print(f"Generated {len(unique_texts)} embeddings in {len(batches)} batch requests "
+              f"({len(texts) - sum(len(v) for v in pending.values())} cached)")
         return embeddings
 
     def embed_query(self, query: str) -> List[float]:
+        cache_key = self._get_cache_key(self._normalize_query(query), "retrieval_query")
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            print(f"Using cached query embedding for {query[:50]}")
+            return cached
+
+        def embed():
+            try:
+                embedding = self._call(
+                    lambda: self.backend.embed_one(query, "retrieval_query"), [query], INTERACTIVE
+                )
+
+                self.query_cache.put(cache_key, embedding)
+                return embedding
+
+            except RateLimited:
+                raise
+            except Exception as e:
+                print(f"Failed to generate embedding for {query[:50]}: {e}")
+                raise ValueError(f"Failed to generate embedding: {str(e)}")
+
+        return self.in_flight.do(cache_key, embed)
+
+    async def embed_query_async(self, query: str) -> List[float]:
+        """`embed_query` for the async server: awaits the embedding call instead of blocking a thread."""
+        cache_key = self._get_cache_key(self._normalize_query(query), "retrieval_query")
+        cached = self.query_cache.get(cache_key)
+        if cached is not None:
+            print(f"Using cached query embedding for {query[:50]}")
+            return cached
+
+        async def embed():
+            try:
+                embedding = await self._call_async(
+                    lambda: self.backend.embed_one_async(query, "retrieval_query"), [query], INTERACTIVE
+                )
+
+                self.query_cache.put(cache_key, embedding)
+                return embedding
+
+            except RateLimited:
+                raise
+            except Exception as e:
+                print(f"Failed to generate embedding for {query[:50]}: {e}")
+                raise ValueError(f"Failed to generate embedding: {str(e)}")
+
+        return await self.in_flight.do_async(cache_key, embed)
+
+    def get_dimensions(self) -> int:
+        return self.dimensions
+
+    def _request_embeddings(self, texts: List[str], task_type: str) -> List[List[float]]:
+        """Embed up to batch_size texts in one backend call (batchEmbedContents for Gemini)."""
         try:
-            result = genai.embed_content(
-                model=self.model_name,
-                content=query,
-                task_type="retrieval_query"
-            )
-            embedding = result['embedding']
+            return self._call(lambda: self.backend.embed(texts, task_type), texts, BULK)
 
-            return embedding
-        
+        except RateLimited:
+            raise
         except Exception as e:
-            print(f"Failed to generate embedding for {query[:50]}: {e}")
+            print(f"Failed to generate batch of {len(texts)} embeddings: {e}")
             raise ValueError(f"Failed to generate embedding: {str(e)}")
 
-    def get_dimensions(self) -> int:
-        return self.dimensions
+    def _call(self, request, texts: List[str], lane: str):
+        """Send an embedding request through the rate limiter, if there is one and the backend is remote."""
+        if self.rate_limiter is None or not self.backend.remote:
+            return request()
+        tokens = sum(estimate_tokens(text) for text in texts)
+        return self.rate_limiter.call("embedding", request, tokens=tokens, lane=lane)
+
+    async def _call_async(self, request, texts: List[str], lane: str):
+        if self.rate_limiter is None or not self.backend.remote:
+            return await request()
+        tokens = sum(estimate_tokens(text) for text in texts)
+        return await self.rate_limiter.call_async("embedding", request, tokens=tokens, lane=lane)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so the pool is never inherited across a fork
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="embed"
+                )
+            return self._executor
+
+    def get_cache_stats(self) -> dict:
+        return {
+            "documents": self.cache.stats(),
+            "queries": self.query_cache.stats(),
+        }
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Collapse whitespace and case so near-identical JDs share a cache entry."""
+        return normalize_text(query)
 
-    def _get_cache_key(self, text: str) -> str:
-        return hashlib.sha256(text.encode()).hexdigest()
\ No newline at end of file
+    def _get_cache_key(self, text: str, task_type: str) -> str:
+        """Key on backend and task type too, so vectors from different backends never collide."""
+        payload = f"{self.model_name}\x00{task_type}\x00{text}"
+        return hashlib.sha256(payload.encode()).hexdigest()
\ No newline at end of file
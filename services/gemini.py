@@ -0,0 +1,23 @@
+import threading
+from config import Config
+
+_configure_lock = threading.Lock()
+_configured = False
+
+
+def get_genai():
+    """
+    The google.generativeai module, configured with the API key.
+
+    Imported on first call rather than at module import: the SDK (and the
+    gRPC stack under it) is the slowest import in the app, and routes like
+    /health never touch it.
+    """
+    global _configured
+    import google.generativeai as genai
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                genai.configure(api_key=Config.GEMINI_API_KEY)
+                _configured = True
+    return genai
@@ -0,0 +1,408 @@
+import asyncio
+import io
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from config import Config
+from services.dedup import text_fingerprint
+from services.metrics import CHUNKS_PER_RESUME, timed
+from utils.sqlite import ThreadLocalSQLite
+
+# Pipeline stages, in the order they complete
+STAGES = ["parsed", "chunked", "embedded", "stored"]
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+ABANDONED = "Ingestion stopped when its worker exited; upload the file again"
+
+
+class IngestionFailed(Exception):
+    """Raised inside the pipeline for input problems worth reporting as-is."""
+
+
+def new_job(resume_id: str, filename: str, file_type: str) -> Dict:
+    now = time.time()
+    return {
+        "job_id": str(uuid.uuid4()),
+        "resume_id": resume_id,
+        "filename": filename,
+        "file_type": file_type,
+        "worker_pid": os.getpid(),
+        "status": QUEUED,
+        "stages": {stage: None for stage in STAGES},
+        "error": None,
+        "result": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+class InMemoryJobStore:
+    """Job records in a dict; only visible to the process that created them."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._by_resume: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict):
+        with self._lock:
+            self._jobs[job["job_id"]] = json.loads(json.dumps(job))
+            self._by_resume[job["resume_id"]] = job["job_id"]
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs[job_id]
+            stages = fields.pop("stages", None)
+            if stages:
+                job["stages"].update(stages)
+            job.update(fields)
+            job["updated_at"] = time.time()
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+    def fail_if_unchanged(self, job_id: str, updated_at: float, error: str) -> bool:
+        """Mark a job failed unless it was updated after `updated_at`."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["updated_at"] != updated_at:
+                return False
+            job.update(status=FAILED, error=error, updated_at=time.time())
+            return True
+
+    def get_by_resume(self, resume_id: str) -> Optional[Dict]:
+        job_id = self._by_resume.get(resume_id)
+        return self.get(job_id) if job_id else None
+
+
+class SQLiteJobStore:
+    """Job records in SQLite, so every gunicorn worker on the host can report status."""
+
+    def __init__(self, path: str):
+        self._db = ThreadLocalSQLite(path)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingestion_jobs (
+                job_id TEXT PRIMARY KEY,
+                resume_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_resume ON ingestion_jobs (resume_id)"
+        )
+        self._lock = threading.Lock()
+
+    def create(self, job: Dict):
+        self._db.execute(
+            "INSERT INTO ingestion_jobs (job_id, resume_id, data, updated_at) VALUES (?, ?, ?, ?)",
+            (job["job_id"], job["resume_id"], json.dumps(job), job["updated_at"])
+        )
+
+    def update(self, job_id: str, **fields):
+        # Only the worker running a job writes to it, so read-modify-write is safe
+        with self._lock:
+            job = self.get(job_id)
+            stages = fields.pop("stages", None)
+            if stages:
+                job["stages"].update(stages)
+            job.update(fields)
+            job["updated_at"] = time.time()
+            self._db.execute(
+                "UPDATE ingestion_jobs SET data = ?, updated_at = ? WHERE job_id = ?",
+                (json.dumps(job), job["updated_at"], job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._db.execute(
+            "SELECT data FROM ingestion_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def fail_if_unchanged(self, job_id: str, updated_at: float, error: str) -> bool:
+        """
+        Mark a job failed unless it was updated after `updated_at`.
+
+        The condition is part of the UPDATE, so when several workers find the
+        same abandoned job only one of them fails it, and a job its owner
+        has just moved on is left alone.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.update(status=FAILED, error=error, updated_at=time.time())
+        cursor = self._db.execute(
+            "UPDATE ingestion_jobs SET data = ?, updated_at = ? WHERE job_id = ? AND updated_at = ?",
+            (json.dumps(job), job["updated_at"], job_id, updated_at)
+        )
+        return cursor.rowcount == 1
+
+    def get_by_resume(self, resume_id: str) -> Optional[Dict]:
+        row = self._db.execute(
+            "SELECT data FROM ingestion_jobs WHERE resume_id = ? ORDER BY updated_at DESC LIMIT 1",
+            (resume_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+class ResumeIngestor:
+    """Parse → chunk → embed → store for one uploaded file, reporting each stage."""
+
+    def __init__(self, doc_parser, chunker, embedding_service, vector_store, registry=None, skills=None):
+        self.doc_parser = doc_parser
+        self.chunker = chunker
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.registry = registry
+        # ResumeSkills: the resume's skills are extracted once here, not per analysis
+        self.skills = skills
+
+    def run(self, job: Dict, data: bytes, report) -> Dict:
+        resume_id = job["resume_id"]
+
+        try:
+            with timed("parse"):
+                text = self.doc_parser.parse(io.BytesIO(data), job["file_type"])
+        except ValueError as e:
+            print(f"[Ingestion] Could not parse {job['filename']}: {e}")
+            raise IngestionFailed("Invalid file")
+
+        if not text or len(text) < 50:
+            raise IngestionFailed("Could not extract text from file")
+        report("parsed")
+
+        # Same text as an earlier, fully stored upload (e.g. re-exported PDF): alias it, skip embedding
+        digest = text_fingerprint(text) if self.registry is not None else None
+        if digest is not None:
+            owner = self.registry.find_text(digest)
+            if owner is not None:
+                self.registry.add_alias(resume_id, owner)
+                print(f"Duplicate resume text, aliasing {resume_id} to {owner}")
+                return {
+                    "deduplicated": True,
+                    "dedup_match": "text",
+                    "duplicate_of": owner,
+                    "char_count": len(text),
+                    "word_count": len(text.split()),
+                }
+
+        with timed("chunk"):
+            chunks = self.chunker.chunk_by_sections(text)
+        CHUNKS_PER_RESUME.observe(len(chunks))
+        report("chunked")
+
+        print(f"Generating Embeddings for {len(chunks)} chunks")
+        chunk_texts = [chunk["text"] for chunk in chunks]
+        with timed("embed"):
+            embeddings = self.embedding_service.embed_batch(chunk_texts)
+        report("embedded")
+
+        print(f"Adding Chunks to Vector Store")
+        with timed("store"):
+            stored_count = self.vector_store.add_chunks(resume_id, chunks, embeddings)
+        report("stored")
+
+        result = {
+            "deduplicated": False,
+            "char_count": len(text),
+            "word_count": len(text.split()),
+            "chunks_created": len(chunks),
+            "chunks_stored": stored_count,
+            "chunks": [
+                {
+                    "section": chunk["section"],
+                    "chunk_id": chunk["chunk_id"],
+                    "word_count": chunk["word_count"],
+                    "span": chunk["span"],
+                    "text": chunk["text"][:20]
+                }
+                for chunk in chunks
+            ],
+            "text_preview": text[:300] + "..."
+        }
+        if self.skills is not None:
+            with timed("skills"):
+                result["skills"] = list(self.skills.index(resume_id, chunks))
+        # Last step, so nothing is aliased to this resume unless its job has succeeded
+        if digest is not None:
+            self.registry.claim_text(digest, resume_id)
+        return result
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class IngestionQueue:
+    """
+    Runs ResumeIngestor jobs on a bounded worker pool and records their progress.
+
+    Jobs run in the thread pool of the process that accepted the upload. If
+    that process exits mid-job, the record would stay queued/processing; any
+    worker that reads it then marks it failed (owner pid gone, or no update
+    for `stale_after` seconds) and releases its dedup claims, so the file
+    can be uploaded again.
+    """
+
+    def __init__(self, ingestor: ResumeIngestor, store=None, max_workers: Optional[int] = None,
+                 stale_after: Optional[float] = None):
+        self.ingestor = ingestor
+        self.store = store if store is not None else InMemoryJobStore()
+        self.max_workers = max_workers or Config.INGESTION_WORKERS
+        self.stale_after = stale_after if stale_after is not None else Config.INGESTION_STALE_AFTER
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._done: Dict[str, threading.Event] = {}
+
+    @classmethod
+    def from_config(cls, ingestor: ResumeIngestor) -> "IngestionQueue":
+        if Config.INGESTION_JOB_STORE == "sqlite":
+            store = SQLiteJobStore(Config.INGESTION_DB_PATH)
+        else:
+            store = InMemoryJobStore()
+        return cls(ingestor, store=store, max_workers=Config.INGESTION_WORKERS)
+
+    def submit(self, resume_id: str, filename: str, file_type: str, data: bytes) -> Dict:
+        """Queue an uploaded file, held in memory, for ingestion."""
+        job = new_job(resume_id, filename, file_type)
+        # Registered first, so a concurrent reader never takes the new job for an abandoned one
+        self._done[job["job_id"]] = threading.Event()
+        try:
+            self.store.create(job)
+        except Exception:
+            self._done.pop(job["job_id"], None)
+            raise
+        self._get_executor().submit(self._run, job, data)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        return self._expire(self.store.get(job_id))
+
+    def get_by_resume(self, resume_id: str) -> Optional[Dict]:
+        return self._expire(self.store.get_by_resume(resume_id))
+
+    def wait_for_resume(self, resume_id: str, timeout: float) -> Optional[Dict]:
+        """
+        Block until the resume's ingestion job finishes or `timeout` passes.
+
+        Returns the latest job record, or None if the resume was never queued
+        here (e.g. it was ingested before jobs existed).
+        """
+        job = self.get_by_resume(resume_id)
+        if job is None or job["status"] in (COMPLETED, FAILED):
+            return job
+
+        deadline = time.monotonic() + timeout
+        event = self._done.get(job["job_id"])
+        if event is not None:
+            event.wait(timeout)
+        else:
+            # Job belongs to another worker process: poll the shared store
+            while time.monotonic() < deadline:
+                job = self.get(job["job_id"])
+                if job["status"] in (COMPLETED, FAILED):
+                    return job
+                time.sleep(0.25)
+
+        return self.store.get(job["job_id"])
+
+    async def wait_for_resume_async(self, resume_id: str, timeout: float, poll_interval: float = 0.05) -> Optional[Dict]:
+        """
+        `wait_for_resume` for the async server: polls instead of parking a thread
+        per waiting request, so many uploads can be awaited at once.
+        """
+        job = self.get_by_resume(resume_id)
+        if job is None or job["status"] in (COMPLETED, FAILED):
+            return job
+
+        deadline = time.monotonic() + timeout
+        event = self._done.get(job["job_id"])
+        while time.monotonic() < deadline:
+            if event is not None:
+                if event.is_set():
+                    break
+                await asyncio.sleep(poll_interval)
+            else:
+                # Job belongs to another worker process: poll the shared store
+                job = self.get(job["job_id"])
+                if job["status"] in (COMPLETED, FAILED):
+                    return job
+                await asyncio.sleep(0.25)
+
+        return self.store.get(job["job_id"])
+
+    def _run(self, job: Dict, data: bytes):
+        job_id = job["job_id"]
+        self.store.update(job_id, status=PROCESSING)
+
+        def report(stage: str):
+            self.store.update(job_id, stages={stage: time.time()})
+
+        try:
+            result = self.ingestor.run(job, data, report)
+            self.store.update(job_id, status=COMPLETED, result=result)
+        except IngestionFailed as e:
+            self._fail(job, str(e))
+        except Exception as e:
+            print(f"[Ingestion] Job {job_id} failed: {e}")
+            self._fail(job, str(e))
+        finally:
+            event = self._done.pop(job_id, None)
+            if event is not None:
+                event.set()
+
+    def _fail(self, job: Dict, error: str):
+        self.store.update(job["job_id"], status=FAILED, error=error)
+        self._release(job["resume_id"])
+
+    def _release(self, resume_id: str):
+        # Release fingerprints so a re-upload of the same file is processed again
+        if self.ingestor.registry is not None:
+            self.ingestor.registry.forget(resume_id)
+
+    def _expire(self, job: Optional[Dict]) -> Optional[Dict]:
+        """Fail `job` if the worker running it is gone; returns the current record."""
+        if job is None or job["status"] not in (QUEUED, PROCESSING) or job["job_id"] in self._done:
+            return job
+        if not self._abandoned(job):
+            return job
+        if self.store.fail_if_unchanged(job["job_id"], job["updated_at"], ABANDONED):
+            print(f"[Ingestion] Job {job['job_id']} was abandoned by worker {job.get('worker_pid')}, marked failed")
+            self._release(job["resume_id"])
+        return self.store.get(job["job_id"])
+
+    def _abandoned(self, job: Dict) -> bool:
+        pid = job.get("worker_pid")
+        # Not running here, so a job recorded under this pid is from an earlier process
+        if pid is not None and (pid == os.getpid() or not _process_alive(pid)):
+            return True
+        return time.time() - job["updated_at"] > self.stale_after
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Created on first use so the pool is never inherited across a fork
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="ingest"
+                )
+            return self._executor
@@ -0,0 +1,70 @@
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONParser:
+    """
+    Parse a streamed JSON object and emit each top-level field once it is complete.
+
+    Text before the opening brace (e.g. a ```json fence) is ignored. Nested
+    values are emitted whole, as soon as the comma or closing brace that ends
+    them arrives.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields = {}
+        self.done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Consume more text and return the (key, value) pairs it completed."""
+        self.buffer += text
+        completed = []
+        buffer = self.buffer
+
+        while self._pos < len(buffer) and not self.done:
+            char = buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buffer[self._member_start:self._pos], completed)
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                self._emit(buffer[self._member_start:self._pos], completed)
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return completed
+
+    def _emit(self, member: str, completed: List[Tuple[str, Any]]):
+        if not member.strip():
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except json.JSONDecodeError:
+            return
+        for key, value in parsed.items():
+            self.fields[key] = value
+            completed.append((key, value))
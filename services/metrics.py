@@ -0,0 +1,216 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds; spans run from sub-millisecond cache lookups to multi-second Gemini calls
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+TOKEN_BUCKETS = (0, 100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [per-bucket counts (last is +Inf), sum, count]
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self, **labels) -> Optional[Dict]:
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                return None
+            return {"count": series[2], "sum": series[1]}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, ([*s[0]], s[1], s[2])) for key, s in self._series.items())
+        for key, (counts, total, count) in items:
+            base = list(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(base + [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(base)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(base)} {count}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    Gauge or counter whose values are read from `callback` at scrape time, for
+    services that already keep their own counts (e.g. cache hits).
+
+    `callback` returns {((label, value), ...): number}.
+    """
+
+    def __init__(self, name: str, help: str, callback: Callable[[], Dict[Tuple[Tuple[str, str], ...], float]],
+                 kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.callback = callback
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            values = self.callback()
+        except Exception as e:
+            print(f"[Metrics] {self.name} callback failed: {e}")
+            return lines
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(list(labels))} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-local metric registry.
+
+    Each gunicorn worker keeps its own registry, and a scrape of /metrics is
+    answered by whichever worker accepts it. With several workers the series
+    therefore jump between workers' values rather than adding up, and
+    counters appear to reset. Scrape one worker per target (e.g. a
+    single-worker instance) for coherent series.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help: str, buckets=LATENCY_BUCKETS, labelnames: Tuple[str, ...] = ()) -> Histogram:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help, buckets, labelnames)
+            return self._metrics[name]
+
+    def callback(self, name: str, help: str, callback, kind: str = "gauge") -> CallbackMetric:
+        """Register (or replace) a metric computed at scrape time."""
+        with self._lock:
+            self._metrics[name] = CallbackMetric(name, help, callback, kind)
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "resume_stage_duration_seconds", "Time spent in each pipeline stage", labelnames=("stage",)
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency", labelnames=("endpoint", "method", "status")
+)
+CHUNKS_PER_RESUME = REGISTRY.histogram(
+    "resume_chunks_per_document", "Chunks created per ingested resume", buckets=COUNT_BUCKETS
+)
+CHUNKS_ANALYZED = REGISTRY.histogram(
+    "resume_chunks_analyzed", "Chunks sent to the LLM per analysis", buckets=COUNT_BUCKETS
+)
+PROMPT_CHARS = REGISTRY.histogram(
+    "llm_prompt_chars", "Prompt size in characters", buckets=SIZE_BUCKETS
+)
+RESPONSE_CHARS = REGISTRY.histogram(
+    "llm_response_chars", "LLM response size in characters", buckets=SIZE_BUCKETS
+)
+CONTEXT_TOKENS = REGISTRY.histogram(
+    "llm_context_tokens", "Estimated resume-evidence tokens per prompt, before and after packing",
+    buckets=TOKEN_BUCKETS, labelnames=("stage",)
+)
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.histogram(
+    "rate_limit_wait_seconds", "Time API calls waited for rate-limit budget", labelnames=("api", "lane")
+)
+
+
+class RequestTimings:
+    """Spans recorded while serving one request, in the order they finished."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float]] = []
+
+    def add(self, stage: str, seconds: float):
+        self.spans.append((stage, seconds))
+
+    def as_dict(self) -> Dict:
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "stages": [{"stage": stage, "ms": round(seconds * 1000, 2)} for stage, seconds in self.spans],
+        }
+
+    def server_timing(self) -> str:
+        """Value for the standard Server-Timing response header."""
+        return ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.spans)
+
+
+_current_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request() -> Tuple[RequestTimings, contextvars.Token]:
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def finish_request(token: contextvars.Token):
+    _current_timings.reset(token)
+
+
+@contextmanager
+def timed(stage: str):
+    """Record a span in the stage histogram and, inside a request, in its timing breakdown."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(stage, elapsed)
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
@@ -0,0 +1,58 @@
+import os
+import threading
+from typing import Optional
+
+from pymongo import MongoClient
+from pymongo.database import Database
+
+from config import Config
+
+_client: Optional[MongoClient] = None
+_client_pid: Optional[int] = None
+_lock = threading.Lock()
+
+
+def _write_concern(value: str):
+    return int(value) if value.isdigit() else value
+
+
+def create_client(uri: Optional[str] = None) -> MongoClient:
+    """MongoClient with the pool, timeout and write-concern settings from Config."""
+    return MongoClient(
+        uri or Config.MONGODB_URI,
+        maxPoolSize=Config.MONGO_MAX_POOL_SIZE,
+        minPoolSize=Config.MONGO_MIN_POOL_SIZE,
+        connectTimeoutMS=Config.MONGO_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=Config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=Config.MONGO_SOCKET_TIMEOUT_MS,
+        w=_write_concern(Config.MONGO_WRITE_CONCERN),
+        wTimeoutMS=Config.MONGO_WRITE_TIMEOUT_MS,
+    )
+
+
+def get_client() -> MongoClient:
+    """
+    The process-wide client. Every store and script shares its connection pool.
+
+    MongoClient is not fork-safe, so a forked worker (e.g. gunicorn --preload)
+    gets a fresh client instead of the parent's sockets.
+    """
+    global _client, _client_pid
+    with _lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = create_client()
+            _client_pid = os.getpid()
+        return _client
+
+
+def get_database() -> Database:
+    return get_client()[Config.MONGODB_DATABASE]
+
+
+def close_client():
+    global _client, _client_pid
+    with _lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+        _client = None
+        _client_pid = None
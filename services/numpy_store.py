@@ -0,0 +1,208 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from services.vector_codec import decode_vector
+from services.vector_store import VectorStore, MongoVectorStore, chunk_metadata
+
+
+class ResumeMatrix:
+    """A resume's chunks with their embeddings as one L2-normalised float32 matrix."""
+
+    __slots__ = ("matrix", "texts", "metadata")
+
+    def __init__(self, texts: List[str], metadata: List[Dict], embeddings):
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(texts), -1)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self.matrix = matrix / norms
+        self.texts = texts
+        self.metadata = metadata
+
+    @classmethod
+    def from_documents(cls, documents: List[Dict]) -> "ResumeMatrix":
+        return cls(
+            texts=[doc["content"] for doc in documents],
+            metadata=[doc["metadata"] for doc in documents],
+            embeddings=[decode_vector(doc["embedding"]) for doc in documents]
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+def normalize_query(query_embedding: List[float]) -> np.ndarray:
+    query = np.asarray(query_embedding, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    return query / norm if norm else query
+
+
+def cosine_to_score(cosine: np.ndarray) -> np.ndarray:
+    """Map cosine similarity to [0, 1] the same way Atlas reports vectorSearchScore."""
+    return (1.0 + cosine) / 2.0
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Exact cosine search over per-resume matrices held in process memory.
+
+    With a `backing` store, writes go through to it and each resume's chunk
+    embeddings are loaded from it once, then kept in an LRU of `max_resumes`
+    entries. Without one, this is a fully offline store: nothing is evicted
+    and nothing outlives the process, which is what tests and benchmarks want.
+    """
+
+    def __init__(self, backing: Optional[MongoVectorStore] = None, max_resumes: int = 1024,
+                 embedding_model: str = None, dimensions: int = None):
+        self.backing = backing
+        self.max_resumes = max_resumes
+        self.embedding_model = embedding_model
+        self.dimensions = dimensions
+        self._resumes: "OrderedDict[str, ResumeMatrix]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def add_chunks(self, resume_id: str, chunks: List[Dict], embeddings: List[List[float]]) -> int:
+        return self.add_many({resume_id: (chunks, embeddings)})[resume_id]
+
+    def add_many(self, resumes: Dict[str, Tuple[List[Dict], List[List[float]]]]) -> Dict[str, int]:
+        """Write through to the backing store in one call, then cache the matrix of every fully stored resume."""
+        self.check_dimensions(resumes)
+        if self.backing is not None:
+            stored = self.backing.add_many(resumes)
+        else:
+            stored = {resume_id: len(chunks) for resume_id, (chunks, _) in resumes.items()}
+
+        for resume_id, (chunks, embeddings) in resumes.items():
+            if stored[resume_id] == len(chunks):
+                self._cache_chunks(resume_id, chunks, embeddings)
+            else:
+                # Partly written: reload from the backing store when next asked
+                self._evict(resume_id)
+        return stored
+
+    def _cache_chunks(self, resume_id: str, chunks: List[Dict], embeddings: List[List[float]]):
+        if not chunks:
+            self._evict(resume_id)
+            return
+
+        entry = ResumeMatrix(
+            texts=[chunk["text"] for chunk in chunks],
+            metadata=[chunk_metadata(chunk) for chunk in chunks],
+            embeddings=embeddings
+        )
+        self._remember(resume_id, entry)
+
+    def search(self, query_embedding: List[float], resume_id: str, top_k: int = 5) -> List[Dict]:
+        """Exact top_k by cosine: one matrix-vector product over the resume's chunks."""
+        entry = self.get_matrix(resume_id)
+        if entry is None or len(entry) == 0:
+            return []
+
+        query = normalize_query(query_embedding)
+        if query.shape[0] != entry.matrix.shape[1]:
+            print(f"[NumpyStore] ERROR: query has {query.shape[0]} dims, resume {resume_id} has {entry.matrix.shape[1]}")
+            return []
+
+        scores = cosine_to_score(entry.matrix @ query)
+        k = min(top_k, len(entry))
+        if k < len(entry):
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+        else:
+            top = np.argsort(-scores, kind="stable")
+
+        return [
+            {
+                "text": entry.texts[i],
+                "metadata": entry.metadata[i],
+                "score": float(scores[i])
+            }
+            for i in top
+        ]
+
+    def get_matrix(self, resume_id: str) -> Optional[ResumeMatrix]:
+        """Cached matrix for a resume, loading it from the backing store on a miss."""
+        with self._lock:
+            entry = self._resumes.get(resume_id)
+            if entry is not None:
+                self._resumes.move_to_end(resume_id)
+                return entry
+
+        if self.backing is None:
+            return None
+
+        documents = self.backing.get_resume_embeddings(resume_id)
+        self.loads += 1
+        if not documents:
+            return None
+
+        entry = ResumeMatrix.from_documents(documents)
+        self._remember(resume_id, entry)
+        return entry
+
+    def get_matrices(self, resume_ids: List[str]) -> Dict[str, ResumeMatrix]:
+        """Cached matrices for many resumes; misses are loaded in one backing query."""
+        matrices = {}
+        missing = []
+        with self._lock:
+            for resume_id in resume_ids:
+                entry = self._resumes.get(resume_id)
+                if entry is not None:
+                    self._resumes.move_to_end(resume_id)
+                    matrices[resume_id] = entry
+                else:
+                    missing.append(resume_id)
+
+        if missing and self.backing is not None:
+            grouped = self.backing.get_embeddings(missing)
+            self.loads += 1
+            for resume_id in missing:
+                documents = grouped.get(resume_id)
+                if documents:
+                    entry = ResumeMatrix.from_documents(documents)
+                    self._remember(resume_id, entry)
+                    matrices[resume_id] = entry
+
+        return matrices
+
+    def get_resume_chunks(self, resume_id: str) -> List[Dict]:
+        if self.backing is not None:
+            return self.backing.get_resume_chunks(resume_id)
+
+        entry = self.get_matrix(resume_id)
+        if entry is None:
+            return []
+        return [
+            {"content": text, "metadata": metadata}
+            for text, metadata in zip(entry.texts, entry.metadata)
+        ]
+
+    def delete_resume(self, resume_id: str) -> int:
+        evicted = self._evict(resume_id)
+        if self.backing is not None:
+            return self.backing.delete_resume(resume_id)
+        return len(evicted) if evicted is not None else 0
+
+    def close(self):
+        with self._lock:
+            self._resumes.clear()
+        if self.backing is not None:
+            self.backing.close()
+
+    def _remember(self, resume_id: str, entry: ResumeMatrix):
+        with self._lock:
+            self._resumes[resume_id] = entry
+            self._resumes.move_to_end(resume_id)
+            # Offline stores are the system of record, so only evict when backed
+            if self.backing is not None:
+                while len(self._resumes) > self.max_resumes:
+                    self._resumes.popitem(last=False)
+
+    def _evict(self, resume_id: str) -> Optional[ResumeMatrix]:
+        with self._lock:
+            return self._resumes.pop(resume_id, None)
@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+from services.metrics import timed
+from services.numpy_store import normalize_query, cosine_to_score
+
+
+class ResumeRanker:
+    """Rank many resumes against one job description, then analyze the shortlist."""
+
+    def __init__(self, embedding_service, vector_store, analyzer, max_workers: Optional[int] = None,
+                 skills=None):
+        """`skills` (a ResumeSkills) adds each resume's skill overlap to its ranking entry and analysis."""
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.analyzer = analyzer
+        self.skills = skills
+        self.max_workers = max_workers or Config.RANK_ANALYZE_CONCURRENCY
+        self.top_chunks = Config.RANK_TOP_CHUNKS
+
+    def rank(self, job_description: str, resume_ids: List[str], top_n: int = 5,
+             chunks_per_resume: int = 6, analyze: bool = True) -> Dict:
+        """
+        Score every resume with a single similarity pass and analyze the top N.
+
+        A resume's score is the mean of its best `top_chunks` chunk scores, so
+        one strong paragraph does not outrank consistent evidence.
+
+        Returns:
+            Dict with the ranked list and any resume_ids that had no chunks
+        """
+        resume_ids = list(dict.fromkeys(resume_ids))
+        with timed("embed_query"):
+            query = normalize_query(self.embedding_service.embed_query(job_description))
+
+        with timed("load_matrices"):
+            matrices = self.vector_store.get_matrices(resume_ids)
+        found = [resume_id for resume_id in resume_ids if resume_id in matrices]
+        not_found = [resume_id for resume_id in resume_ids if resume_id not in matrices]
+
+        if not found:
+            return {"ranking": [], "not_found": not_found}
+
+        # One matrix-vector product over the chunks of every resume
+        with timed("rank_score"):
+            stacked = np.vstack([matrices[resume_id].matrix for resume_id in found])
+            scores = cosine_to_score(stacked @ query)
+
+        ranking = []
+        offset = 0
+        for resume_id in found:
+            entry = matrices[resume_id]
+            resume_scores = scores[offset:offset + len(entry)]
+            offset += len(entry)
+
+            order = np.argsort(-resume_scores, kind="stable")
+            ranking.append({
+                "resume_id": resume_id,
+                "score": float(resume_scores[order[:self.top_chunks]].mean()),
+                "best_chunk_score": float(resume_scores[order[0]]),
+                "chunks_scored": len(entry),
+                "_chunks": [
+                    {
+                        "text": entry.texts[i],
+                        "metadata": entry.metadata[i],
+                        "score": float(resume_scores[i])
+                    }
+                    for i in order[:chunks_per_resume]
+                ]
+            })
+
+        if self.skills is not None:
+            with timed("rank_skills"):
+                overlaps = self.skills.overlaps(job_description, found)
+            for item in ranking:
+                if item["resume_id"] in overlaps:
+                    item["skills"] = overlaps[item["resume_id"]]
+
+        ranking.sort(key=lambda item: item["score"], reverse=True)
+        for position, item in enumerate(ranking, 1):
+            item["rank"] = position
+
+        shortlist = ranking[:top_n] if analyze else []
+        if shortlist:
+            print(f"[Ranker] Analyzing top {len(shortlist)} of {len(ranking)} resumes")
+            with timed("rank_analyze"), ThreadPoolExecutor(max_workers=min(self.max_workers, len(shortlist))) as pool:
+                analyses = pool.map(
+                    lambda item: self.analyzer.analyze(item["_chunks"], job_description, skills=item.get("skills")),
+                    shortlist
+                )
+                for item, analysis in zip(shortlist, analyses):
+                    item["analysis"] = analysis
+
+        for item in ranking:
+            del item["_chunks"]
+
+        return {"ranking": ranking, "not_found": not_found}
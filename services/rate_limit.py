@@ -0,0 +1,354 @@
+import asyncio
+import random
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from services.metrics import RATE_LIMIT_WAIT_SECONDS, REGISTRY
+from utils.sqlite import ThreadLocalSQLite
+
+# Lanes, highest priority first: interactive requests (a recruiter is
+# waiting) go ahead of bulk work such as embedding uploaded documents
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# name -> (cost, capacity, refill per second, level that must remain after taking)
+Costs = Dict[str, Tuple[float, float, float, float]]
+
+_limiters: "weakref.WeakSet[RateLimiter]" = weakref.WeakSet()
+
+
+class RateLimited(Exception):
+    """The API kept answering 429, or the wait for budget would be too long."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """429 / RESOURCE_EXHAUSTED from the Gemini SDK (google.api_core) or a plain HTTP client."""
+    code = getattr(error, "code", None)
+    try:
+        if code is not None and int(code) == 429:
+            return True
+    except (TypeError, ValueError):
+        pass
+    if type(error).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    message = str(error).lower()
+    return re.search(r"\b429\b", message) is not None or "resource has been exhausted" in message
+
+
+class InMemoryBucketStore:
+    """Token buckets for a single process."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, costs: Costs, now: float) -> float:
+        with self._lock:
+            levels = {name: self._level(name, capacity, rate, now) for name, (_, capacity, rate, _) in costs.items()}
+            wait = _wait_for(costs, levels)
+            if wait <= 0:
+                for name, (cost, _, _, _) in costs.items():
+                    levels[name] -= cost
+            for name, level in levels.items():
+                self._buckets[name] = (level, now)
+            return wait
+
+    def adjust(self, name: str, delta: float, capacity: float, rate: float, now: float):
+        with self._lock:
+            self._buckets[name] = (self._level(name, capacity, rate, now) + delta, now)
+
+    def drain(self, name: str, now: float):
+        with self._lock:
+            self._buckets[name] = (0.0, now)
+
+    def _level(self, name: str, capacity: float, rate: float, now: float) -> float:
+        if name not in self._buckets:
+            return capacity
+        level, updated = self._buckets[name]
+        return min(capacity, level + max(0.0, now - updated) * rate)
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets in a SQLite file, shared by every worker process on the host.
+
+    Each take is one IMMEDIATE transaction, so two workers can never spend
+    the same budget.
+    """
+
+    def __init__(self, path: str):
+        self._db = ThreadLocalSQLite(path)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_buckets (
+                name TEXT PRIMARY KEY,
+                level REAL NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+
+    def take(self, costs: Costs, now: float) -> float:
+        with self._transaction() as conn:
+            levels = {name: self._level(conn, name, capacity, rate, now)
+                      for name, (_, capacity, rate, _) in costs.items()}
+            wait = _wait_for(costs, levels)
+            if wait <= 0:
+                for name, (cost, _, _, _) in costs.items():
+                    levels[name] -= cost
+            for name, level in levels.items():
+                self._store(conn, name, level, now)
+            return wait
+
+    def adjust(self, name: str, delta: float, capacity: float, rate: float, now: float):
+        with self._transaction() as conn:
+            self._store(conn, name, self._level(conn, name, capacity, rate, now) + delta, now)
+
+    def drain(self, name: str, now: float):
+        with self._transaction() as conn:
+            self._store(conn, name, 0.0, now)
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._db.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _level(conn, name: str, capacity: float, rate: float, now: float) -> float:
+        row = conn.execute("SELECT level, updated FROM rate_buckets WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return capacity
+        return min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+
+    @staticmethod
+    def _store(conn, name: str, level: float, now: float):
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_buckets (name, level, updated) VALUES (?, ?, ?)", (name, level, now)
+        )
+
+
+def _wait_for(costs: Costs, levels: Dict[str, float]) -> float:
+    """Seconds until every bucket can pay its cost and keep its floor; <= 0 means now."""
+    wait = 0.0
+    for name, (cost, _, rate, floor) in costs.items():
+        wait = max(wait, (cost + floor - levels[name]) / rate)
+    return wait
+
+
+class RateLimiter:
+    """
+    Per-minute request and token budgets for each API, with retries on 429.
+
+    Every call takes one request plus its estimated tokens from the API's
+    buckets before it is sent, waiting for them to refill if needed. Bulk
+    callers must leave `bulk_reserve` of each bucket untouched and also
+    wait while an interactive caller in this process is queued, so uploads
+    being embedded never starve an analysis. A 429 drains the API's request
+    bucket, so every worker backs off, then the call is retried with
+    full-jitter exponential backoff. Interactive calls give up with
+    RateLimited rather than wait longer than `max_wait`.
+    """
+
+    def __init__(self, store, limits: Dict[str, Tuple[int, int]], bulk_reserve: float = 0.2,
+                 max_wait: float = 30.0, max_retries: int = 4, backoff_base: float = 1.0,
+                 backoff_max: float = 30.0, poll_interval: float = 0.05):
+        self.store = store
+        # api -> (requests per minute, tokens per minute); 0 means unlimited
+        self.limits = limits
+        self.bulk_reserve = bulk_reserve
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self._waiting: Dict[Tuple[str, str], int] = {}
+        self._waiting_lock = threading.Lock()
+        self.retries: Dict[str, int] = {}
+        _limiters.add(self)
+
+    def call(self, api: str, fn: Callable, tokens: int = 0, lane: str = INTERACTIVE):
+        """Run `fn()` within the API's budget, retrying 429s."""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(api, tokens, lane)
+            try:
+                return fn()
+            except Exception as e:
+                delay = self._on_error(api, e, attempt)
+            time.sleep(delay)
+
+    async def call_async(self, api: str, fn: Callable, tokens: int = 0, lane: str = INTERACTIVE):
+        """`call` for coroutines: `fn()` returns an awaitable, and waits do not block the loop."""
+        for attempt in range(self.max_retries + 1):
+            await self.acquire_async(api, tokens, lane)
+            try:
+                return await fn()
+            except Exception as e:
+                delay = self._on_error(api, e, attempt)
+            await asyncio.sleep(delay)
+
+    def acquire(self, api: str, tokens: int = 0, lane: str = INTERACTIVE) -> float:
+        """Block until the call fits the budget; returns the seconds waited."""
+        costs = self._costs(api, tokens, lane)
+        started = time.monotonic()
+        try:
+            with self._queued(api, lane):
+                while costs:
+                    wait = self._next_wait(api, costs, lane, started)
+                    if wait <= 0:
+                        break
+                    time.sleep(wait)
+        finally:
+            waited = self._waited(api, lane, started)
+        return waited
+
+    async def acquire_async(self, api: str, tokens: int = 0, lane: str = INTERACTIVE) -> float:
+        costs = self._costs(api, tokens, lane)
+        started = time.monotonic()
+        try:
+            with self._queued(api, lane):
+                while costs:
+                    wait = await asyncio.to_thread(self._next_wait, api, costs, lane, started)
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+        finally:
+            waited = self._waited(api, lane, started)
+        return waited
+
+    def settle(self, api: str, reserved: int, used: Optional[int]):
+        """Correct the token bucket once the API reports what a call actually used."""
+        _, tpm = self.limits.get(api, (0, 0))
+        if self.store is None or not tpm or used is None or used == reserved:
+            return
+        self.store.adjust(f"{api}:tokens", reserved - used, tpm, tpm / 60.0, time.time())
+
+    def queue_depth(self) -> Dict[Tuple[str, str], int]:
+        with self._waiting_lock:
+            return dict(self._waiting)
+
+    def stats(self) -> Dict:
+        return {
+            "queued": {f"{api}:{lane}": count for (api, lane), count in self.queue_depth().items()},
+            "retries": dict(self.retries),
+        }
+
+    def _costs(self, api: str, tokens: int, lane: str) -> Costs:
+        if self.store is None:
+            return {}
+        rpm, tpm = self.limits.get(api, (0, 0))
+        reserve = self.bulk_reserve if lane == BULK else 0.0
+        costs = {}
+        if rpm:
+            costs[f"{api}:requests"] = (1, rpm, rpm / 60.0, rpm * reserve)
+        if tpm and tokens:
+            # A prompt larger than the whole budget still goes through once the bucket is full
+            costs[f"{api}:tokens"] = (min(tokens, tpm * (1 - reserve)), tpm, tpm / 60.0, tpm * reserve)
+        return costs
+
+    def _next_wait(self, api: str, costs: Costs, lane: str, started: float) -> float:
+        if lane != INTERACTIVE and self._interactive_queued(api):
+            wait = self.poll_interval
+        else:
+            wait = self.store.take(costs, time.time())
+            if wait <= 0:
+                return wait
+        elapsed = time.monotonic() - started
+        # Someone is waiting on an interactive call; bulk work just runs later
+        if lane == INTERACTIVE and elapsed + wait > self.max_wait:
+            raise RateLimited(f"{api} rate limit: no budget within {self.max_wait:g}s", retry_after=wait)
+        # Re-check often enough to notice budget freed by a settle or another lane
+        return min(wait, 1.0)
+
+    def _on_error(self, api: str, error: Exception, attempt: int) -> float:
+        """Backoff before the next attempt, or re-raise if `error` is not retryable."""
+        if not is_rate_limit_error(error):
+            raise error
+        self.retries[api] = self.retries.get(api, 0) + 1
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if attempt >= self.max_retries:
+            raise RateLimited(f"{api} rate limited after {attempt + 1} attempts: {error}",
+                              retry_after=self.backoff_base * 2 ** attempt) from error
+        if self.store is not None and self.limits.get(api, (0, 0))[0]:
+            self.store.drain(f"{api}:requests", time.time())
+        print(f"[RateLimiter] {api} returned 429, retrying in {delay:.1f}s")
+        return delay
+
+    @contextmanager
+    def _queued(self, api: str, lane: str):
+        key = (api, lane)
+        with self._waiting_lock:
+            self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._waiting_lock:
+                self._waiting[key] -= 1
+
+    def _interactive_queued(self, api: str) -> bool:
+        with self._waiting_lock:
+            return self._waiting.get((api, INTERACTIVE), 0) > 0
+
+    def _waited(self, api: str, lane: str, started: float) -> float:
+        # Observed for calls that gave up too, so the histogram shows the full wait
+        waited = time.monotonic() - started
+        RATE_LIMIT_WAIT_SECONDS.observe(waited, api=api, lane=lane)
+        return waited
+
+
+def create_rate_limiter(config) -> RateLimiter:
+    """Limiter for Config.RATE_LIMIT_BACKEND; "none" still retries 429s but never waits up front."""
+    backend = config.RATE_LIMIT_BACKEND
+    if backend == "sqlite":
+        store = SQLiteBucketStore(config.RATE_LIMIT_DB_PATH)
+    elif backend == "memory":
+        store = InMemoryBucketStore()
+    elif backend == "none":
+        store = None
+    else:
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+    return RateLimiter(
+        store,
+        limits={
+            "generation": (config.GEMINI_RPM, config.GEMINI_TPM),
+            "embedding": (config.EMBEDDING_RPM, config.EMBEDDING_TPM),
+        },
+        bulk_reserve=config.RATE_LIMIT_BULK_RESERVE,
+        max_wait=config.RATE_LIMIT_MAX_WAIT,
+        max_retries=config.RATE_LIMIT_MAX_RETRIES,
+        backoff_base=config.RATE_LIMIT_BACKOFF_BASE,
+    )
+
+
+def _collect_queue_depth():
+    values = {}
+    for limiter in list(_limiters):
+        for (api, lane), count in limiter.queue_depth().items():
+            labels = (("api", api), ("lane", lane))
+            values[labels] = values.get(labels, 0) + count
+    return values
+
+
+def _collect_retries():
+    values = {}
+    for limiter in list(_limiters):
+        for api, count in limiter.retries.items():
+            values[(("api", api),)] = values.get((("api", api),), 0) + count
+    return values
+
+
+REGISTRY.callback("rate_limit_queue_depth", "Calls waiting for rate-limit budget", _collect_queue_depth)
+REGISTRY.callback("rate_limit_retries_total", "API calls retried after a 429", _collect_retries, kind="counter")
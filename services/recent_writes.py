@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+
+class RecentWrite:
+    __slots__ = ("entry", "written_at", "last_probe")
+
+    def __init__(self, entry, written_at: float):
+        self.entry = entry
+        self.written_at = written_at
+        self.last_probe = 0.0
+
+
+class RecentWritesBuffer:
+    """
+    Freshly written resumes, kept in process until the Atlas vector index has them.
+
+    Atlas Search indexes asynchronously, so $vectorSearch misses a resume for
+    a few seconds after its chunks are written. MongoVectorStore answers
+    searches for buffered resumes exactly from the cached ResumeMatrix and
+    evicts the entry once a probe search returns the new chunks. `ttl` bounds
+    how long an entry can live if probes never succeed.
+    """
+
+    def __init__(self, ttl: float = 120.0, probe_interval: float = 1.0, max_resumes: int = 256):
+        self.ttl = ttl
+        self.probe_interval = probe_interval
+        self.max_resumes = max_resumes
+        self._writes: "OrderedDict[str, RecentWrite]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_answers = 0
+        self.evictions = {"consistent": 0, "expired": 0, "capacity": 0}
+
+    def put(self, resume_id: str, entry):
+        with self._lock:
+            self._writes.pop(resume_id, None)
+            self._writes[resume_id] = RecentWrite(entry, time.monotonic())
+            while len(self._writes) > self.max_resumes:
+                self._writes.popitem(last=False)
+                self.evictions["capacity"] += 1
+
+    def get(self, resume_id: str) -> Optional[RecentWrite]:
+        with self._lock:
+            write = self._writes.get(resume_id)
+            if write is not None and time.monotonic() - write.written_at > self.ttl:
+                del self._writes[resume_id]
+                self.evictions["expired"] += 1
+                return None
+            return write
+
+    def should_probe(self, write: RecentWrite) -> bool:
+        """Rate-limit index probes per resume; claims the probe slot when it returns True."""
+        now = time.monotonic()
+        with self._lock:
+            if now - write.last_probe < self.probe_interval:
+                return False
+            write.last_probe = now
+            return True
+
+    def mark_consistent(self, resume_id: str, write: RecentWrite):
+        with self._lock:
+            if self._writes.get(resume_id) is write:
+                del self._writes[resume_id]
+                self.evictions["consistent"] += 1
+                print(f"[VectorStore] Index caught up with {resume_id} "
+                      f"after {time.monotonic() - write.written_at:.1f}s")
+
+    def record_local_answer(self):
+        with self._lock:
+            self.local_answers += 1
+
+    def discard(self, resume_id: str):
+        with self._lock:
+            self._writes.pop(resume_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "buffered": len(self._writes),
+                "local_answers": self.local_answers,
+                "evictions": dict(self.evictions),
+            }
+
+
+def index_has_caught_up(results: List[Dict], texts: List[str], top_k: int) -> bool:
+    """
+    True when an index search returned a full page of the resume's current chunks.
+
+    Fewer results means chunks are still missing from the index; text not in
+    the new version means it still serves a previous upload of the resume.
+    """
+    if len(results) < min(top_k, len(texts)):
+        return False
+    current = set(texts)
+    return all(result["text"] in current for result in results)
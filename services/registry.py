@@ -0,0 +1,95 @@
+import importlib
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Union
+
+
+class ServiceRegistry:
+    """
+    Named services built on first use.
+
+    A factory is either a callable taking no arguments or a "module:attr"
+    path, imported and called only when the service is first requested, so
+    importing the app never pays for SDKs a request has not needed yet.
+    Instances belong to the process that built them: after a fork (gunicorn
+    --preload) the child starts empty and builds its own clients. Instances
+    passed to `set` (tests, benchmarks) survive the fork.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._modules: Dict[str, List[str]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._overrides: Dict[str, Any] = {}
+        self._lock = threading.RLock()  # re-entrant: factories resolve their own dependencies
+        self._pid = os.getpid()
+
+    def register(self, name: str, factory: Union[str, Callable[[], Any]], modules: Iterable[str] = ()):
+        """Register `factory` for `name`; `modules` are what it imports, for `import_modules`."""
+        modules = list(modules)
+        if isinstance(factory, str):
+            module_name, attr = factory.split(":")
+            modules.append(module_name)
+            factory = _import_factory(module_name, attr)
+        self._factories[name] = factory
+        self._modules[name] = modules
+
+    def get(self, name: str) -> Any:
+        self._check_pid()
+        if name in self._overrides:
+            return self._overrides[name]
+        if name in self._instances:
+            return self._instances[name]
+        if name not in self._factories:
+            raise KeyError(f"Unknown service: {name}")
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = self._factories[name]()
+                print(f"[Registry] Built {name}")
+            return self._instances[name]
+
+    def set(self, name: str, instance: Any):
+        """Use `instance` for `name` instead of building it."""
+        self._overrides[name] = instance
+
+    def has(self, name: str) -> bool:
+        return name in self._factories or name in self._overrides
+
+    def loaded(self, name: str) -> bool:
+        """Whether `name` exists in this process already (without building it)."""
+        self._check_pid()
+        return name in self._overrides or name in self._instances
+
+    def import_modules(self, names: Iterable[str] = None):
+        """Import the modules behind `names` (default all) without building anything."""
+        for name in names if names is not None else list(self._modules):
+            for module_name in self._modules[name]:
+                importlib.import_module(module_name)
+
+    def stats(self) -> Dict:
+        self._check_pid()
+        return {
+            "registered": sorted(self._factories),
+            "loaded": sorted(set(self._instances) | set(self._overrides)),
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def _check_pid(self):
+        if self._pid != os.getpid():
+            # Forked child: the parent's clients and lock state are not ours
+            self._instances = {}
+            self._lock = threading.RLock()
+            self._pid = os.getpid()
+
+
+def _import_factory(module_name: str, attr: str) -> Callable[[], Any]:
+    def build():
+        return getattr(importlib.import_module(module_name), attr)()
+    return build
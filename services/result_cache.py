@@ -0,0 +1,157 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from utils.sqlite import ThreadLocalSQLite
+from utils.text import normalize_text
+
+
+def make_analysis_key(chunk_texts: List[str], job_description: str, prompt_template: str,
+                      model_name: str, generation_config: Optional[Dict] = None,
+                      skills: Optional[Dict] = None) -> str:
+    """Hash everything that determines an analysis: evidence, JD, skill overlap, prompt and model."""
+    fields = {
+        "chunks": chunk_texts,
+        "job_description": normalize_text(job_description),
+        "prompt": hashlib.sha256(prompt_template.encode()).hexdigest(),
+        "model": model_name,
+        "generation_config": generation_config or {},
+    }
+    if skills is not None:
+        fields["skills"] = {"matched": skills["matched"], "missing": skills["missing"]}
+    payload = json.dumps(fields, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class InMemoryResultCache:
+    """Per-process analysis cache with TTL expiry and LRU eviction."""
+
+    def __init__(self, ttl: float = 86400, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] < time.time():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return json.loads(entry[1])
+
+    def put(self, key: str, result: Dict):
+        if "error" in result:
+            return
+        with self._lock:
+            self._data[key] = (time.time() + self.ttl, json.dumps(result))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        return {
+            "backend": "memory",
+            "items": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class SQLiteResultCache:
+    """Analysis cache on disk, shared by every worker on the host and kept across restarts."""
+
+    def __init__(self, path: str, ttl: float = 86400, max_entries: int = 5000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._db = ThreadLocalSQLite(path)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_results (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_results_accessed ON analysis_results (accessed_at)"
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        row = self._db.execute(
+            "SELECT result FROM analysis_results WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self._db.execute("UPDATE analysis_results SET accessed_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict):
+        if "error" in result:
+            return
+        now = time.time()
+        self._db.execute(
+            "INSERT OR REPLACE INTO analysis_results (key, result, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(result), now + self.ttl, now)
+        )
+        self._evict(now)
+
+    def _evict(self, now: float):
+        expired = self._db.execute("DELETE FROM analysis_results WHERE expires_at <= ?", (now,)).rowcount
+        overflow = self._db.execute(
+            """
+            DELETE FROM analysis_results WHERE key IN (
+                SELECT key FROM analysis_results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,)
+        ).rowcount
+        self.evictions += max(expired, 0) + max(overflow, 0)
+
+    def stats(self) -> Dict:
+        count = self._db.execute("SELECT COUNT(*) FROM analysis_results").fetchone()[0]
+        return {
+            "backend": "sqlite",
+            "items": count,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def create_result_cache(config):
+    """Build the cache selected by Config.ANALYSIS_CACHE_BACKEND, or None if disabled."""
+    backend = config.ANALYSIS_CACHE_BACKEND
+    if backend == "sqlite":
+        return SQLiteResultCache(
+            config.ANALYSIS_CACHE_PATH,
+            ttl=config.ANALYSIS_CACHE_TTL,
+            max_entries=config.ANALYSIS_CACHE_MAX_ENTRIES
+        )
+    if backend == "memory":
+        return InMemoryResultCache(ttl=config.ANALYSIS_CACHE_TTL, max_entries=config.ANALYSIS_CACHE_MAX_ENTRIES)
+    if backend == "none":
+        return None
+    raise ValueError(f"Unknown ANALYSIS_CACHE_BACKEND: {backend}")
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from services.metrics import REGISTRY
+
+# Every SingleFlight in the process, for the /metrics callback
+_flights: "weakref.WeakSet[SingleFlight]" = weakref.WeakSet()
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one.
+
+    The first caller for a key (the leader) runs the call; callers that
+    arrive while it is in flight (followers) wait for the leader's result, or
+    its exception, instead of making their own. The key is forgotten as
+    soon as the call finishes, so nothing is cached here. Threads and
+    coroutines share one table of futures, so a request on the async server
+    can follow one served by a Flask thread and vice versa. Per process:
+    gunicorn workers each run their own.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.leaders = 0
+        self.followers = 0
+        _flights.add(self)
+
+    def acquire(self, key: Hashable) -> Tuple[Future, bool]:
+        """(future, is_leader) for `key`. A leader must call `finish` exactly once."""
+        if self._pid != os.getpid():
+            # Forked child: the parent's leaders will never finish here
+            self._calls = {}
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.followers += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def finish(self, key: Hashable, future: Future, result: Any = None, error: BaseException = None):
+        """Publish the leader's outcome to its followers and release `key`."""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        future, leader = self.acquire(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future, leader = self.acquire(key)
+        if not leader:
+            # shield: a follower giving up must not cancel the shared future
+            return await asyncio.shield(asyncio.wrap_future(future))
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self.finish(key, future, error=RuntimeError(f"{self.name} call was cancelled"))
+            raise
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict:
+        return {"leaders": self.leaders, "followers": self.followers, "in_flight": self.in_flight()}
+
+
+def stats() -> Dict[str, Dict]:
+    """Per-call stats for every SingleFlight in the process, summed by name."""
+    totals: Dict[str, Dict] = {}
+    for flight in list(_flights):
+        total = totals.setdefault(flight.name, {"leaders": 0, "followers": 0, "in_flight": 0})
+        for field, value in flight.stats().items():
+            total[field] += value
+    return totals
+
+
+def _collect_calls():
+    values = {}
+    for flight in list(_flights):
+        for role, count in (("leader", flight.leaders), ("follower", flight.followers)):
+            labels = (("call", flight.name), ("role", role))
+            values[labels] = values.get(labels, 0) + count
+    return values
+
+
+REGISTRY.callback(
+    "single_flight_calls_total",
+    "Calls by role: leaders made the external call, followers shared a leader's result",
+    _collect_calls, kind="counter"
+)
@@ -0,0 +1,377 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from utils.sqlite import ThreadLocalSQLite
+from utils.text import normalize_text
+
+# A term preceded by one of these is part of a longer name: "js" in "node.js", "c" in "objective-c"
+_JOINERS = ".+#-_"
+
+# {canonical skill: [chunk_ids of the resume that mention it]}
+SkillEvidence = Dict[str, List[str]]
+
+# {canonical skill: [synonyms]}, or {canonical skill: {"synonyms": [...], "case_sensitive": [...]}}
+# for skills spelled like everyday words: "Swift" is a skill, "swift delivery" is not
+Taxonomy = Dict[str, Union[List[str], Dict[str, List[str]]]]
+
+
+def load_taxonomy(path: str) -> Taxonomy:
+    """Read a skills taxonomy JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    if not isinstance(taxonomy, dict):
+        raise ValueError(f"Skills taxonomy {path} must be a JSON object")
+    return taxonomy
+
+
+def taxonomy_terms(taxonomy: Taxonomy) -> Iterator[Tuple[str, str, bool]]:
+    """
+    (canonical skill, term, case_sensitive) for every name and synonym.
+
+    Terms are whitespace-normalised; case-insensitive ones are also lower-cased.
+    A term listed under "case_sensitive" (the skill name included) only
+    matches in exactly that spelling.
+    """
+    for skill, entry in taxonomy.items():
+        if isinstance(entry, dict):
+            synonyms, case_sensitive = entry.get("synonyms", []), entry.get("case_sensitive", [])
+        else:
+            synonyms, case_sensitive = entry, []
+        exact = {" ".join(term.split()) for term in case_sensitive}
+        folded_exact = {term.lower() for term in exact}
+        for term in {normalize_text(skill), *(normalize_text(synonym) for synonym in synonyms)} - folded_exact:
+            if term:
+                yield skill, term, False
+        for term in exact:
+            if term:
+                yield skill, term, True
+
+
+def _fold(text: str) -> Tuple[str, str]:
+    """Whitespace-normalised text and its lower-cased form, position for position."""
+    spaced = " ".join(text.split())
+    folded = spaced.lower()
+    if len(folded) != len(spaced):
+        # A few characters lower-case to more than one ("İ"); those are left as they are
+        folded = "".join(char.lower() if len(char.lower()) == 1 else char for char in spaced)
+    return spaced, folded
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every name and synonym in a skills taxonomy.
+
+    The automaton is compiled once; `find` then scans a text in a single
+    pass, whatever the number of terms, and reports canonical skill names.
+    Matching is case-insensitive on whitespace-normalised text, except for
+    the taxonomy's case-sensitive terms, and a term only counts as a whole
+    word: "java" is not found in "javascript", "react" is not found in
+    "reactive" and "js" is not found in "node.js".
+    """
+
+    def __init__(self, taxonomy: Taxonomy):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (canonical skill, term length, exact spelling or None) of every term ending there
+        self._output: List[List[Tuple[str, int, Optional[str]]]] = [[]]
+        self.skills = sorted(taxonomy)
+        self.terms = 0
+
+        for skill, term, case_sensitive in taxonomy_terms(taxonomy):
+            self._add(term, skill, term if case_sensitive else None)
+        self._link()
+
+        canonical = json.dumps(taxonomy, sort_keys=True)
+        self.version = hashlib.sha256(canonical.encode()).hexdigest()[:12]
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        return cls(load_taxonomy(path))
+
+    def _add(self, term: str, skill: str, exact: Optional[str]):
+        state = 0
+        for char in term.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((skill, len(term), exact))
+        self.terms += 1
+
+    def _link(self):
+        """Breadth-first failure links; each state also inherits the outputs of its fallback."""
+        # Depth-one states fall back to the root, which is their fail link's default
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills mentioned in `text`, in order of first appearance."""
+        spaced, text = _fold(text)
+        found: Dict[str, None] = {}
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        last = len(text) - 1
+
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for skill, length, exact in output[state]:
+                start = end - length + 1
+                if start > 0 and (text[start - 1].isalnum() or text[start - 1] in _JOINERS):
+                    continue
+                if end < last and (text[end + 1].isalnum() or text[end + 1] in "+#"):
+                    continue
+                if exact is not None and spaced[start:end + 1] != exact:
+                    continue
+                found[skill] = None
+        return list(found)
+
+    def find_in_chunks(self, chunks: Iterable[Dict]) -> SkillEvidence:
+        """Skills of a resume from its ResumeChunker chunks, with the chunk_ids that mention each."""
+        evidence: SkillEvidence = {}
+        for chunk in chunks:
+            for skill in self.find(chunk["text"]):
+                evidence.setdefault(skill, []).append(chunk["chunk_id"])
+        return evidence
+
+
+def skill_overlap(resume_skills: SkillEvidence, job_skills: Iterable[str]) -> Dict:
+    """Matched and missing JD skills, in JD order, with where the matches are in the resume."""
+    job_skills = list(job_skills)
+    matched = [skill for skill in job_skills if skill in resume_skills]
+    return {
+        "matched": matched,
+        "missing": [skill for skill in job_skills if skill not in resume_skills],
+        "coverage": round(len(matched) / len(job_skills), 3) if job_skills else None,
+        "evidence": {skill: resume_skills[skill] for skill in matched},
+    }
+
+
+def render_skill_overlap(overlap: Optional[Dict]) -> str:
+    """The overlap as prompt text."""
+    if overlap is None:
+        return "Not available"
+    return (
+        f"Matched: {', '.join(overlap['matched']) or 'none'}\n"
+        f"Missing: {', '.join(overlap['missing']) or 'none'}"
+    )
+
+
+class InMemorySkillStore:
+    """Per-resume skills in a dict; only visible to the process that indexed them."""
+
+    def __init__(self):
+        self._skills: Dict[str, Tuple[str, SkillEvidence]] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, resume_ids: List[str]) -> Dict[str, Tuple[str, SkillEvidence]]:
+        """{resume_id: (taxonomy version, skills)} for the resumes that have an entry."""
+        with self._lock:
+            return {resume_id: self._skills[resume_id] for resume_id in resume_ids if resume_id in self._skills}
+
+    def put(self, resume_id: str, version: str, skills: SkillEvidence):
+        with self._lock:
+            self._skills[resume_id] = (version, skills)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._skills)
+
+
+class SQLiteSkillStore:
+    """Per-resume skills in SQLite, shared by every worker on the host."""
+
+    def __init__(self, path: str):
+        self._db = ThreadLocalSQLite(path)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resume_skills (
+                resume_id TEXT PRIMARY KEY,
+                taxonomy TEXT NOT NULL,
+                skills TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+
+    def get_many(self, resume_ids: List[str]) -> Dict[str, Tuple[str, SkillEvidence]]:
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(resume_ids), 500):
+            batch = resume_ids[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT resume_id, taxonomy, skills FROM resume_skills WHERE resume_id IN ({placeholders})",
+                batch
+            ).fetchall()
+            for resume_id, version, skills in rows:
+                found[resume_id] = (version, json.loads(skills))
+        return found
+
+    def put(self, resume_id: str, version: str, skills: SkillEvidence):
+        self._db.execute(
+            "INSERT OR REPLACE INTO resume_skills (resume_id, taxonomy, skills, updated_at) VALUES (?, ?, ?, ?)",
+            (resume_id, version, json.dumps(skills), time.time())
+        )
+
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM resume_skills").fetchone()[0]
+
+
+class ResumeSkills:
+    """
+    Skills of every ingested resume, extracted once and kept in a store.
+
+    Resumes are indexed at ingest time. Resumes ingested before that, or
+    under an older taxonomy, are re-extracted from the chunks in
+    `vector_store` the first time they are asked for. Comparing a job
+    description against stored skills needs no embedding or LLM call.
+    """
+
+    def __init__(self, matcher: SkillMatcher, store=None, vector_store=None,
+                 missing_ttl: float = 60.0, max_missing: int = 10_000):
+        """
+        `missing_ttl` is how long a resume_id with no chunks is remembered, so
+        repeated lookups of unknown ids skip the vector store; another worker
+        may ingest it in the meantime, hence the expiry.
+        """
+        self.matcher = matcher
+        self.store = store if store is not None else InMemorySkillStore()
+        self.vector_store = vector_store
+        self.missing_ttl = missing_ttl
+        self.max_missing = max_missing
+        self.backfills = 0
+        self._missing: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def index(self, resume_id: str, chunks: List[Dict]) -> SkillEvidence:
+        """Extract and store the skills of a resume's chunks."""
+        skills = self.matcher.find_in_chunks(chunks)
+        self.store.put(resume_id, self.matcher.version, skills)
+        with self._lock:
+            self._missing.pop(resume_id, None)
+        return skills
+
+    def get_many(self, resume_ids: List[str]) -> Dict[str, SkillEvidence]:
+        """Stored skills per resume; resumes without chunks are left out."""
+        stored = self.store.get_many(list(resume_ids))
+        skills = {}
+        unseen = []
+        for resume_id in resume_ids:
+            entry = stored.get(resume_id)
+            if entry is not None and entry[0] == self.matcher.version:
+                skills[resume_id] = entry[1]
+            elif not self._known_missing(resume_id):
+                unseen.append(resume_id)
+        if unseen:
+            skills.update(self._backfill(unseen))
+        return {resume_id: skills[resume_id] for resume_id in resume_ids if resume_id in skills}
+
+    def _backfill(self, resume_ids: List[str]) -> Dict[str, SkillEvidence]:
+        """Re-extract skills from the chunks of many resumes, read in one vector-store call."""
+        if self.vector_store is None:
+            return {}
+        resume_ids = list(dict.fromkeys(resume_ids))
+        matrices = self.vector_store.get_matrices(resume_ids)
+        backfilled = {}
+        for resume_id in resume_ids:
+            matrix = matrices.get(resume_id)
+            if matrix is None:
+                self._remember_missing(resume_id)
+                continue
+            self.backfills += 1
+            backfilled[resume_id] = self.index(resume_id, [
+                {"text": text, "chunk_id": metadata["chunk_id"]}
+                for text, metadata in zip(matrix.texts, matrix.metadata)
+            ])
+        return backfilled
+
+    def _known_missing(self, resume_id: str) -> bool:
+        with self._lock:
+            seen_at = self._missing.get(resume_id)
+            if seen_at is None:
+                return False
+            if time.monotonic() - seen_at < self.missing_ttl:
+                return True
+            del self._missing[resume_id]
+            return False
+
+    def _remember_missing(self, resume_id: str):
+        with self._lock:
+            self._missing[resume_id] = time.monotonic()
+            self._missing.move_to_end(resume_id)
+            while len(self._missing) > self.max_missing:
+                self._missing.popitem(last=False)
+
+    def overlap(self, resume_id: str, job_description: str) -> Optional[Dict]:
+        """skill_overlap of one resume and a JD, or None if the resume is unknown."""
+        return self.overlaps(job_description, [resume_id]).get(resume_id)
+
+    def overlaps(self, job_description: str, resume_ids: List[str]) -> Dict[str, Dict]:
+        """skill_overlap per resume for one JD; unknown resumes are left out."""
+        return self._overlaps(self.matcher.find(job_description), resume_ids)
+
+    def _overlaps(self, job_skills: List[str], resume_ids: List[str]) -> Dict[str, Dict]:
+        return {
+            resume_id: skill_overlap(skills, job_skills)
+            for resume_id, skills in self.get_many(resume_ids).items()
+        }
+
+    def screen(self, job_description: str, resume_ids: List[str]) -> Dict:
+        """
+        Rank resumes by the share of the JD's skills they mention.
+
+        Returns:
+            Dict with the JD's skills, per-resume overlaps (best coverage
+            first) and the resume_ids that had no chunks
+        """
+        resume_ids = list(dict.fromkeys(resume_ids))
+        job_skills = self.matcher.find(job_description)
+        overlaps = self._overlaps(job_skills, resume_ids)
+        results = [
+            {"resume_id": resume_id, **overlaps[resume_id]}
+            for resume_id in resume_ids if resume_id in overlaps
+        ]
+        results.sort(key=lambda item: (item["coverage"] or 0, len(item["matched"])), reverse=True)
+        return {
+            "job_skills": job_skills,
+            "results": results,
+            "not_found": [resume_id for resume_id in resume_ids if resume_id not in overlaps],
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "taxonomy": self.matcher.version,
+            "skills": len(self.matcher.skills),
+            "terms": self.matcher.terms,
+            "resumes": self.store.count(),
+            "backfills": self.backfills,
+            "known_missing": len(self._missing),
+        }
+
+
+def create_resume_skills(config, vector_store=None) -> Optional[ResumeSkills]:
+    """ResumeSkills over Config.SKILLS_TAXONOMY_PATH, or None when skill matching is disabled."""
+    if not config.SKILLS_TAXONOMY_PATH:
+        return None
+    matcher = SkillMatcher.from_file(config.SKILLS_TAXONOMY_PATH)
+    store = SQLiteSkillStore(config.SKILLS_DB_PATH) if config.SKILLS_DB_PATH else InMemorySkillStore()
+    print(f"[Skills] Loaded {len(matcher.skills)} skills ({matcher.terms} terms)")
+    return ResumeSkills(matcher, store, vector_store=vector_store)
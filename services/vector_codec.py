@@ -0,0 +1,63 @@
+from typing import List, Union
+
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype, VECTOR_SUBTYPE
+
+# Storage formats for chunk embeddings in MongoDB:
+#   "array"   - BSON array of doubles (the original layout, ~9 KB per 768-dim vector)
+#   "float32" - packed float32 BinData vector (3 KB), exact
+#   "int8"    - float32 vector plus an int8 scalar-quantized copy (768 B) for the
+#               coarse $vectorSearch pass, rescored exactly with the float32 copy
+STORAGE_FORMATS = ("array", "float32", "int8")
+
+_FLOAT32 = BinaryVectorDtype.FLOAT32.value
+_INT8 = BinaryVectorDtype.INT8.value
+_PADDING = b"\x00"
+
+Vector = Union[List[float], np.ndarray, Binary]
+
+
+def encode_float32(values: Vector) -> Binary:
+    """Packed little-endian float32 vector (BSON binary subtype 9), as Binary.from_vector writes it."""
+    data = np.asarray(values, dtype="<f4").tobytes()
+    return Binary(_FLOAT32 + _PADDING + data, VECTOR_SUBTYPE)
+
+
+def quantize_int8(values: Vector) -> np.ndarray:
+    """
+    Symmetric per-vector scalar quantization to [-127, 127].
+
+    The scale is dropped: cosine similarity ignores a vector's length, so
+    quantized vectors can be compared with each other directly.
+    """
+    vector = np.asarray(values, dtype=np.float32)
+    peak = float(np.max(np.abs(vector))) if vector.size else 0.0
+    if peak == 0.0:
+        return np.zeros(vector.shape, dtype=np.int8)
+    return np.rint(vector * (127.0 / peak)).astype(np.int8)
+
+
+def encode_int8(values: Vector) -> Binary:
+    return Binary(_INT8 + _PADDING + quantize_int8(values).tobytes(), VECTOR_SUBTYPE)
+
+
+def encode_vector(values: Vector, storage: str) -> Union[List[float], Binary]:
+    """The `embedding` field value for a storage format ("int8" stores float32 here)."""
+    if storage == "array":
+        return [float(v) for v in values]
+    if storage in ("float32", "int8"):
+        return encode_float32(values)
+    raise ValueError(f"Unknown embedding storage format: {storage}")
+
+
+def decode_vector(value: Vector) -> np.ndarray:
+    """Embedding field (array or BinData vector) as a numpy array; int8 stays int8."""
+    if isinstance(value, Binary) and value.subtype == VECTOR_SUBTYPE:
+        raw = bytes(value)
+        dtype = raw[:1]
+        if dtype == _FLOAT32:
+            return np.frombuffer(raw, dtype="<f4", offset=2)
+        if dtype == _INT8:
+            return np.frombuffer(raw, dtype=np.int8, offset=2)
+        raise ValueError(f"Unsupported vector dtype byte: {dtype!r}")
+    return np.asarray(value, dtype=np.float32)
@@ -1,76 +1,311 @@
-from pymongo import MongoClient
-from typing import List, Dict
+from abc import ABC, abstractmethod
+import asyncio
+import numpy as np
+from pymongo import DeleteMany, ReplaceOne
+from pymongo.errors import BulkWriteError
+from typing import List, Dict, Optional, Tuple
 from config import Config
+from services.embedding_backends import LEGACY_EMBEDDING_MODEL
+from services.recent_writes import RecentWritesBuffer, index_has_caught_up
+from services.vector_codec import STORAGE_FORMATS, encode_int8, encode_vector
 
-class MongoVectorStore:
 
-    def __init__(self):
-        self.client = MongoClient(Config.MONGODB_URI)
-        self.db = self.client.resume_analyzer
-        self.collection = self.db.resume_chunks
+def chunk_metadata(chunk: Dict) -> Dict:
+    """Metadata stored with each chunk; `span` locates it in the parsed resume text."""
+    metadata = {
+        "section": chunk["section"],
+        "chunk_id": chunk["chunk_id"],
+        "word_count": chunk["word_count"],
+    }
+    if chunk.get("span") is not None:
+        metadata["span"] = chunk["span"]
+    return metadata
+
+
+class VectorStore(ABC):
+    """
+    Interface shared by every chunk store backend.
+
+    `embedding_model` and `dimensions` name the embedding backend whose
+    vectors the store holds. When set, writes of any other length are
+    refused and chunks embedded by another backend are never searched.
+    """
+
+    embedding_model: Optional[str] = None
+    dimensions: Optional[int] = None
+
+    @abstractmethod
+    def add_chunks(self, resume_id: str, chunks: List[Dict], embeddings: List[List[float]]) -> int:
+        """Replace a resume's chunks and return how many were stored."""
+
+    def add_many(self, resumes: Dict[str, Tuple[List[Dict], List[List[float]]]]) -> Dict[str, int]:
+        """Replace the chunks of several resumes ({resume_id: (chunks, embeddings)}); stored count per resume."""
+        return {
+            resume_id: self.add_chunks(resume_id, chunks, embeddings)
+            for resume_id, (chunks, embeddings) in resumes.items()
+        }
+
+    @abstractmethod
+    def search(self, query_embedding: List[float], resume_id: str, top_k: int = 5) -> List[Dict]:
+        """Return the top_k chunks of one resume as {text, metadata, score} dicts."""
+
+    async def search_async(self, query_embedding: List[float], resume_id: str, top_k: int = 5) -> List[Dict]:
+        """`search` for the async server, run on the event loop's executor."""
+        return await asyncio.to_thread(self.search, query_embedding, resume_id, top_k)
+
+    @abstractmethod
+    def get_resume_chunks(self, resume_id: str) -> List[Dict]:
+        """Return a resume's chunks as {content, metadata} dicts."""
+
+    @abstractmethod
+    def delete_resume(self, resume_id: str) -> int:
+        """Delete a resume's chunks and return how many were removed."""
+
+    def get_embeddings(self, resume_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Chunks with raw embeddings for many resumes, grouped by resume_id."""
+        raise NotImplementedError(f"{type(self).__name__} does not expose raw embeddings")
+
+    def get_matrices(self, resume_ids: List[str]) -> Dict:
+        """Per-resume ResumeMatrix for every resume that has chunks."""
+        from services.numpy_store import ResumeMatrix
+
+        grouped = self.get_embeddings(resume_ids)
+        return {
+            resume_id: ResumeMatrix.from_documents(grouped[resume_id])
+            for resume_id in resume_ids
+            if grouped.get(resume_id)
+        }
+
+    def check_dimensions(self, resumes: Dict[str, Tuple[List[Dict], List[List[float]]]]):
+        """Raise ValueError if any embedding's length differs from the store's backend."""
+        if self.dimensions is None:
+            return
+        for resume_id, (_, embeddings) in resumes.items():
+            for embedding in embeddings:
+                if len(embedding) != self.dimensions:
+                    raise ValueError(
+                        f"Embedding for {resume_id} has {len(embedding)} dimensions, "
+                        f"store expects {self.dimensions} ({self.embedding_model})"
+                    )
+
+    def compatible(self, documents: List[Dict], resume_id: str) -> List[Dict]:
+        """Stored documents embedded by this store's backend; chunks without a model predate the field."""
+        if self.embedding_model is None:
+            return documents
+        kept = [
+            doc for doc in documents
+            if doc.get("embedding_model", LEGACY_EMBEDDING_MODEL) == self.embedding_model
+        ]
+        if len(kept) < len(documents):
+            print(f"[VectorStore] WARNING: skipping {len(documents) - len(kept)} chunks of {resume_id} "
+                  f"embedded by another model; re-upload the resume to re-embed it")
+        return kept
+
+    def close(self):
+        pass
+
+class MongoVectorStore(VectorStore):
+
+    def __init__(self, collection=None, storage: str = None, recent_writes: RecentWritesBuffer = None,
+                 embedding_model: str = None, dimensions: int = None):
+        """
+        Uses the process-wide client unless `collection` (e.g. an offline stand-in)
+        is given. `storage` is the embedding format, default Config.EMBEDDING_STORAGE.
+        With `recent_writes`, searches for just-written resumes are answered
+        locally until the Atlas index has caught up. `embedding_model` is
+        stored with every chunk.
+        """
+        if collection is None:
+            from services.mongo import get_database
+            collection = get_database().resume_chunks
+        self.collection = collection
+        self.storage = storage or Config.EMBEDDING_STORAGE
+        if self.storage not in STORAGE_FORMATS:
+            raise ValueError(f"Unknown EMBEDDING_STORAGE: {self.storage}")
+        self.recent_writes = recent_writes
+        self.embedding_model = embedding_model
+        self.dimensions = dimensions
+
+    def ensure_indexes(self):
+        """Regular index on resume_id for the per-resume find/delete queries."""
+        try:
+            self.collection.create_index("resume_id")
+        except Exception as e:
+            print(f"[VectorStore] WARNING: could not create resume_id index: {e}")
 
     def add_chunks(self, resume_id: str, chunks: List[Dict], embeddings: List[List[float]]):
-        documents = [
-            {
-                "resume_id": resume_id,
-                "content": chunk["text"],
-                "embedding": embedding,
-                "metadata": {
-                    "section": chunk["section"],
-                    "chunk_id": chunk["chunk_id"],
-                    "word_count": chunk["word_count"],
+        return self.add_many({resume_id: (chunks, embeddings)})[resume_id]
+
+    def add_many(self, resumes: Dict[str, Tuple[List[Dict], List[List[float]]]]) -> Dict[str, int]:
+        """
+        Write the chunks of every resume in one unordered bulk_write.
+
+        Each chunk is upserted under `_id` "<resume_id>:<chunk_id>", and a
+        DeleteMany per resume drops chunks the new version no longer has, so
+        readers never see a resume with zero chunks mid-update. Only resumes
+        whose writes all succeeded go into `recent_writes`.
+        """
+        self.check_dimensions(resumes)
+        operations = []
+        # (resume_id, is_chunk) per operation, to attribute write errors
+        owners = []
+        for resume_id, (chunks, embeddings) in resumes.items():
+            chunk_ids = []
+            for chunk, embedding in zip(chunks, embeddings):
+                chunk_id = f"{resume_id}:{chunk['chunk_id']}"
+                chunk_ids.append(chunk_id)
+                document = {
+                    "_id": chunk_id,
+                    "resume_id": resume_id,
+                    "content": chunk["text"],
+                    "embedding": encode_vector(embedding, self.storage),
+                    "metadata": chunk_metadata(chunk)
                 }
+                if self.embedding_model is not None:
+                    document["embedding_model"] = self.embedding_model
+                if self.storage == "int8":
+                    document["embedding_int8"] = encode_int8(embedding)
+                operations.append(ReplaceOne({"_id": chunk_id}, document, upsert=True))
+                owners.append((resume_id, True))
+            operations.append(DeleteMany({"resume_id": resume_id, "_id": {"$nin": chunk_ids}}))
+            owners.append((resume_id, False))
+
+        stored = {resume_id: len(chunks) for resume_id, (chunks, _) in resumes.items()}
+        if not operations:
+            return stored
+
+        failed = set()
+        try:
+            self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: everything else was applied, only the listed writes failed
+            for error in e.details.get("writeErrors", []):
+                owner, is_chunk = owners[error["index"]]
+                failed.add(owner)
+                if is_chunk:
+                    stored[owner] -= 1
+            print(f"[VectorStore] ERROR: {len(e.details.get('writeErrors', []))} chunk writes failed")
+
+        if self.recent_writes is not None:
+            from services.numpy_store import ResumeMatrix
+            for resume_id, (chunks, embeddings) in resumes.items():
+                # Never answer searches from chunks Mongo does not have
+                if chunks and resume_id not in failed:
+                    self.recent_writes.put(resume_id, ResumeMatrix(
+                        texts=[chunk["text"] for chunk in chunks],
+                        metadata=[chunk_metadata(chunk) for chunk in chunks],
+                        embeddings=embeddings
+                    ))
+                else:
+                    self.recent_writes.discard(resume_id)
+        return stored
+
+    def search(self, query_embedding: List[float], resume_id: str, top_k: int = 5) -> List[Dict]:
+        """
+        $vectorSearch restricted to one resume.
+
+        Atlas indexes new chunks a few seconds after they are written. Until
+        a probe search shows the index has a buffered resume's current chunks,
+        that resume is searched exactly in process. If the index returns
+        nothing for a resume written elsewhere (another worker), the chunks
+        are read from the collection, which is consistent right away.
+        """
+        write = self.recent_writes.get(resume_id) if self.recent_writes is not None else None
+        if write is not None and not self.recent_writes.should_probe(write):
+            return self._search_local(write.entry, query_embedding, top_k)
+
+        results = self._index_search(query_embedding, resume_id, top_k)
+
+        if write is not None:
+            if index_has_caught_up(results, write.entry.texts, top_k):
+                self.recent_writes.mark_consistent(resume_id, write)
+                return results
+            return self._search_local(write.entry, query_embedding, top_k)
+
+        if not results:
+            return self._search_collection(query_embedding, resume_id, top_k)
+        return results
+
+    def _search_local(self, entry, query_embedding: List[float], top_k: int) -> List[Dict]:
+        self.recent_writes.record_local_answer()
+        return _rank_exact(entry, query_embedding, top_k)
+
+    def _search_collection(self, query_embedding: List[float], resume_id: str, top_k: int) -> List[Dict]:
+        from services.numpy_store import ResumeMatrix
+
+        documents = self.get_resume_embeddings(resume_id)
+        if not documents:
+            return []
+        print(f"[VectorStore] Index has no chunks for {resume_id} yet, searching the collection")
+        return _rank_exact(ResumeMatrix.from_documents(documents), query_embedding, top_k)
+
+    def _index_search(self, query_embedding: List[float], resume_id: str, top_k: int) -> List[Dict]:
+        if self.storage == "int8":
+            return self._search_rescored(query_embedding, resume_id, top_k)
+
+        results = self._vector_search(Config.VECTOR_INDEX, "embedding", query_embedding, resume_id, top_k)
+        return [
+            {
+                "text": doc["content"],
+                "metadata": doc["metadata"],
+                "score": doc["score"]
             }
-            for chunk, embedding in zip(chunks, embeddings)
+            for doc in self.compatible(results, resume_id)
         ]
-        
-        self.collection.delete_many({"resume_id": resume_id})
 
-        result = self.collection.insert_many(documents)
-        return len(result.inserted_ids)
+    def _search_rescored(self, query_embedding: List[float], resume_id: str, top_k: int) -> List[Dict]:
+        """
+        Coarse $vectorSearch over the int8 copies for top_k * INT8_RESCORE_FACTOR
+        candidates, then exact cosine against their float32 embeddings.
+        """
+        from services.numpy_store import ResumeMatrix
+
+        candidates = self._vector_search(
+            Config.VECTOR_INDEX_INT8, "embedding_int8", encode_int8(query_embedding), resume_id,
+            limit=top_k * Config.INT8_RESCORE_FACTOR, include_embedding=True
+        )
+        candidates = self.compatible(candidates, resume_id)
+        if not candidates:
+            return []
+        return _rank_exact(ResumeMatrix.from_documents(candidates), query_embedding, top_k)
+
+    def _vector_search(self, index: str, path: str, query_vector, resume_id: str, limit: int,
+                       include_embedding: bool = False) -> List[Dict]:
+        projection = {
+            "content": 1,
+            "metadata": 1,
+            "embedding_model": 1,
+            "score": {
+                "$meta": "vectorSearchScore"
+            }
+        }
+        if include_embedding:
+            projection["embedding"] = 1
 
-    def search(self, query_embedding: List[float], resume_id: str, top_k: int = 5) -> List[Dict]:
-        """Vector search with MongoDB filter (requires 10s index sync wait)"""
         pipeline = [
             {
                 "$vectorSearch": {
-                    "index": "vector_index",
-                    "path": "embedding",
-                    "queryVector": query_embedding,
-                    "numCandidates": 100,
-                    "limit": top_k,
+                    "index": index,
+                    "path": path,
+                    "queryVector": query_vector,
+                    "numCandidates": max(100, limit * 10),
+                    "limit": limit,
                     "filter": {
                         "resume_id": resume_id
                     }
                 }
             },
             {
-                "$project": {
-                    "content": 1,
-                    "metadata": 1,
-                    "score": {
-                        "$meta": "vectorSearchScore"
-                    }
-                }
+                "$project": projection
             }
         ]
-        
+
         try:
-            results = list(self.collection.aggregate(pipeline))
-                
+            return list(self.collection.aggregate(pipeline))
         except Exception as e:
             print(f"[VectorStore] ERROR: {e}")
             return []
 
-        return [
-            {
-                "text": doc["content"],
-                "metadata": doc["metadata"],
-                "score": doc["score"]
-            }
-            for doc in results
-        ]
-
     def get_resume_chunks(self, resume_id: str) -> List[Dict]:
         chunks = list(self.collection.find(
             {"resume_id": resume_id},
@@ -79,9 +314,77 @@ class MongoVectorStore:
 
         return chunks
 
+    def get_resume_embeddings(self, resume_id: str) -> List[Dict]:
+        """Chunks of one resume including their raw embedding vectors."""
+        return self.compatible(list(self.collection.find(
+            {"resume_id": resume_id},
+            {"_id": 0, "content": 1, "metadata": 1, "embedding": 1, "embedding_model": 1}
+        )), resume_id)
+
+    def get_embeddings(self, resume_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch chunks for many resumes in a single $in query."""
+        grouped = {resume_id: [] for resume_id in resume_ids}
+        cursor = self.collection.find(
+            {"resume_id": {"$in": list(resume_ids)}},
+            {"_id": 0, "resume_id": 1, "content": 1, "metadata": 1, "embedding": 1, "embedding_model": 1}
+        )
+        for doc in cursor:
+            grouped[doc["resume_id"]].append(doc)
+        return {resume_id: self.compatible(documents, resume_id) for resume_id, documents in grouped.items()}
+
     def delete_resume(self, resume_id: str):
+        if self.recent_writes is not None:
+            self.recent_writes.discard(resume_id)
         result = self.collection.delete_many({"resume_id": resume_id})
         return result.deleted_count
 
     def close(self):
-        self.client.close()
\ No newline at end of file
+        # The client is shared by the whole process; see services.mongo.close_client
+        pass
+
+def _rank_exact(entry, query_embedding: List[float], top_k: int) -> List[Dict]:
+    """Exact top_k of a ResumeMatrix, scored like Atlas vectorSearchScore."""
+    from services.numpy_store import cosine_to_score, normalize_query
+
+    scores = cosine_to_score(entry.matrix @ normalize_query(query_embedding))
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    return [
+        {
+            "text": entry.texts[i],
+            "metadata": entry.metadata[i],
+            "score": float(scores[i])
+        }
+        for i in order
+    ]
+
+def create_vector_store(embedding_backend=None) -> VectorStore:
+    """
+    Build the store selected by Config.VECTOR_STORE_BACKEND, holding vectors
+    from `embedding_backend` (an EmbeddingBackend; None skips the checks).
+    """
+    backend = Config.VECTOR_STORE_BACKEND
+    embeddings = {}
+    if embedding_backend is not None:
+        embeddings = {"embedding_model": embedding_backend.name, "dimensions": embedding_backend.dimensions}
+
+    if backend == "atlas":
+        recent_writes = None
+        if Config.RECENT_WRITES_TTL > 0:
+            recent_writes = RecentWritesBuffer(
+                ttl=Config.RECENT_WRITES_TTL,
+                probe_interval=Config.RECENT_WRITES_PROBE_INTERVAL,
+                max_resumes=Config.RECENT_WRITES_MAX_RESUMES
+            )
+        store = MongoVectorStore(recent_writes=recent_writes, **embeddings)
+        store.ensure_indexes()
+        return store
+
+    from services.numpy_store import NumpyVectorStore
+    if backend == "numpy":
+        backing = MongoVectorStore(**embeddings)
+        backing.ensure_indexes()
+        return NumpyVectorStore(backing=backing, max_resumes=Config.NUMPY_STORE_MAX_RESUMES, **embeddings)
+    if backend == "memory":
+        return NumpyVectorStore(**embeddings)
+
+    raise ValueError(f"Unknown VECTOR_STORE_BACKEND: {backend}")
@@ -10,6 +10,9 @@ document.addEventListener('DOMContentLoaded', () => {
     const loadingOverlay = document.getElementById('loadingOverlay');
     const loadingText = document.getElementById('loadingText');
 
+    const JOB_POLL_INTERVAL_MS = 2000;
+    const JOB_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
     let selectedFile = null;
 
     // --- Drag and Drop Handlers ---
@@ -108,12 +111,21 @@ document.addEventListener('DOMContentLoaded', () => {
                 msgIndex++;
             }, 2500);
 
-            // Wait 10 seconds for vector index synchronization
-            await new Promise(resolve => setTimeout(resolve, 30000));
-            clearInterval(msgInterval);
-            
-            updateLoadingStatus('Finalizing AI-powered evaluation...');
-            
+            // The server answers from freshly written chunks, so no index-sync wait is needed
+            const analysisData = await requestAnalysis(resumeId)
+                .finally(() => clearInterval(msgInterval));
+            displayResults(analysisData.analysis);
+
+        } catch (error) {
+            console.error(error);
+            alert(`Error: ${error.message}`);
+            hideLoading();
+        }
+    });
+
+    // 202 means ingestion outlasted the server's wait: follow the job, then ask again
+    async function requestAnalysis(resumeId) {
+        while (true) {
             const analyzeResponse = await fetch('/api/analyze', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
@@ -122,21 +134,35 @@ document.addEventListener('DOMContentLoaded', () => {
                     job_description: jobDescription.value.trim()
                 })
             });
+            const data = await analyzeResponse.json();
 
+            if (analyzeResponse.status === 202) {
+                await waitForJob(data.job_id);
+                continue;
+            }
             if (!analyzeResponse.ok) {
-                const error = await analyzeResponse.json();
-                throw new Error(error.error || 'Analysis failed');
+                throw new Error(data.error || 'Analysis failed');
             }
+            return data;
+        }
+    }
 
-            const analysisData = await analyzeResponse.json();
-            displayResults(analysisData.analysis);
-
-        } catch (error) {
-            console.error(error);
-            alert(`Error: ${error.message}`);
-            hideLoading();
+    async function waitForJob(jobId) {
+        const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+        while (Date.now() < deadline) {
+            const jobResponse = await fetch(`/api/jobs/${jobId}`);
+            if (!jobResponse.ok) {
+                throw new Error('Lost track of the resume processing job');
+            }
+            const job = await jobResponse.json();
+            if (job.status === 'completed') return;
+            if (job.status === 'failed') {
+                throw new Error(job.error || 'Resume processing failed');
+            }
+            await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
         }
-    });
+        throw new Error('Resume is still being processed, please try again shortly');
+    }
 
     // --- Results Display ---
     function displayResults(data) {
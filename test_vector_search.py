@@ -1,14 +1,8 @@
-from pymongo import MongoClient
-from dotenv import load_dotenv
-import os
 from services.embedding_service import EmbeddingService
+from services.mongo import get_database
 
-load_dotenv()
-
-# Connect
-client = MongoClient(os.getenv('MONGODB_URI'))
-db = client.resume_analyzer
-collection = db.resume_chunks
+# Connect (same pooled client and settings as the app)
+collection = get_database().resume_chunks
 
 # Generate a test query embedding
 embedding_service = EmbeddingService()
@@ -16,7 +16,9 @@ def test_upload_resume():
     print(response.json())
     print(f"Status Code: {response.status_code}")
     
-    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    # Ingestion runs in the background; the upload is accepted immediately
+    assert response.status_code == 202, f"Expected 202, got {response.status_code}"
+    assert "job_id" in response.json()
     print("Test passed!")
 
 def test_no_file():
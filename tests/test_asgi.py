@@ -0,0 +1,97 @@
+import sys
+import os
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from flask import Flask, Response, request, stream_with_context
+from utils.asgi import BodyTooLarge, asgi_request, call_wsgi, read_body
+
+
+def make_flask_app():
+    flask_app = Flask(__name__)
+
+    @flask_app.route("/echo", methods=["POST"])
+    def echo():
+        return {"json": request.get_json(), "query": request.args.get("q"), "header": request.headers.get("X-Test")}
+
+    @flask_app.route("/stream")
+    def stream():
+        def generate():
+            # Needs the request context on every step
+            for i in range(3):
+                yield f"{request.path}:{i}\n"
+        return Response(stream_with_context(generate()), mimetype="text/plain")
+
+    return flask_app
+
+
+def bridged(flask_app):
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    async def asgi_app(scope, receive, send):
+        body = await read_body(receive, max_bytes=1024)
+        await call_wsgi(flask_app, scope, body, send, executor)
+
+    return asgi_app
+
+
+def test_wsgi_bridge_passes_body_query_and_headers():
+    asgi_app = bridged(make_flask_app())
+    status, headers, body = asyncio.run(asgi_request(
+        asgi_app, "POST", "/echo", json.dumps({"a": 1}).encode(),
+        headers=[("Content-Type", "application/json"), ("X-Test", "yes")], query_string="q=python"
+    ))
+
+    assert status == 200
+    assert headers["content-type"] == "application/json"
+    assert json.loads(body) == {"json": {"a": 1}, "query": "python", "header": "yes"}
+
+
+def test_wsgi_bridge_streams_with_request_context():
+    status, _, body = asyncio.run(asgi_request(bridged(make_flask_app()), "GET", "/stream"))
+    assert status == 200
+    assert body.decode() == "/stream:0\n/stream:1\n/stream:2\n"
+
+
+def test_read_body_enforces_limit():
+    async def receive_chunks():
+        chunks = [{"type": "http.request", "body": b"x" * 600, "more_body": True},
+                  {"type": "http.request", "body": b"x" * 600, "more_body": False}]
+
+        async def receive():
+            return chunks.pop(0)
+
+        return await read_body(receive, max_bytes=1000)
+
+    try:
+        asyncio.run(receive_chunks())
+    except BodyTooLarge:
+        pass
+    else:
+        raise AssertionError("Expected BodyTooLarge")
+
+
+def test_async_routes_answer_like_the_flask_routes():
+    from tests.test_dedup import import_app
+    app_module = import_app()
+    import asgi
+
+    client = app_module.app.test_client()
+    bodies = [b"", b"not json", json.dumps({"resume_id": "r1"}).encode()]
+    for body in bodies:
+        flask_response = client.post("/api/analyze", data=body, content_type="application/json")
+        status, _, async_body = asyncio.run(asgi_request(
+            asgi.app, "POST", "/api/analyze", body, headers=[("Content-Type", "application/json")]
+        ))
+        assert status == flask_response.status_code == 400
+        assert json.loads(async_body) == flask_response.get_json()
+
+
+if __name__ == "__main__":
+    test_wsgi_bridge_passes_body_query_and_headers()
+    test_wsgi_bridge_streams_with_request_context()
+    test_read_body_enforces_limit()
+    test_async_routes_answer_like_the_flask_routes()
+    print("All ASGI tests passed!")
@@ -2,7 +2,9 @@ import sys
 import os
 # Add parent directory to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import io
 from services.chunker import ResumeChunker
+from services.document_parser import DocumentParser
 # Sample resume text for testing
 SAMPLE_RESUME = """
 John Doe
@@ -62,5 +64,101 @@ def test_chunk_detection():
     print("All chunking tests passed!")
     
     return chunks
+def test_sections_survive_whitespace_cleaning():
+    """Parsed documents arrive as one line; headers are still found by case."""
+    flat = " ".join(SAMPLE_RESUME.split())
+    sections = ResumeChunker()._detect_sections(flat)
+
+    assert list(sections) == ["Header", "Summary", "Experience", "Education", "Skills", "Projects", "Certifications"]
+    assert sections["Summary"].startswith("Experienced software engineer")
+    assert sections["Experience"].startswith("Senior Software Engineer")
+    assert sections["Certifications"].endswith("Data Engineer")
+
+
+def test_mid_sentence_keywords_are_not_headers():
+    text = ("Jane Roe, backend developer. EXPERIENCE Five years of experience building "
+            "education platforms and skills assessments at Acme. "
+            "SKILLS Python, Flask, MongoDB, Docker and Kubernetes")
+    sections = ResumeChunker()._detect_sections(text)
+
+    assert set(sections) == {"Header", "Experience", "Skills"}
+    assert "education platforms" in sections["Experience"]
+
+
+def test_header_styles_can_be_mixed_in_parsed_text():
+    """One colon-style header must not hide the Title Case ones of the same resume."""
+    resume = """Jane Roe
+Backend Developer, Berlin
+Summary
+Backend developer who led the Education team tooling and Skills assessments at Acme.
+Experience
+Senior Engineer at Acme (2020-2024)
+- Built billing services in Python and Flask
+Education
+BSc Computer Science, TU Berlin
+Technical Skills:
+Python, Flask, PostgreSQL, Docker
+"""
+    text = DocumentParser().parse(io.BytesIO(resume.encode()), "txt")
+    chunks = ResumeChunker().chunk_by_sections(text)
+
+    assert [c["section"] for c in chunks] == ["Header", "Summary", "Experience", "Education", "Skills"]
+    assert "led the Education team" in chunks[1]["text"]
+    assert chunks[4]["text"] == "Python, Flask, PostgreSQL, Docker"
+
+
+def test_capitalised_mentions_do_not_split_sections():
+    text = """Jane Roe
+EXPERIENCE
+Training Manager at Acme (2019-2024), led delivery of Skills Training Program for 40 staff.
+Sat on the Education Committee and ran Projects Week.
+EDUCATION
+BSc Psychology, University of Leeds
+"""
+    sections = ResumeChunker()._detect_sections(text)
+
+    assert list(sections) == ["Header", "Experience", "Education"]
+    assert "Skills Training Program for 40 staff" in sections["Experience"]
+    assert sections["Experience"].endswith("ran Projects Week.")
+    # Short content is kept, not dropped
+    assert sections["Header"] == "Jane Roe"
+    assert sections["Education"] == "BSc Psychology, University of Leeds"
+
+
+def test_short_section_is_folded_into_the_previous_one():
+    flat = "Jane Roe, Berlin. SKILLS Python, Flask, PostgreSQL and Docker AWARDS Hackathon 2nd"
+    chunks = ResumeChunker().chunk_by_sections(flat)
+
+    assert [c["section"] for c in chunks] == ["Header", "Skills"]
+    assert chunks[1]["text"].endswith("Docker AWARDS Hackathon 2nd")
+    # Title Case headers followed by a date or bullet count even without line breaks
+    text = "Jane Roe, Berlin Experience 2019 - 2024 Backend Engineer at Acme Skills - Python, Flask, Docker, AWS"
+    assert list(ResumeChunker()._detect_sections(text)) == ["Header", "Experience", "Skills"]
+
+
+def test_spans_point_back_into_source():
+    flat = " ".join(SAMPLE_RESUME.split())
+    long_text = flat.replace("SKILLS", "SKILLS " + "Python " * 250)
+    chunker = ResumeChunker(chunk_size=100, overlap=20)
+
+    chunks = chunker.chunk_by_sections(long_text)
+    skills = [c for c in chunks if c["section"] == "Skills"]
+
+    assert len(skills) > 1
+    assert [c["chunk_id"] for c in skills] == [f"Skills_{i}" for i in range(len(skills))]
+    for chunk in chunks:
+        span = chunk["span"]
+        assert long_text[span["start"]:span["end"]] == chunk["text"]
+        assert span["word_end"] - span["word_start"] == chunk["word_count"] == len(chunk["text"].split())
+    # Consecutive windows overlap by `overlap` words
+    assert skills[1]["span"]["word_start"] == skills[0]["span"]["word_end"] - 20
+
+
 if __name__ == "__main__":
     test_chunk_detection()
+    test_sections_survive_whitespace_cleaning()
+    test_mid_sentence_keywords_are_not_headers()
+    test_header_styles_can_be_mixed_in_parsed_text()
+    test_capitalised_mentions_do_not_split_sections()
+    test_short_section_is_folded_into_the_previous_one()
+    test_spans_point_back_into_source()
@@ -0,0 +1,67 @@
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.chunker import ResumeChunker
+from services.context_packer import ContextPacker, estimate_tokens, render_chunks
+from services.vector_store import chunk_metadata
+from tests.test_chunker import SAMPLE_RESUME
+
+
+def retrieved_chunks(chunk_size=12, overlap=4):
+    """Chunks shaped like vector search results, best score first."""
+    text = " ".join(SAMPLE_RESUME.split())
+    chunks = ResumeChunker(chunk_size=chunk_size, overlap=overlap).chunk_by_sections(text)
+    results = [
+        {"text": chunk["text"], "metadata": chunk_metadata(chunk), "score": 1.0 - i * 0.01}
+        for i, chunk in enumerate(chunks)
+    ]
+    return text, results
+
+
+def test_overlapping_windows_are_sent_once():
+    text, chunks = retrieved_chunks()
+    context = ContextPacker(token_budget=0, min_words=1).pack(chunks)
+
+    words = []
+    for chunk in context.chunks:
+        span = chunk["metadata"]["span"]
+        assert text[span["start"]:span["end"]] == chunk["text"]
+        words.extend(range(span["word_start"], span["word_end"]))
+    # Every retrieved word exactly once
+    retrieved = set()
+    for chunk in chunks:
+        span = chunk["metadata"]["span"]
+        retrieved.update(range(span["word_start"], span["word_end"]))
+    assert sorted(words) == sorted(retrieved)
+    assert context.trimmed > 0
+    assert context.tokens_saved > 0
+    assert context.tokens_out == estimate_tokens(render_chunks(context.chunks))
+
+
+def test_budget_caps_prompt_and_keeps_best_chunks():
+    _, chunks = retrieved_chunks()
+    context = ContextPacker(token_budget=60, min_words=3).pack(chunks)
+
+    assert context.tokens_out <= 60
+    assert context.dropped > 0
+    # The best-scoring chunk always makes it in, grouped with its section
+    assert context.chunks[0]["metadata"]["chunk_id"] == chunks[0]["metadata"]["chunk_id"]
+
+
+def test_chunks_without_spans_are_deduplicated_on_text():
+    chunks = [
+        {"text": "Built RESTful APIs using Flask", "metadata": {"section": "experience"}, "score": 0.9},
+        {"text": "Built RESTful APIs using Flask", "metadata": {"section": "experience"}, "score": 0.8},
+        {"text": "Python, SQL, Docker", "metadata": {"section": "skills"}, "score": 0.95},
+    ]
+    context = ContextPacker(token_budget=0).pack(chunks)
+    assert [c["metadata"]["section"] for c in context.chunks] == ["skills", "experience"]
+    assert context.dropped == 1
+
+
+if __name__ == "__main__":
+    test_overlapping_windows_are_sent_once()
+    test_budget_caps_prompt_and_keeps_best_chunks()
+    test_chunks_without_spans_are_deduplicated_on_text()
+    print("All context packer tests passed!")
@@ -0,0 +1,180 @@
+import sys
+import os
+import io
+import tempfile
+import threading
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.chunker import ResumeChunker
+from services.dedup import ResumeRegistry, file_fingerprint, text_fingerprint
+from services.document_parser import DocumentParser
+from services.ingestion import IngestionQueue, ResumeIngestor, InMemoryJobStore, COMPLETED, FAILED
+from services.embedding_backends import HashingBackend
+from services.numpy_store import NumpyVectorStore
+from services.vector_store import MongoVectorStore
+from benchmarks.fakes import FakeCollection
+from tests.test_chunker import SAMPLE_RESUME
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = 0
+
+    def embed_batch(self, texts):
+        self.calls += 1
+        return [[1.0, 0.0] for _ in texts]
+
+
+def test_first_claim_wins():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ResumeRegistry(os.path.join(tmp, "resumes.sqlite3"))
+        digest = file_fingerprint(b"%PDF-1.4 resume bytes")
+
+        assert registry.claim_file(digest, "first") == "first"
+        assert registry.claim_file(digest, "second") == "first"
+        assert registry.stats()["file_hits"] == 1
+
+        registry.forget("first")
+        assert registry.claim_file(digest, "third") == "third"
+
+
+def test_text_fingerprint_ignores_whitespace_and_case():
+    assert text_fingerprint("John Doe\n\nPython  Developer") == text_fingerprint("john doe python developer")
+
+
+def test_duplicate_text_is_aliased_without_embedding():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ResumeRegistry(os.path.join(tmp, "resumes.sqlite3"))
+        embedder = CountingEmbedder()
+        vector_store = NumpyVectorStore()
+        ingestor = ResumeIngestor(DocumentParser(), ResumeChunker(), embedder, vector_store, registry=registry)
+        queue = IngestionQueue(ingestor, store=InMemoryJobStore(), max_workers=1)
+
+        queue.submit("original", "a.txt", "txt", SAMPLE_RESUME.encode())
+        queue.wait_for_resume("original", timeout=10)
+        queue.submit("copy", "b.txt", "txt", SAMPLE_RESUME.upper().encode())
+        job = queue.wait_for_resume("copy", timeout=10)
+
+        assert job["status"] == COMPLETED
+        assert job["result"]["deduplicated"] is True
+        assert job["result"]["duplicate_of"] == "original"
+        assert registry.resolve("copy") == "original"
+        assert embedder.calls == 1
+        assert vector_store.get_resume_chunks("copy") == []
+
+
+class FailFirstEmbedder:
+    """Holds the first batch until released, then fails it; later batches succeed."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def embed_batch(self, texts):
+        self.calls += 1
+        if self.calls == 1:
+            self.started.set()
+            self.release.wait(10)
+            raise RuntimeError("embedding quota exhausted")
+        return [[1.0, 0.0] for _ in texts]
+
+
+def test_duplicate_of_a_failing_upload_is_ingested_on_its_own():
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ResumeRegistry(os.path.join(tmp, "resumes.sqlite3"))
+        embedder = FailFirstEmbedder()
+        vector_store = NumpyVectorStore()
+        ingestor = ResumeIngestor(DocumentParser(), ResumeChunker(), embedder, vector_store, registry=registry)
+        queue = IngestionQueue(ingestor, store=InMemoryJobStore(), max_workers=2)
+
+        queue.submit("original", "a.txt", "txt", SAMPLE_RESUME.encode())
+        assert embedder.started.wait(10)
+        # Same text arrives while the first upload is still embedding
+        queue.submit("copy", "b.txt", "txt", SAMPLE_RESUME.upper().encode())
+        copy = queue.wait_for_resume("copy", timeout=10)
+        embedder.release.set()
+
+        assert queue.wait_for_resume("original", timeout=10)["status"] == FAILED
+        assert copy["status"] == COMPLETED and copy["result"]["deduplicated"] is False
+        assert registry.resolve("copy") == "copy"
+        assert vector_store.get_resume_chunks("copy")
+
+
+class BackendEmbedder:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def embed_batch(self, texts):
+        return self.backend.embed(texts, "retrieval_document")
+
+
+def test_reupload_after_switching_embedding_backend_is_embedded_again():
+    with tempfile.TemporaryDirectory() as tmp:
+        collection = FakeCollection(latency=0)
+        data = SAMPLE_RESUME.encode()
+
+        def upload(resume_id, backend):
+            # What /api/upload-resume does, with the registry and store a deployment builds for `backend`
+            registry = ResumeRegistry(os.path.join(tmp, "resumes.sqlite3"), embedding_model=backend.name)
+            vector_store = MongoVectorStore(collection=collection, embedding_model=backend.name,
+                                            dimensions=backend.dimensions)
+            owner = registry.claim_file(file_fingerprint(data), resume_id)
+            if owner == resume_id:
+                ingestor = ResumeIngestor(DocumentParser(), ResumeChunker(), BackendEmbedder(backend),
+                                          vector_store, registry=registry)
+                queue = IngestionQueue(ingestor, store=InMemoryJobStore(), max_workers=1)
+                queue.submit(resume_id, "cv.txt", "txt", data)
+                assert queue.wait_for_resume(resume_id, timeout=10)["status"] == COMPLETED
+            return owner, vector_store
+
+        assert upload("before", HashingBackend(dimensions=64))[0] == "before"
+        assert upload("again", HashingBackend(dimensions=64))[0] == "before"
+
+        owner, vector_store = upload("after", HashingBackend(dimensions=128))
+        assert owner == "after"
+        assert vector_store.get_resume_embeddings("before") == []
+        assert vector_store.get_resume_embeddings("after")
+
+
+class BrokenQueue:
+    def submit(self, resume_id, filename, file_type, data):
+        raise RuntimeError("database is locked")
+
+
+def import_app():
+    # app validates the config on import; nothing here reaches Gemini or Mongo
+    from config import Config
+    saved = Config.GEMINI_API_KEY, Config.MONGODB_URI
+    Config.GEMINI_API_KEY = saved[0] or "test"
+    Config.MONGODB_URI = saved[1] or "mongodb://localhost"
+    try:
+        import app
+    finally:
+        Config.GEMINI_API_KEY, Config.MONGODB_URI = saved
+    return app
+
+
+def test_failed_enqueue_releases_the_file_claim():
+    app_module = import_app()
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ResumeRegistry(os.path.join(tmp, "resumes.sqlite3"))
+        app_module.components.set("resume_registry", registry)
+        app_module.components.set("ingestion_queue", BrokenQueue())
+        client = app_module.app.test_client()
+
+        response = client.post("/api/upload-resume", data={"file": (io.BytesIO(SAMPLE_RESUME.encode()), "cv.txt")})
+        assert response.status_code == 500
+        # The next upload of the same bytes is treated as new, not as a duplicate of the failed one
+        digest = file_fingerprint(SAMPLE_RESUME.encode())
+        assert registry.claim_file(digest, "retry") == "retry"
+
+
+if __name__ == "__main__":
+    test_first_claim_wins()
+    test_text_fingerprint_ignores_whitespace_and_case()
+    test_duplicate_text_is_aliased_without_embedding()
+    test_duplicate_of_a_failing_upload_is_ingested_on_its_own()
+    test_reupload_after_switching_embedding_backend_is_embedded_again()
+    test_failed_enqueue_releases_the_file_claim()
+    print("All dedup tests passed!")
@@ -0,0 +1,70 @@
+import sys
+import os
+import io
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from docx import Document
+from benchmarks.corpus import make_pdf
+from services.document_parser import DocumentParser, FileTooLarge, read_limited
+
+
+def test_parse_txt_from_memory():
+    parser = DocumentParser()
+    text = parser.parse(io.BytesIO("John Doe \n\n Python   Developer".encode()), "txt")
+    assert text == "John Doe\nPython Developer"
+
+
+def test_parse_docx_from_memory():
+    doc = Document()
+    doc.add_paragraph("EXPERIENCE")
+    doc.add_paragraph("Built Flask APIs")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+
+    assert DocumentParser().parse(buffer, "docx") == "EXPERIENCE\nBuilt Flask APIs"
+
+
+def test_parse_rejects_unreadable_pdf():
+    try:
+        DocumentParser().parse(io.BytesIO(b"not a pdf"), "pdf")
+    except ValueError as e:
+        assert "PDF" in str(e)
+    else:
+        raise AssertionError("Expected ValueError for an invalid PDF")
+
+
+def test_parallel_pdf_matches_sequential_and_caps_pages():
+    data = make_pdf(6, seed=1, lines_per_page=10)
+    sequential = DocumentParser(max_pages=0, workers=1).parse(io.BytesIO(data), "pdf")
+    parallel = DocumentParser(max_pages=0, workers=2, parallel_min_pages=2).parse(io.BytesIO(data), "pdf")
+    assert sequential and parallel == sequential
+
+    pages = list(DocumentParser(max_pages=0).iter_pages(io.BytesIO(data), "pdf"))
+    assert len(pages) == 6
+    assert "\n".join(pages) == sequential
+
+    capped = DocumentParser(max_pages=2, workers=1).parse(io.BytesIO(data), "pdf")
+    assert capped == "\n".join(pages[:2])
+
+
+def test_read_limited_stops_past_limit():
+    assert read_limited(io.BytesIO(b"x" * 100), max_bytes=100, chunk_size=30) == b"x" * 100
+
+    stream = io.BytesIO(b"x" * 1000)
+    try:
+        read_limited(stream, max_bytes=100, chunk_size=30)
+    except FileTooLarge:
+        # Reading stopped at the first chunk past the limit
+        assert stream.tell() == 120
+    else:
+        raise AssertionError("Expected FileTooLarge")
+
+
+if __name__ == "__main__":
+    test_parse_txt_from_memory()
+    test_parse_docx_from_memory()
+    test_parse_rejects_unreadable_pdf()
+    test_parallel_pdf_matches_sequential_and_caps_pages()
+    test_read_limited_stops_past_limit()
+    print("All document parser tests passed!")
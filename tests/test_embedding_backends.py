@@ -0,0 +1,81 @@
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import numpy as np
+from benchmarks.fakes import FakeCollection
+from services.embedding_backends import GeminiBackend, HashingBackend
+from services.embedding_cache import EmbeddingCache
+from services.embedding_service import EmbeddingService
+from services.numpy_store import NumpyVectorStore
+from services.rate_limit import InMemoryBucketStore, RateLimiter
+from services.vector_store import MongoVectorStore
+from tests.test_vector_store import CHUNKS, EMBEDDINGS
+
+
+def test_hashing_backend_is_deterministic_and_batched():
+    backend = HashingBackend(dimensions=256)
+    texts = [
+        "Senior Python developer: Flask, Django and PostgreSQL",
+        "Unity game development in C# and C++",
+        "",
+    ]
+
+    matrix = np.asarray(backend.embed(texts, "retrieval_document"))
+    assert matrix.shape == (3, 256)
+    assert np.allclose(np.linalg.norm(matrix[:2], axis=1), 1.0)
+    assert not matrix[2].any()
+    # One batch gives the same vectors as one call per text, in any process
+    assert np.allclose(matrix[1], HashingBackend(dimensions=256).embed_one(texts[1], "retrieval_query"))
+
+    query = np.asarray(backend.embed_one("python backend developer, postgres", "retrieval_query"))
+    assert query @ matrix[0] > query @ matrix[1]
+
+
+def test_service_uses_local_backend_without_rate_limit():
+    # An exhausted limiter would refuse any remote call
+    limiter = RateLimiter(InMemoryBucketStore(), {"embedding": (1, 0)}, max_wait=0.01)
+    limiter.acquire("embedding")
+    service = EmbeddingService(cache=EmbeddingCache(), query_cache=EmbeddingCache(),
+                               rate_limiter=limiter, backend=HashingBackend(dimensions=64))
+
+    vectors = service.embed_batch([chunk["text"] for chunk in CHUNKS])
+    assert len(vectors) == 3 and all(len(vector) == 64 for vector in vectors)
+    assert len(service.embed_query("Python developer")) == service.get_dimensions() == 64
+
+    gemini = EmbeddingService(cache=EmbeddingCache(), query_cache=EmbeddingCache(), backend=GeminiBackend())
+    assert gemini._get_cache_key("x", "retrieval_query") != service._get_cache_key("x", "retrieval_query")
+
+
+def test_stores_never_mix_embedding_models():
+    store = NumpyVectorStore(embedding_model="hashing-v1-4", dimensions=4)
+    try:
+        store.add_chunks("r1", CHUNKS, EMBEDDINGS)
+    except ValueError as e:
+        assert "expects 4" in str(e)
+    else:
+        raise AssertionError("Expected ValueError")
+
+    collection = FakeCollection(latency=0)
+    MongoVectorStore(collection=collection, embedding_model="hashing-v1-3", dimensions=3).add_chunks(
+        "r1", CHUNKS, EMBEDDINGS
+    )
+    assert {doc["embedding_model"] for doc in collection.documents} == {"hashing-v1-3"}
+
+    same = MongoVectorStore(collection=collection, embedding_model="hashing-v1-3", dimensions=3)
+    assert same.search([1.0, 0.0, 0.0], "r1", top_k=1)[0]["text"] == CHUNKS[0]["text"]
+
+    # A store configured for another backend skips those chunks, even when the lengths agree
+    other = NumpyVectorStore(
+        backing=MongoVectorStore(collection=collection, embedding_model="other-3", dimensions=3),
+        embedding_model="other-3", dimensions=3
+    )
+    assert other.search([1.0, 0.0, 0.0], "r1") == []
+    assert other.get_matrices(["r1"]) == {}
+
+
+if __name__ == "__main__":
+    test_hashing_backend_is_deterministic_and_batched()
+    test_service_uses_local_backend_without_rate_limit()
+    test_stores_never_mix_embedding_models()
+    print("All embedding backend tests passed!")
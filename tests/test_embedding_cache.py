@@ -0,0 +1,106 @@
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.embedding_cache import LRUCache, SQLiteEmbeddingStore, EmbeddingCache
+from services.embedding_service import EmbeddingService
+
+
+def test_lru_evicts_by_item_count():
+    """Oldest entries are evicted once max_items is exceeded"""
+    cache = LRUCache(max_items=2, max_bytes=1024 * 1024)
+    cache.put("a", [1.0, 2.0])
+    cache.put("b", [3.0, 4.0])
+    cache.get("a")  # "a" becomes most recently used
+    cache.put("c", [5.0, 6.0])
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_evicts_by_bytes():
+    """Byte cap is enforced on packed float32 size"""
+    cache = LRUCache(max_items=100, max_bytes=4 * 8)  # room for two 4-dim vectors
+    for key in ("a", "b", "c"):
+        cache.put(key, [0.5] * 4)
+
+    stats = cache.stats()
+    assert stats["items"] == 2
+    assert stats["bytes"] == 32
+    assert stats["evictions"] == 1
+
+
+def test_lru_hit_and_miss_counters():
+    cache = LRUCache()
+    cache.put("a", [0.25, 0.5])
+    assert cache.get("a") == [0.25, 0.5]
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_disk_store_survives_restart():
+    """A fresh cache backed by the same file sees previously stored vectors"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embeddings.sqlite3")
+
+        first = EmbeddingCache(memory=LRUCache(), disk=SQLiteEmbeddingStore(path))
+        first.put("key", [0.5, -1.0, 2.0])
+
+        second = EmbeddingCache(memory=LRUCache(), disk=SQLiteEmbeddingStore(path))
+        assert second.get("key") == [0.5, -1.0, 2.0]
+        # Promoted into memory after the disk hit
+        assert "key" in second.memory
+        assert second.stats()["disk"]["hits"] == 1
+
+
+def test_disk_store_evicts_least_recently_read():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "embeddings.sqlite3")
+        # A store written before accessed_at existed is migrated in place
+        old = sqlite3.connect(path)
+        old.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, dims INTEGER NOT NULL, "
+                    "vector BLOB NOT NULL, created_at REAL NOT NULL)")
+        old.commit()
+        old.close()
+
+        store = SQLiteEmbeddingStore(path, max_rows=2)
+        store.EVICT_EVERY = 1
+        store.put("a", [1.0])
+        time.sleep(0.01)
+        store.put("b", [2.0])
+        time.sleep(0.01)
+        assert store.get("a") == [1.0]
+        time.sleep(0.01)
+        store.put("c", [3.0])
+
+        assert store.get("b") is None
+        assert store.get("a") == [1.0] and store.get("c") == [3.0]
+        assert len(store) == 2 and store.stats()["evictions"] == 1
+
+
+def test_cache_key_includes_model_and_task_type():
+    service = EmbeddingService(cache=EmbeddingCache())
+    doc_key = service._get_cache_key("Python developer", "retrieval_document")
+    query_key = service._get_cache_key("Python developer", "retrieval_query")
+    assert doc_key != query_key
+
+    service.model_name = "models/other-model"
+    assert service._get_cache_key("Python developer", "retrieval_document") != doc_key
+
+
+if __name__ == "__main__":
+    test_lru_evicts_by_item_count()
+    test_lru_evicts_by_bytes()
+    test_lru_hit_and_miss_counters()
+    test_disk_store_survives_restart()
+    test_disk_store_evicts_least_recently_read()
+    test_cache_key_includes_model_and_task_type()
+    print("All embedding cache tests passed!")
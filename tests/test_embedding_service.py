@@ -0,0 +1,79 @@
+import sys
+import os
+import threading
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.embedding_cache import EmbeddingCache
+from services.embedding_service import EmbeddingService
+from services.gemini import get_genai
+
+
+class RecordingEmbeddingService(EmbeddingService):
+    """EmbeddingService whose API call returns [len(text)] and records each batch"""
+
+    def __init__(self):
+        super().__init__(cache=EmbeddingCache())
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def _request_embeddings(self, texts, task_type):
+        with self._lock:
+            self.batches.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+def test_embed_batch_preserves_order_across_batches():
+    service = RecordingEmbeddingService()
+    service.batch_size = 3
+    texts = ["a" * n for n in range(1, 11)]
+
+    embeddings = service.embed_batch(texts)
+
+    assert embeddings == [[float(n)] for n in range(1, 11)]
+    assert len(service.batches) == 4
+    assert all(len(batch) <= 3 for batch in service.batches)
+
+
+def test_embed_batch_only_sends_cache_misses():
+    service = RecordingEmbeddingService()
+    service.embed_batch(["one", "two"])
+    service.batches.clear()
+
+    embeddings = service.embed_batch(["one", "three", "two", "three"])
+
+    assert embeddings == [[3.0], [5.0], [3.0], [5.0]]
+    # Cached texts are skipped and the duplicate miss is sent once
+    assert service.batches == [["three"]]
+
+
+def test_embed_query_shares_entry_for_near_identical_jds():
+    calls = []
+
+    def fake_embed_content(model, content, task_type=None, **kwargs):
+        calls.append((content, task_type))
+        return {"embedding": [0.1, 0.2]}
+
+    genai = get_genai()
+    original = genai.embed_content
+    genai.embed_content = fake_embed_content
+    try:
+        service = EmbeddingService(cache=EmbeddingCache(), query_cache=EmbeddingCache())
+        service.embed_query("Senior Python Developer\n\nFlask,  MongoDB")
+        service.embed_query("  senior python developer flask, mongodb ")
+    finally:
+        genai.embed_content = original
+
+    assert calls == [("Senior Python Developer\n\nFlask,  MongoDB", "retrieval_query")]
+
+    stats = service.get_cache_stats()
+    assert stats["queries"]["hits"] == 1
+    assert stats["queries"]["misses"] == 1
+    # Document cache is untouched by query lookups
+    assert stats["documents"]["hits"] == 0 and stats["documents"]["misses"] == 0
+
+
+if __name__ == "__main__":
+    test_embed_batch_preserves_order_across_batches()
+    test_embed_batch_only_sends_cache_misses()
+    test_embed_query_shares_entry_for_near_identical_jds()
+    print("All embedding service tests passed!")
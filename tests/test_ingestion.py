@@ -0,0 +1,131 @@
+import sys
+import os
+import asyncio
+import subprocess
+import tempfile
+import time
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.chunker import ResumeChunker
+from services.dedup import ResumeRegistry, file_fingerprint
+from services.document_parser import DocumentParser
+from services.ingestion import (
+    IngestionQueue, ResumeIngestor, SQLiteJobStore, InMemoryJobStore, STAGES, COMPLETED, FAILED,
+    PROCESSING, new_job
+)
+from services.numpy_store import NumpyVectorStore
+from tests.test_chunker import SAMPLE_RESUME
+
+
+class ConstantEmbedder:
+    def embed_batch(self, texts):
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+
+def make_queue(store):
+    vector_store = NumpyVectorStore()
+    ingestor = ResumeIngestor(DocumentParser(), ResumeChunker(), ConstantEmbedder(), vector_store)
+    return IngestionQueue(ingestor, store=store, max_workers=1), vector_store
+
+
+def test_job_reports_every_stage():
+    queue, vector_store = make_queue(InMemoryJobStore())
+
+    job = queue.submit("resume-1", "cv.txt", "txt", SAMPLE_RESUME.encode())
+    assert job["status"] == "queued"
+
+    finished = queue.wait_for_resume("resume-1", timeout=10)
+
+    assert finished["status"] == COMPLETED
+    assert all(finished["stages"][stage] for stage in STAGES)
+    assert finished["result"]["chunks_stored"] == len(vector_store.get_resume_chunks("resume-1"))
+
+
+def test_failed_job_records_error():
+    queue, _ = make_queue(InMemoryJobStore())
+
+    queue.submit("resume-2", "short.txt", "txt", b"Too short")
+    finished = queue.wait_for_resume("resume-2", timeout=10)
+
+    assert finished["status"] == FAILED
+    assert finished["error"] == "Could not extract text from file"
+    assert finished["stages"]["parsed"] is None
+
+
+def test_unreadable_file_fails_job():
+    queue, _ = make_queue(InMemoryJobStore())
+
+    queue.submit("resume-4", "cv.pdf", "pdf", b"not really a pdf")
+    finished = queue.wait_for_resume("resume-4", timeout=10)
+
+    assert finished["status"] == FAILED
+    assert finished["error"] == "Invalid file"
+
+
+def test_sqlite_job_store_is_shared():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "jobs.sqlite3")
+        queue, _ = make_queue(SQLiteJobStore(db_path))
+
+        job = queue.submit("resume-3", "cv.txt", "txt", SAMPLE_RESUME.encode())
+        queue.wait_for_resume("resume-3", timeout=10)
+
+        # A second store on the same file (another worker) sees the finished job
+        other = SQLiteJobStore(db_path)
+        assert other.get(job["job_id"])["status"] == COMPLETED
+        assert other.get_by_resume("resume-3")["job_id"] == job["job_id"]
+
+
+def test_wait_for_unknown_resume_returns_none():
+    queue, _ = make_queue(InMemoryJobStore())
+    assert queue.wait_for_resume("never-uploaded", timeout=0.1) is None
+
+
+def test_async_wait_returns_finished_job():
+    queue, _ = make_queue(InMemoryJobStore())
+    queue.submit("resume-5", "cv.txt", "txt", SAMPLE_RESUME.encode())
+
+    finished = asyncio.run(queue.wait_for_resume_async("resume-5", timeout=10))
+    assert finished["status"] == COMPLETED
+    assert asyncio.run(queue.wait_for_resume_async("never-uploaded", timeout=0.1)) is None
+
+
+def test_job_of_exited_worker_is_failed_and_released():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteJobStore(os.path.join(tmp, "jobs.sqlite3"))
+        registry = ResumeRegistry(os.path.join(tmp, "resumes.sqlite3"))
+        digest = file_fingerprint(SAMPLE_RESUME.encode())
+        registry.claim_file(digest, "resume-6")
+
+        # Recorded by a worker process that has since exited
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        job = new_job("resume-6", "cv.txt", "txt")
+        job.update(worker_pid=exited.pid, status=PROCESSING)
+        store.create(job)
+
+        ingestor = ResumeIngestor(DocumentParser(), ResumeChunker(), ConstantEmbedder(), NumpyVectorStore(), registry)
+        queue = IngestionQueue(ingestor, store=store, max_workers=1)
+        started = time.monotonic()
+        finished = queue.wait_for_resume("resume-6", timeout=10)
+        assert time.monotonic() - started < 1
+        assert finished["status"] == FAILED and "upload the file again" in finished["error"]
+        assert registry.claim_file(digest, "resume-7") == "resume-7"
+
+        # A live worker that stopped making progress counts as gone too
+        stuck = new_job("resume-8", "cv.txt", "txt")
+        stuck.update(worker_pid=os.getppid(), updated_at=time.time() - 60)
+        store.create(stuck)
+        assert IngestionQueue(ingestor, store=store, stale_after=120).get(stuck["job_id"])["status"] == "queued"
+        assert IngestionQueue(ingestor, store=store, stale_after=30).get(stuck["job_id"])["status"] == FAILED
+
+
+if __name__ == "__main__":
+    test_job_reports_every_stage()
+    test_failed_job_records_error()
+    test_unreadable_file_fails_job()
+    test_sqlite_job_store_is_shared()
+    test_wait_for_unknown_resume_returns_none()
+    test_async_wait_returns_finished_job()
+    test_job_of_exited_worker_is_failed_and_released()
+    print("All ingestion tests passed!")
@@ -0,0 +1,83 @@
+import sys
+import os
+import json
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.analyzer import ResumeAnalyzer
+from services.json_stream import IncrementalJSONParser
+from services.result_cache import InMemoryResultCache
+
+RESPONSE = """```json
+{
+  "match_score": 82,
+  "ats_score": 74,
+  "matched_skills": ["Python", "REST, APIs", "C{#}"],
+  "missing_skills": [],
+  "strengths": ["Led \\"AI\\" platform, team of 4"],
+  "reasoning": "Strong {backend} fit"
+}
+```"""
+
+
+def test_fields_emitted_as_soon_as_complete():
+    parser = IncrementalJSONParser()
+    emitted = []
+    for char in RESPONSE:
+        emitted.extend(key for key, _ in parser.feed(char))
+        # match_score is available before the rest of the object has arrived
+        if emitted == ["match_score"]:
+            assert '"reasoning"' not in parser.buffer
+
+    assert emitted == ["match_score", "ats_score", "matched_skills", "missing_skills", "strengths", "reasoning"]
+    assert parser.done
+    assert parser.fields == json.loads(RESPONSE[RESPONSE.index("{"):RESPONSE.rindex("}") + 1])
+
+
+def test_incomplete_object_is_not_done():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"match_score": 70, "matched_skills": ["Py') == [("match_score", 70)]
+    assert not parser.done
+
+
+class FakeChunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeStreamingModel:
+    def __init__(self, text, size=7):
+        self.chunks = [FakeChunk(text[i:i + size]) for i in range(0, len(text), size)]
+
+    def generate_content(self, prompt, generation_config=None, stream=False):
+        assert stream
+        return iter(self.chunks)
+
+
+def test_analyze_stream_yields_fields_then_done():
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache())
+    analyzer.model = FakeStreamingModel(RESPONSE)
+    chunks = [{"text": "Python developer", "metadata": {"section": "Summary"}}]
+
+    events = list(analyzer.analyze_stream(chunks, "Backend engineer"))
+
+    assert events[0] == ("field", ("match_score", 82))
+    assert events[-1][0] == "done"
+    assert events[-1][1]["missing_skills"] == []
+
+
+def test_analyze_stream_reports_unparseable_response():
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache())
+    analyzer.model = FakeStreamingModel("Sorry, I cannot help with that.")
+
+    events = list(analyzer.analyze_stream([], "Backend engineer"))
+
+    assert events == [("error", {"error": "Failed to parse LLM response",
+                                 "raw_response": "Sorry, I cannot help with that."})]
+
+
+if __name__ == "__main__":
+    test_fields_emitted_as_soon_as_complete()
+    test_incomplete_object_is_not_done()
+    test_analyze_stream_yields_fields_then_done()
+    test_analyze_stream_reports_unparseable_response()
+    print("All JSON stream tests passed!")
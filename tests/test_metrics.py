@@ -0,0 +1,55 @@
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services import metrics
+from services.metrics import Histogram, MetricsRegistry, timed
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("demo_seconds", "Demo", buckets=(0.1, 1.0), labelnames=("stage",))
+    histogram.observe(0.05, stage="parse")
+    histogram.observe(0.1, stage="parse")
+    histogram.observe(3.0, stage="parse")
+
+    lines = histogram.render()
+    assert 'demo_seconds_bucket{stage="parse",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="parse",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{stage="parse",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{stage="parse"} 3' in lines
+
+
+def test_callback_metric_reads_at_scrape_time():
+    registry = MetricsRegistry()
+    hits = {"value": 1}
+    registry.callback("demo_hits_total", "Demo", lambda: {(("cache", "x"),): hits["value"]}, kind="counter")
+    hits["value"] = 5
+
+    text = registry.render()
+    assert "# TYPE demo_hits_total counter" in text
+    assert 'demo_hits_total{cache="x"} 5' in text
+
+
+def test_timed_spans_join_the_current_request():
+    with timed("outside"):
+        pass
+
+    timings, token = metrics.start_request()
+    try:
+        with timed("embed_query"):
+            pass
+        with timed("vector_search"):
+            pass
+    finally:
+        metrics.finish_request(token)
+
+    assert [span["stage"] for span in timings.as_dict()["stages"]] == ["embed_query", "vector_search"]
+    assert timings.server_timing().startswith("embed_query;dur=")
+    assert metrics.STAGE_SECONDS.snapshot(stage="outside")["count"] >= 1
+
+
+if __name__ == "__main__":
+    test_histogram_renders_cumulative_buckets()
+    test_callback_metric_reads_at_scrape_time()
+    test_timed_spans_join_the_current_request()
+    print("All metrics tests passed!")
@@ -0,0 +1,78 @@
+import sys
+import os
+import threading
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.numpy_store import NumpyVectorStore
+from services.ranker import ResumeRanker
+
+
+class FixedQueryEmbedder:
+    def __init__(self, embedding):
+        self.embedding = embedding
+        self.calls = 0
+
+    def embed_query(self, query):
+        self.calls += 1
+        return self.embedding
+
+
+class RecordingAnalyzer:
+    def __init__(self):
+        self.analyzed = []
+        self._lock = threading.Lock()
+
+    def analyze(self, resume_chunks, job_description, skills=None):
+        with self._lock:
+            self.analyzed.append([chunk["text"] for chunk in resume_chunks])
+        return {"match_score": 50}
+
+
+def make_chunks(resume_id, count):
+    return [
+        {"text": f"{resume_id} chunk {i}", "section": "Experience", "chunk_id": f"Experience_{i}", "word_count": 3}
+        for i in range(count)
+    ]
+
+
+def test_rank_orders_resumes_and_analyzes_top_n():
+    store = NumpyVectorStore()
+    store.add_chunks("strong", make_chunks("strong", 2), [[1.0, 0.0], [0.9, 0.1]])
+    store.add_chunks("medium", make_chunks("medium", 2), [[0.7, 0.7], [0.5, 0.5]])
+    store.add_chunks("weak", make_chunks("weak", 1), [[0.0, 1.0]])
+
+    embedder = FixedQueryEmbedder([1.0, 0.0])
+    analyzer = RecordingAnalyzer()
+    ranker = ResumeRanker(embedder, store, analyzer, max_workers=2)
+
+    result = ranker.rank("Python developer", ["weak", "missing", "strong", "medium"], top_n=2)
+    ranking = result["ranking"]
+
+    assert [item["resume_id"] for item in ranking] == ["strong", "medium", "weak"]
+    assert [item["rank"] for item in ranking] == [1, 2, 3]
+    assert result["not_found"] == ["missing"]
+    assert embedder.calls == 1
+
+    # Only the shortlist is sent to the LLM
+    assert "analysis" in ranking[0] and "analysis" in ranking[1]
+    assert "analysis" not in ranking[2]
+    assert len(analyzer.analyzed) == 2
+    assert all("_chunks" not in item for item in ranking)
+
+
+def test_rank_without_analysis():
+    store = NumpyVectorStore()
+    store.add_chunks("a", make_chunks("a", 1), [[1.0, 0.0]])
+    analyzer = RecordingAnalyzer()
+    ranker = ResumeRanker(FixedQueryEmbedder([1.0, 0.0]), store, analyzer)
+
+    result = ranker.rank("JD", ["a"], analyze=False)
+
+    assert result["ranking"][0]["resume_id"] == "a"
+    assert analyzer.analyzed == []
+
+
+if __name__ == "__main__":
+    test_rank_orders_resumes_and_analyzes_top_n()
+    test_rank_without_analysis()
+    print("All ranker tests passed!")
@@ -0,0 +1,104 @@
+import sys
+import os
+import tempfile
+import time
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services import metrics
+from services.analyzer import ResumeAnalyzer
+from services.rate_limit import (
+    BULK, INTERACTIVE, InMemoryBucketStore, RateLimited, RateLimiter, SQLiteBucketStore
+)
+from services.result_cache import InMemoryResultCache
+from tests.test_result_cache import CHUNKS, CountingModel
+
+
+class QuotaError(Exception):
+    code = 429
+
+
+def test_bucket_refills_and_is_shared_between_workers():
+    path = os.path.join(tempfile.mkdtemp(), "ratelimit.sqlite3")
+    # Two limiters on one file behave like two gunicorn workers
+    first = RateLimiter(SQLiteBucketStore(path), {"generation": (600, 0)})
+    second = RateLimiter(SQLiteBucketStore(path), {"generation": (600, 0)})
+
+    for _ in range(600):
+        assert first.acquire("generation") < 0.05
+    # 600 per minute refills one call every 0.1s, for both workers
+    assert second.acquire("generation") >= 0.05
+
+
+def test_bulk_lane_leaves_reserve_for_interactive():
+    limiter = RateLimiter(InMemoryBucketStore(), {"embedding": (10, 1000)}, bulk_reserve=0.2, max_wait=0.05)
+    for _ in range(8):
+        limiter.acquire("embedding", tokens=10, lane=BULK)
+    # Bulk may not dip into the last 20%; an interactive call can
+    costs = limiter._costs("embedding", 10, BULK)
+    assert limiter.store.take(costs, time.time()) > 0
+    assert limiter.acquire("embedding", tokens=10, lane=INTERACTIVE) < 0.05
+
+    # Tokens count too: a prompt bigger than the remaining budget has to wait
+    try:
+        limiter.acquire("embedding", tokens=950, lane=INTERACTIVE)
+    except RateLimited as e:
+        assert e.retry_after > 0
+    else:
+        raise AssertionError("Expected RateLimited")
+
+
+def test_429s_are_retried_with_backoff():
+    limiter = RateLimiter(InMemoryBucketStore(), {"generation": (6000, 0)}, max_retries=3, backoff_base=0.01)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise QuotaError("429 Resource has been exhausted")
+        return "ok"
+
+    assert limiter.call("generation", flaky) == "ok"
+    assert limiter.retries["generation"] == 2
+
+    def always_limited():
+        raise QuotaError("quota")
+
+    try:
+        limiter.call("generation", always_limited)
+    except RateLimited as e:
+        assert isinstance(e.__cause__, QuotaError)
+    else:
+        raise AssertionError("Expected RateLimited")
+
+    def broken():
+        raise KeyError("not a rate limit")
+
+    attempts.clear()
+    try:
+        limiter.call("generation", lambda: attempts.append(1) or broken())
+    except KeyError:
+        pass
+    assert len(attempts) == 1
+
+    assert 'rate_limit_retries_total{api="generation"}' in metrics.REGISTRY.render()
+
+
+def test_analyzer_reports_rate_limit_instead_of_failing():
+    limiter = RateLimiter(InMemoryBucketStore(), {"generation": (1, 0)}, max_wait=0.1)
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache(), rate_limiter=limiter)
+    analyzer.model = CountingModel('{"match_score": 70}')
+
+    assert analyzer.analyze(CHUNKS, "Backend engineer") == {"match_score": 70}
+    result = analyzer.analyze(CHUNKS, "Frontend engineer")
+    assert result["retry_after"] > 0
+    assert analyzer.model.calls == 1
+    # Not cached: the next attempt goes back to the limiter
+    assert "retry_after" in analyzer.analyze(CHUNKS, "Frontend engineer")
+
+
+if __name__ == "__main__":
+    test_bucket_refills_and_is_shared_between_workers()
+    test_bulk_lane_leaves_reserve_for_interactive()
+    test_429s_are_retried_with_backoff()
+    test_analyzer_reports_rate_limit_instead_of_failing()
+    print("All rate limit tests passed!")
@@ -0,0 +1,46 @@
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.bench_import import measure_once
+from services.registry import ServiceRegistry
+
+
+def test_services_are_built_once_on_first_use():
+    built = []
+    registry = ServiceRegistry()
+    registry.register("store", lambda: built.append("store") or {"name": "store"})
+    registry.register("ranker", lambda: {"store": registry.store})
+
+    assert not registry.loaded("store")
+    assert registry.ranker["store"] is registry.store
+    assert registry.get("store") is registry.store
+    assert built == ["store"]
+    assert registry.stats()["loaded"] == ["ranker", "store"]
+
+
+def test_overrides_survive_fork_but_built_services_do_not():
+    registry = ServiceRegistry()
+    registry.register("client", "collections:OrderedDict")
+    registry.register("store", dict)
+    fake = object()
+    registry.set("store", fake)
+    parent_client = registry.client
+
+    registry._pid = -1  # as seen from a forked child
+    assert not registry.loaded("client")
+    assert registry.client is not parent_client
+    assert registry.store is fake
+
+
+def test_import_and_health_skip_heavy_modules():
+    result = measure_once()
+    assert result["health_status"] == 200
+    assert result["heavy_modules"] == []
+
+
+if __name__ == "__main__":
+    test_services_are_built_once_on_first_use()
+    test_overrides_survive_fork_but_built_services_do_not()
+    test_import_and_health_skip_heavy_modules()
+    print("All registry tests passed!")
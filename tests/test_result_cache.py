@@ -0,0 +1,88 @@
+import sys
+import os
+import asyncio
+import tempfile
+import time
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.analyzer import ResumeAnalyzer
+from services.result_cache import InMemoryResultCache, SQLiteResultCache, make_analysis_key
+
+CHUNKS = [{"text": "Built Flask APIs", "metadata": {"section": "Experience"}}]
+
+
+class CountingModel:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        response = type("Response", (), {})()
+        response.text = self.text
+        return response
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        return self.generate_content(prompt, generation_config)
+
+
+def test_key_normalizes_jd_but_tracks_prompt_and_model():
+    base = make_analysis_key(["chunk"], "Python  Developer\n", "prompt v1", "model-a")
+
+    assert make_analysis_key(["chunk"], "python developer", "prompt v1", "model-a") == base
+    assert make_analysis_key(["chunk"], "python developer", "prompt v2", "model-a") != base
+    assert make_analysis_key(["chunk"], "python developer", "prompt v1", "model-b") != base
+    assert make_analysis_key(["other chunk"], "python developer", "prompt v1", "model-a") != base
+
+
+def test_ttl_and_size_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        for cache in (InMemoryResultCache(ttl=0.05, max_entries=2),
+                      SQLiteResultCache(os.path.join(tmp, "analysis.sqlite3"), ttl=0.05, max_entries=2)):
+            cache.put("a", {"match_score": 1})
+            cache.put("b", {"match_score": 2})
+            cache.put("c", {"match_score": 3})
+            assert cache.get("a") is None
+            assert cache.get("c") == {"match_score": 3}
+
+            time.sleep(0.1)
+            assert cache.get("c") is None
+
+
+def test_sqlite_cache_survives_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "analysis.sqlite3")
+        SQLiteResultCache(path).put("key", {"match_score": 90})
+        assert SQLiteResultCache(path).get("key") == {"match_score": 90}
+
+
+def test_analyzer_reuses_results_but_not_errors():
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache())
+    analyzer.model = CountingModel('{"match_score": 77}')
+
+    assert analyzer.analyze(CHUNKS, "Backend engineer") == {"match_score": 77}
+    assert analyzer.analyze(CHUNKS, "  backend   ENGINEER ") == {"match_score": 77}
+    assert analyzer.model.calls == 1
+
+    analyzer.model = CountingModel("not json")
+    assert "error" in analyzer.analyze(CHUNKS, "Data scientist")
+    assert "error" in analyzer.analyze(CHUNKS, "Data scientist")
+    assert analyzer.model.calls == 2
+
+
+def test_async_analysis_shares_the_cache():
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache())
+    analyzer.model = CountingModel('```json\n{"match_score": 64}\n```')
+
+    assert asyncio.run(analyzer.analyze_async(CHUNKS, "Backend engineer")) == {"match_score": 64}
+    assert analyzer.analyze(CHUNKS, "Backend engineer") == {"match_score": 64}
+    assert analyzer.model.calls == 1
+
+
+if __name__ == "__main__":
+    test_key_normalizes_jd_but_tracks_prompt_and_model()
+    test_ttl_and_size_eviction()
+    test_sqlite_cache_survives_restart()
+    test_analyzer_reuses_results_but_not_errors()
+    test_async_analysis_shares_the_cache()
+    print("All result cache tests passed!")
@@ -0,0 +1,89 @@
+import sys
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from benchmarks.fakes import FakeGenerativeModel
+from services import metrics
+from services.analyzer import ResumeAnalyzer
+from services.result_cache import InMemoryResultCache
+from services.single_flight import SingleFlight
+
+CHUNKS = [{"text": "Built Flask APIs with Python and MongoDB", "metadata": {"section": "Experience"}}]
+
+
+def run_together(count, fn):
+    """Call fn from `count` threads released at the same moment."""
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        return list(pool.map(call, range(count)))
+
+
+def test_concurrent_calls_share_one_result_and_error():
+    flight = SingleFlight("demo")
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"value": len(calls)}
+
+    results = run_together(6, lambda: flight.do("key", slow))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"leaders": 1, "followers": 5, "in_flight": 0}
+
+    def failing():
+        time.sleep(0.2)
+        raise ValueError("quota exceeded")
+
+    def call():
+        try:
+            flight.do("other", failing)
+        except ValueError as e:
+            return str(e)
+
+    assert run_together(3, call) == ["quota exceeded"] * 3
+    # Finished keys are released: the next call runs again
+    assert flight.do("key", slow) == {"value": 2}
+
+
+def test_identical_analyses_make_one_gemini_call():
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache())
+    analyzer.result_cache = None  # only coalescing can save a call
+    analyzer.model = FakeGenerativeModel(latency=0.3, stream_chunks=3)
+
+    def analyze_or_stream():
+        if threading.current_thread().name.endswith("_0"):
+            events = list(analyzer.analyze_stream(CHUNKS, "Python developer"))
+            return events[-1][1]
+        return analyzer.analyze(CHUNKS, "Python developer")
+
+    results = run_together(5, analyze_or_stream)
+    assert analyzer.model.calls == 1
+    assert all(result == results[0] for result in results)
+    assert "match_score" in results[0]
+
+    async def gather():
+        return await asyncio.gather(*(analyzer.analyze_async(CHUNKS, "Go developer") for _ in range(5)))
+
+    results = asyncio.run(gather())
+    assert analyzer.model.calls == 2
+    assert all(result == results[0] for result in results)
+
+    text = metrics.REGISTRY.render()
+    assert 'single_flight_calls_total{call="analysis",role="follower"}' in text
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_result_and_error()
+    test_identical_analyses_make_one_gemini_call()
+    print("All single-flight tests passed!")
@@ -0,0 +1,161 @@
+import sys
+import os
+import tempfile
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from services.analyzer import ResumeAnalyzer
+from services.chunker import ResumeChunker
+from services.document_parser import DocumentParser
+from services.ingestion import IngestionQueue, InMemoryJobStore, ResumeIngestor
+from services.numpy_store import NumpyVectorStore
+from services.result_cache import InMemoryResultCache
+from services.skills import ResumeSkills, SkillMatcher, SQLiteSkillStore
+from tests.test_chunker import SAMPLE_RESUME
+from tests.test_ingestion import ConstantEmbedder
+from tests.test_result_cache import CHUNKS, CountingModel
+
+TAXONOMY = {
+    "Java": [],
+    "JavaScript": ["js"],
+    "Node.js": ["nodejs"],
+    "C++": ["cpp"],
+    "Kubernetes": ["k8s"],
+    "Machine Learning": ["ml"],
+    "React": ["react.js"],
+}
+
+JD = "Backend role: Node.js, Kubernetes and some machine learning. Java is a plus."
+
+
+def test_matcher_finds_whole_terms_and_synonyms():
+    matcher = SkillMatcher(TAXONOMY)
+
+    assert matcher.find("Senior JavaScript engineer: React.js, node.js, K8S and C++/ML") == [
+        "JavaScript", "React", "Node.js", "Kubernetes", "C++", "Machine Learning"
+    ]
+    # Terms inside longer words or names do not count
+    assert matcher.find("Reactive programming, html5 and CSS3 with nodejsx") == []
+    assert matcher.find("Scaling Node.js services") == ["Node.js"]
+
+    chunks = [{"text": "Java and k8s", "chunk_id": "Experience"}, {"text": "Kubernetes", "chunk_id": "Skills"}]
+    assert matcher.find_in_chunks(chunks) == {"Java": ["Experience"], "Kubernetes": ["Experience", "Skills"]}
+    assert SkillMatcher({**TAXONOMY, "Go": ["golang"]}).version != matcher.version
+
+
+def test_case_sensitive_terms_skip_everyday_words():
+    matcher = SkillMatcher({
+        "Swift": {"synonyms": [], "case_sensitive": ["Swift"]},
+        "Express": {"synonyms": ["express.js"], "case_sensitive": ["Express"]},
+        "RAG": {"synonyms": ["retrieval augmented generation"], "case_sensitive": ["RAG"]},
+        "Apache Spark": {"synonyms": ["pyspark"], "case_sensitive": ["Spark"]},
+    })
+
+    assert matcher.find("express ideas; swift delivery; rag-tag team; spark joy") == []
+    assert matcher.find("Built RAG-based search with Express and Spark, iOS apps in Swift") == [
+        "RAG", "Express", "Apache Spark", "Swift"
+    ]
+    # Synonyms stay case-insensitive
+    assert matcher.find("EXPRESS.JS, PySpark and Retrieval Augmented Generation") == ["Express", "Apache Spark", "RAG"]
+
+    shipped = SkillMatcher.from_file("data/skills.json")
+    assert shipped.find("Able to express ideas; swift delivery on a rust belt helm") == []
+
+
+def test_skills_are_indexed_at_ingest_and_screened_without_gemini():
+    vector_store = NumpyVectorStore()
+    skills = ResumeSkills(SkillMatcher.from_file("data/skills.json"), vector_store=vector_store)
+    ingestor = ResumeIngestor(DocumentParser(), ResumeChunker(), ConstantEmbedder(), vector_store, skills=skills)
+    queue = IngestionQueue(ingestor, store=InMemoryJobStore(), max_workers=1)
+
+    queue.submit("resume-1", "cv.txt", "txt", SAMPLE_RESUME.encode())
+    job = queue.wait_for_resume("resume-1", timeout=10)
+    assert {"Python", "Flask", "Docker"} <= set(job["result"]["skills"])
+
+    result = skills.screen("Python and Kubernetes engineer with Flask", ["missing", "resume-1"])
+    assert result["job_skills"] == ["Python", "Kubernetes", "Flask"]
+    assert result["not_found"] == ["missing"]
+    [entry] = result["results"]
+    assert entry["matched"] == ["Python", "Flask"] and entry["missing"] == ["Kubernetes"]
+    assert entry["coverage"] == 0.667
+    assert "Skills" in entry["evidence"]["Python"]
+    assert skills.backfills == 0
+
+
+def test_store_is_shared_and_rebuilt_for_a_new_taxonomy():
+    path = os.path.join(tempfile.mkdtemp(), "skills.sqlite3")
+    vector_store = NumpyVectorStore()
+    vector_store.add_chunks("r1", [
+        {"text": "Node.js and Kubernetes", "section": "Skills", "chunk_id": "Skills", "word_count": 3}
+    ], [[1.0, 0.0]])
+
+    first = ResumeSkills(SkillMatcher(TAXONOMY), SQLiteSkillStore(path), vector_store=vector_store)
+    assert first.overlap("r1", JD)["matched"] == ["Node.js", "Kubernetes"]
+    assert first.backfills == 1  # Not indexed at ingest: read back from the vector store once
+
+    second = ResumeSkills(SkillMatcher(TAXONOMY), SQLiteSkillStore(path), vector_store=vector_store)
+    assert second.overlap("r1", JD)["missing"] == ["Machine Learning", "Java"]
+    assert second.backfills == 0
+
+    # A changed taxonomy invalidates what was stored under the old one
+    changed = ResumeSkills(SkillMatcher({**TAXONOMY, "Node.js": []}), SQLiteSkillStore(path),
+                           vector_store=vector_store)
+    assert changed.overlap("r1", JD)["matched"] == ["Node.js", "Kubernetes"]
+    assert changed.backfills == 1
+    assert changed.overlap("unknown", JD) is None
+
+
+class CountingVectorStore(NumpyVectorStore):
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+
+    def get_matrices(self, resume_ids):
+        self.lookups += 1
+        return super().get_matrices(resume_ids)
+
+
+def test_backfill_is_one_lookup_and_unknown_ids_are_remembered():
+    vector_store = CountingVectorStore()
+    for resume_id, text in [("r1", "Node.js and Kubernetes"), ("r2", "Java and ml")]:
+        vector_store.add_chunks(resume_id, [
+            {"text": text, "section": "Skills", "chunk_id": "Skills", "word_count": 3}
+        ], [[1.0, 0.0]])
+    skills = ResumeSkills(SkillMatcher(TAXONOMY), vector_store=vector_store)
+
+    result = skills.screen(JD, ["r1", "r2", "unknown"])
+    assert [entry["resume_id"] for entry in result["results"]] == ["r1", "r2"]
+    assert result["not_found"] == ["unknown"]
+    assert vector_store.lookups == 1 and skills.backfills == 2
+
+    # Neither the indexed resumes nor the unknown id go back to the vector store
+    assert skills.screen(JD, ["r1", "r2", "unknown"])["not_found"] == ["unknown"]
+    assert vector_store.lookups == 1
+
+    # Indexing a resume clears its negative entry
+    skills.index("unknown", [{"text": "C++", "chunk_id": "Skills"}])
+    assert skills.overlap("unknown", JD) is not None
+
+
+def test_overlap_goes_into_prompt_and_cache_key():
+    analyzer = ResumeAnalyzer(result_cache=InMemoryResultCache())
+    analyzer.model = CountingModel('{"match_score": 70}')
+    overlap = {"matched": ["Flask"], "missing": ["Kubernetes"], "coverage": 0.5, "evidence": {}}
+
+    prompt = analyzer._build_prompt(CHUNKS, JD, overlap)
+    assert "Matched: Flask\nMissing: Kubernetes" in prompt
+    assert "Not available" in analyzer._build_prompt(CHUNKS, JD)
+
+    analyzer.analyze(CHUNKS, JD)
+    analyzer.analyze(CHUNKS, JD, skills=overlap)
+    analyzer.analyze(CHUNKS, JD, skills=overlap)
+    assert analyzer.model.calls == 2
+
+
+if __name__ == "__main__":
+    test_matcher_finds_whole_terms_and_synonyms()
+    test_case_sensitive_terms_skip_everyday_words()
+    test_skills_are_indexed_at_ingest_and_screened_without_gemini()
+    test_store_is_shared_and_rebuilt_for_a_new_taxonomy()
+    test_backfill_is_one_lookup_and_unknown_ids_are_remembered()
+    test_overlap_goes_into_prompt_and_cache_key()
+    print("All skills tests passed!")
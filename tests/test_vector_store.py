@@ -0,0 +1,204 @@
+import sys
+import os
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pymongo.errors import BulkWriteError
+from benchmarks.fakes import FakeCollection
+from services.numpy_store import NumpyVectorStore
+from services.recent_writes import RecentWritesBuffer
+from services.vector_codec import decode_vector
+from services.vector_store import MongoVectorStore
+
+CHUNKS = [
+    {"text": "Python and Flask backend work", "section": "Experience", "chunk_id": "Experience", "word_count": 5},
+    {"text": "BSc Computer Science", "section": "Education", "chunk_id": "Education", "word_count": 3},
+    {"text": "React, TypeScript, Node.js", "section": "Skills", "chunk_id": "Skills", "word_count": 3},
+]
+EMBEDDINGS = [
+    [1.0, 0.0, 0.0],
+    [0.0, 1.0, 0.0],
+    [0.6, 0.0, 0.8],
+]
+
+
+class FakeBackingStore:
+    """Stands in for MongoVectorStore and counts embedding loads"""
+
+    def __init__(self):
+        self.documents = {}
+        self.loads = 0
+
+    def add_chunks(self, resume_id, chunks, embeddings):
+        self.documents[resume_id] = [
+            {"content": c["text"], "metadata": {"section": c["section"], "chunk_id": c["chunk_id"],
+                                                "word_count": c["word_count"]}, "embedding": e}
+            for c, e in zip(chunks, embeddings)
+        ]
+        return len(chunks)
+
+    def add_many(self, resumes):
+        return {resume_id: self.add_chunks(resume_id, chunks, embeddings)
+                for resume_id, (chunks, embeddings) in resumes.items()}
+
+    def get_resume_embeddings(self, resume_id):
+        self.loads += 1
+        return self.documents.get(resume_id, [])
+
+    def delete_resume(self, resume_id):
+        return len(self.documents.pop(resume_id, []))
+
+
+def test_offline_store_exact_search():
+    store = NumpyVectorStore()
+    assert store.add_chunks("r1", CHUNKS, EMBEDDINGS) == 3
+
+    results = store.search([1.0, 0.0, 0.1], "r1", top_k=2)
+
+    assert [r["metadata"]["section"] for r in results] == ["Experience", "Skills"]
+    assert results[0]["score"] >= results[1]["score"]
+    assert 0.0 <= results[-1]["score"] <= 1.0
+    assert store.search([1.0, 0.0, 0.0], "unknown") == []
+
+
+def test_offline_store_delete():
+    store = NumpyVectorStore()
+    store.add_chunks("r1", CHUNKS, EMBEDDINGS)
+
+    assert len(store.get_resume_chunks("r1")) == 3
+    assert store.delete_resume("r1") == 3
+    assert store.search([1.0, 0.0, 0.0], "r1") == []
+
+
+def test_backed_store_loads_each_resume_once():
+    backing = FakeBackingStore()
+    backing.add_chunks("r1", CHUNKS, EMBEDDINGS)
+    backing.add_chunks("r2", CHUNKS, EMBEDDINGS)
+    store = NumpyVectorStore(backing=backing, max_resumes=1)
+
+    store.search([0.0, 1.0, 0.0], "r1")
+    store.search([0.0, 0.0, 1.0], "r1")
+    assert backing.loads == 1
+
+    # r2 pushes r1 out of the single-entry LRU, so r1 is reloaded
+    store.search([0.0, 1.0, 0.0], "r2")
+    store.search([0.0, 1.0, 0.0], "r1")
+    assert backing.loads == 3
+
+
+def test_mongo_add_many_is_one_bulk_write():
+    collection = FakeCollection(latency=0)
+    store = MongoVectorStore(collection=collection)
+
+    stored = store.add_many({"r1": (CHUNKS, EMBEDDINGS), "r2": (CHUNKS[:2], EMBEDDINGS[:2])})
+
+    assert stored == {"r1": 3, "r2": 2}
+    assert collection.round_trips == 1
+    assert {doc["_id"] for doc in collection.documents} == {
+        "r1:Experience", "r1:Education", "r1:Skills", "r2:Experience", "r2:Education"
+    }
+
+
+class PartlyFailingCollection(FakeCollection):
+    """Applies a bulk write except the operations at `failing`, then reports those as failed."""
+
+    def __init__(self, failing):
+        super().__init__(latency=0)
+        self.failing = set(failing)
+
+    def bulk_write(self, operations, ordered=True):
+        applied = [op for i, op in enumerate(operations) if i not in self.failing]
+        super().bulk_write(applied, ordered=ordered)
+        raise BulkWriteError({"writeErrors": [{"index": i, "errmsg": "failed"} for i in sorted(self.failing)]})
+
+
+def test_partly_failed_write_is_not_buffered():
+    # Operations: r1's three chunks and DeleteMany (0-3), then r2's two chunks and DeleteMany (4-6)
+    collection = PartlyFailingCollection(failing=[1])
+    collection.indexed = False
+    recent_writes = RecentWritesBuffer(probe_interval=0)
+    store = MongoVectorStore(collection=collection, recent_writes=recent_writes)
+
+    stored = store.add_many({"r1": (CHUNKS, EMBEDDINGS), "r2": (CHUNKS[:2], EMBEDDINGS[:2])})
+
+    assert stored == {"r1": 2, "r2": 2}
+    assert recent_writes.get("r1") is None
+    assert recent_writes.get("r2") is not None
+    # r1 is answered from what Mongo actually holds
+    texts = {result["text"] for result in store.search([0.0, 1.0, 0.0], "r1", top_k=3)}
+    assert texts == {CHUNKS[0]["text"], CHUNKS[2]["text"]}
+
+    cached = NumpyVectorStore(backing=MongoVectorStore(collection=PartlyFailingCollection(failing=[0])))
+    cached.add_chunks("r1", CHUNKS, EMBEDDINGS)
+    assert len(cached.search([0.0, 1.0, 0.0], "r1", top_k=3)) == 2
+
+
+def test_mongo_reingest_upserts_and_drops_stale_chunks():
+    collection = FakeCollection(latency=0)
+    store = MongoVectorStore(collection=collection)
+    store.add_chunks("r1", CHUNKS, EMBEDDINGS)
+
+    updated = [dict(CHUNKS[0], text="Python, Flask and MongoDB backend work")]
+    assert store.add_chunks("r1", updated, EMBEDDINGS[:1]) == 1
+
+    chunks = store.get_resume_chunks("r1")
+    assert [c["content"] for c in chunks] == ["Python, Flask and MongoDB backend work"]
+    assert len(collection.documents) == 1
+
+
+def test_packed_and_quantized_storage_search_exactly():
+    query = [0.9, 0.1, 0.3]
+    expected = NumpyVectorStore()
+    expected.add_chunks("r1", CHUNKS, EMBEDDINGS)
+    exact = expected.search(query, "r1", top_k=2)
+
+    for storage in ("float32", "int8"):
+        collection = FakeCollection(latency=0)
+        store = MongoVectorStore(collection=collection, storage=storage)
+        store.add_chunks("r1", CHUNKS, EMBEDDINGS)
+
+        document = collection.documents[0]
+        assert list(decode_vector(document["embedding"])) == [1.0, 0.0, 0.0]
+        assert ("embedding_int8" in document) == (storage == "int8")
+
+        results = store.search(query, "r1", top_k=2)
+        assert [r["text"] for r in results] == [r["text"] for r in exact]
+        assert abs(results[0]["score"] - exact[0]["score"]) < 1e-6
+
+        # Backed numpy store decodes the packed vectors too
+        backed = NumpyVectorStore(backing=store)
+        assert backed.get_matrix("r1").matrix.shape == (3, 3)
+
+
+def test_fresh_writes_are_searchable_before_index_sync():
+    collection = FakeCollection(latency=0)
+    collection.indexed = False
+    recent_writes = RecentWritesBuffer(probe_interval=0)
+    store = MongoVectorStore(collection=collection, recent_writes=recent_writes)
+    store.add_chunks("r1", CHUNKS, EMBEDDINGS)
+
+    results = store.search([0.0, 1.0, 0.0], "r1", top_k=2)
+    assert results[0]["text"] == CHUNKS[1]["text"]
+    assert recent_writes.stats()["local_answers"] == 1
+
+    # Once the index returns the new chunks, the buffer hands over to it
+    collection.indexed = True
+    assert store.search([0.0, 1.0, 0.0], "r1", top_k=2) == results
+    assert recent_writes.stats()["buffered"] == 0
+    assert recent_writes.stats()["evictions"]["consistent"] == 1
+
+    # Another worker's write: not buffered here, read back from the collection
+    collection.indexed = False
+    other = MongoVectorStore(collection=collection)
+    assert other.search([0.0, 1.0, 0.0], "r1", top_k=2) == results
+
+
+if __name__ == "__main__":
+    test_offline_store_exact_search()
+    test_offline_store_delete()
+    test_backed_store_loads_each_resume_once()
+    test_mongo_add_many_is_one_bulk_write()
+    test_partly_failed_write_is_not_buffered()
+    test_mongo_reingest_upserts_and_drops_stale_chunks()
+    test_packed_and_quantized_storage_search_exactly()
+    test_fresh_writes_are_searchable_before_index_sync()
+    print("All vector store tests passed!")
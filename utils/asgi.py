@@ -0,0 +1,167 @@
+import asyncio
+import io
+import json
+import sys
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+async def read_body(receive: Callable, max_bytes: Optional[int] = None) -> bytes:
+    """Buffer an HTTP request body, raising BodyTooLarge as soon as it passes `max_bytes`."""
+    parts = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if max_bytes is not None and size > max_bytes:
+            raise BodyTooLarge(f"Request body exceeds {max_bytes} bytes")
+        parts.append(chunk)
+        if not message.get("more_body", False):
+            break
+    return b"".join(parts)
+
+
+def wsgi_environ(scope: Dict, body: bytes) -> Dict:
+    """WSGI environ for an ASGI http scope whose body has already been read."""
+    server = scope.get("server") or ("localhost", 80)
+    client = scope.get("client")
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode("utf-8").decode("latin-1"),
+        "PATH_INFO": scope["path"].encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": client[0] if client else "",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").lower()
+        value = raw_value.decode("latin-1")
+        if name == "content-length":
+            continue
+        if name == "content-type":
+            environ["CONTENT_TYPE"] = value
+            continue
+        key = "HTTP_" + name.upper().replace("-", "_")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def call_wsgi(wsgi_app: Callable, scope: Dict, body: bytes, send: Callable, executor: Executor):
+    """
+    Serve one request with a WSGI app on `executor`, streaming its output.
+
+    The whole call, including iteration of the response, stays on a single
+    executor thread: Flask's request context lives in contextvars, and
+    streamed responses (stream_with_context) break if next() moves threads.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    started: Dict = {}
+
+    def put(item):
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def start_response(status: str, headers: List[Tuple[str, str]], exc_info=None):
+        started["status"] = int(status.split(" ", 1)[0])
+        started["headers"] = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+        return lambda data: put(data)
+
+    def run():
+        try:
+            iterable = wsgi_app(wsgi_environ(scope, body), start_response)
+            try:
+                for chunk in iterable:
+                    if chunk:
+                        put(chunk)
+            finally:
+                if hasattr(iterable, "close"):
+                    iterable.close()
+        except BaseException as e:
+            put(e)
+        finally:
+            put(None)
+
+    loop.run_in_executor(executor, run)
+
+    headers_sent = False
+    while True:
+        item = await queue.get()
+        if not headers_sent and item is None and "status" not in started:
+            item = RuntimeError("WSGI app returned without calling start_response")
+        if isinstance(item, BaseException):
+            if headers_sent:
+                raise item
+            print(f"[ASGI] WSGI app failed: {item}")
+            await send_json(send, 500, {"error": "Internal server error"})
+            return
+        if not headers_sent:
+            await send({"type": "http.response.start", "status": started["status"], "headers": started["headers"]})
+            headers_sent = True
+        if item is None:
+            break
+        await send({"type": "http.response.body", "body": item, "more_body": True})
+    await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def send_json(send: Callable, status: int, payload, headers: Optional[List[Tuple[str, str]]] = None):
+    body = json.dumps(payload).encode()
+    response_headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    for name, value in headers or []:
+        response_headers.append((name.lower().encode("latin-1"), value.encode("latin-1")))
+    await send({"type": "http.response.start", "status": status, "headers": response_headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def asgi_request(asgi_app: Callable, method: str, path: str, body: bytes = b"",
+                       headers: Optional[List[Tuple[str, str]]] = None,
+                       query_string: str = "") -> Tuple[int, Dict[str, str], bytes]:
+    """In-process client for an ASGI app, for tests and benchmarks: (status, headers, body)."""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query_string.encode("latin-1"),
+        "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers or []],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    pending = [{"type": "http.request", "body": body, "more_body": False}]
+    response: Dict = {"body": []}
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode("latin-1"): v.decode("latin-1") for k, v in message["headers"]}
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await asgi_app(scope, receive, send)
+    return response["status"], response["headers"], b"".join(response["body"])
@@ -0,0 +1,3 @@
+def normalize_text(text: str) -> str:
+    """Collapse whitespace and fold case, so trivially different inputs compare equal."""
+    return " ".join(text.split()).lower()